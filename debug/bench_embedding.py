@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Embedding throughput benchmark for bulk corpus loads.
+
+Encodes the same corpus with 1, 2, 4, ... worker processes (up to the
+CPU count) via encode_parallel and prints passages/sec and speed-up per
+worker count.
+
+    python debug/bench_embedding.py [--data data/fever.json] [--limit 20000] [--batch-size 64]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from modules.misinformation_module.src.embedder import E5Embedder, encode_parallel
+
+
+def load_texts(path: str, limit: int):
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return [row["claim"] for row in json.load(f)[:limit]]
+    # Synthetic fallback so the benchmark runs without FEVER
+    return [f"passage: Player {i % 450} scored {i % 61} points in game {i} of the season." for i in range(limit)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default="data/fever.json")
+    parser.add_argument("--limit", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--model", default=os.environ.get("EMBEDDING_MODEL", "intfloat/e5-small-v2"))
+    args = parser.parse_args()
+
+    texts = load_texts(args.data, args.limit)
+    model = E5Embedder(args.model, normalize=True).model
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+
+    print(f"{len(texts)} passages, batch size {args.batch_size}, {cpus} CPUs")
+    print(f"{'workers':>8} {'seconds':>9} {'passages/s':>11} {'speed-up':>9}")
+    baseline = None
+    for workers in counts:
+        started = time.perf_counter()
+        embs = encode_parallel(model, texts, workers=workers, batch_size=args.batch_size, normalize=True)
+        elapsed = time.perf_counter() - started
+        rate = len(texts) / elapsed
+        baseline = baseline or rate
+        assert embs.shape[0] == len(texts)
+        print(f"{workers:>8} {elapsed:>9.1f} {rate:>11.1f} {rate / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Reranking benchmark: latency vs verdict agreement as RERANK_TOP_N varies.
+
+Each gold-standard example gets `--distractors` passages from other
+examples mixed in, so it looks like a real 10-20 hit retrieval. Every
+example is then validated:
+
+  - without reranking (all passages go to NLI): the baseline verdict
+  - with each reranker, keeping only the top N passages
+
+For every (reranker, N) the script prints ms per claim (rerank + NLI +
+classifier), NLI pairs per claim, agreement with the baseline verdict and
+accuracy against the ground truth.
+
+    python debug/bench_rerank.py [--top-n 1,2,3,5,8] [--rerankers embedding,cross-encoder] [--distractors 15]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from modules.claim_extraction.Fact_Validator import FactValidator
+from modules.claim_extraction.Fact_Validator_Data_models import SourcePassage
+from modules.claim_extraction.NLIModel import NLI_LABELS, create_nli_model
+from modules.claim_extraction.training.Validator_Training_Data import get_training_data
+from modules.misinformation_module.src.reranker import create_reranker
+
+
+def with_distractors(examples, k: int, seed: int = 0):
+    """Appends k passages from other examples (relevance 0.2-0.7) to each example."""
+    rng = random.Random(seed)
+    pool = [(i, p) for i, ex in enumerate(examples) for p in ex.passages]
+    workloads = []
+    for i, ex in enumerate(examples):
+        others = [p for j, p in pool if j != i]
+        extra = [
+            SourcePassage(content=p.content, domain=p.domain, url=p.url, title=p.title,
+                          published_at=p.published_at, relevance_score=round(rng.uniform(0.2, 0.7), 3))
+            for p in rng.sample(others, min(k, len(others)))
+        ]
+        passages = list(ex.passages) + extra
+        rng.shuffle(passages)
+        workloads.append((ex, passages))
+    return workloads
+
+
+def run(validator, workloads, reranker=None, top_n=None):
+    verdicts, pairs = [], 0
+    t0 = time.perf_counter()
+    for ex, passages in workloads:
+        if reranker is not None:
+            passages = reranker.rerank(ex.claim, passages, top_n)
+        pairs += sum(1 for p in passages if p.relevance_score >= validator.related_gate)
+        verdicts.append(validator.validate_claim(ex.claim, "", passages).verdict)
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    return verdicts, elapsed_ms / len(workloads), pairs / len(workloads)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top-n", default="1,2,3,5,8")
+    parser.add_argument("--rerankers", default="embedding,cross-encoder")
+    parser.add_argument("--distractors", type=int, default=15)
+    parser.add_argument("--model-path", default="fact_validator_models.joblib")
+    args = parser.parse_args()
+
+    examples = get_training_data()
+    nli = create_nli_model(
+        emb_model_name="sentence-transformers/all-mpnet-base-v2",
+        nli_model_name="roberta-large-mnli",
+        nli_labels=NLI_LABELS
+    )
+    nli.warmup()
+
+    try:
+        validator = FactValidator(None, nli, model_path=args.model_path)
+    except (FileNotFoundError, IOError) as e:
+        print(f"Could not load {args.model_path} ({e}); training on the gold-standard set instead")
+        validator = FactValidator(None, nli, training_data=examples, model_path=None)
+
+    workloads = with_distractors(examples, args.distractors)
+    truth = [ex.ground_truth_verdict for ex in examples]
+
+    baseline, base_ms, base_pairs = run(validator, workloads)
+    rows = [("none", "all", base_ms, base_pairs, 100.0,
+             100.0 * sum(v == t for v, t in zip(baseline, truth)) / len(truth))]
+
+    for name in [n.strip() for n in args.rerankers.split(",") if n.strip()]:
+        reranker = create_reranker(name)
+        reranker.rerank(examples[0].claim, examples[0].passages)  # load models outside the timing
+        for top_n in [int(n) for n in args.top_n.split(",")]:
+            verdicts, ms, pairs = run(validator, workloads, reranker, top_n)
+            agree = 100.0 * sum(v == b for v, b in zip(verdicts, baseline)) / len(baseline)
+            acc = 100.0 * sum(v == t for v, t in zip(verdicts, truth)) / len(truth)
+            rows.append((name, str(top_n), ms, pairs, agree, acc))
+
+    print(f"\n{len(examples)} gold-standard claims, {args.distractors} distractors each")
+    print(f"{'reranker':>14} {'N':>4} {'ms/claim':>9} {'NLI pairs':>10} {'agree %':>8} {'accuracy %':>11}")
+    for name, n, ms, pairs, agree, acc in rows:
+        print(f"{name:>14} {n:>4} {ms:>9.1f} {pairs:>10.1f} {agree:>8.1f} {acc:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Admission control for the Flask API.
+Bounds how many heavy requests run at once and how many may wait for a slot.
+"""
+
+import threading
+import time
+
+
+class QueueFullError(Exception):
+    """Raised when every slot is busy and the wait queue is full (HTTP 429)."""
+
+
+class QueueTimeoutError(Exception):
+    """Raised when a queued request waited too long for a slot (HTTP 503)."""
+
+
+class AdmissionGate:
+    """
+    At most `max_concurrent` requests hold a slot at the same time.
+    Up to `max_queue` more may wait for one, each for at most
+    `queue_timeout` seconds. Anything beyond that is rejected at once,
+    so callers can answer with backpressure instead of piling up threads.
+
+    Usage:
+        with gate.slot():
+            ... heavy work ...
+    """
+
+    def __init__(self, max_concurrent: int = 4, max_queue: int = 16, queue_timeout: float = 30.0):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be >= 1")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def acquire(self) -> None:
+        with self._cond:
+            if self._active < self.max_concurrent and self._waiting == 0:
+                self._active += 1
+                return
+
+            if self._waiting >= self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(
+                    f"Server busy: {self._active} requests running, {self._waiting} queued"
+                )
+
+            self._waiting += 1
+            deadline = time.monotonic() + self.queue_timeout
+            try:
+                while self._active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timed_out += 1
+                        raise QueueTimeoutError(
+                            f"Timed out after {self.queue_timeout:.0f}s waiting for a free worker"
+                        )
+                    self._cond.wait(remaining)
+                self._active += 1
+            finally:
+                self._waiting -= 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    def slot(self) -> "_Slot":
+        return _Slot(self)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "active": self._active,
+                "queued": self._waiting,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+
+class _Slot:
+    def __init__(self, gate: AdmissionGate):
+        self._gate = gate
+
+    def __enter__(self):
+        self._gate.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._gate.release()
+        return False
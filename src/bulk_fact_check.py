@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Offline bulk fact-checking.
+
+Streams claims from a JSONL or CSV file through FactCheckingPipeline and
+writes one FactCheckResult-shaped JSON line per claim:
+
+    python src/bulk_fact_check.py claims.jsonl results.jsonl [--batch-size 64] [--llm-concurrency 8] [--explain]
+
+- Claims are read lazily, so input size is not limited by memory.
+- Each batch is embedded, searched and NLI-scored together
+  (FactCheckingPipeline.check_claims).
+- LLM work (claim extraction with --extract, explanations with --explain)
+  runs on a pool of --llm-concurrency threads. A batch's explanations
+  overlap the retrieval and NLI of the next batch.
+- Every input row gets at least one output line; rows with no claim to
+  check get {"id", "claim_index": null, "skipped": "..."}.
+- After every written batch, <output>.ckpt records how many input rows are
+  done and how many output bytes belong to them, plus the input file's
+  fingerprint and the run options. A rerun after a crash truncates any
+  partial output and resumes from that row; a checkpoint from a different
+  input or options is refused. The checkpoint is deleted once the run
+  completes. Without a checkpoint the output file is started from scratch.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from dotenv import load_dotenv
+
+
+# -------------------------------------------------------------------------
+# Input / checkpoint helpers
+# -------------------------------------------------------------------------
+def iter_claims(path: str, fmt: str = None, field: str = "claim") -> Iterator[Dict[str, Any]]:
+    """
+    Yields {"id", "claim"} rows from a JSONL or CSV file, one at a time.
+    `fmt` defaults to the file extension; rows without an "id" use their
+    0-based row number. Blank lines, JSON lines that are not objects and
+    rows with an empty claim still count as rows (so checkpoints stay
+    aligned) but have claim None.
+    """
+    if fmt is None:
+        fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+
+    with open(path, newline="" if fmt == "csv" else None, encoding="utf-8") as f:
+        if fmt == "csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) if line.strip() else {} for line in f)
+        for i, row in enumerate(rows):
+            if not isinstance(row, dict):
+                # A JSON line that is not an object (string, list, ...) counts as an empty row
+                row = {}
+            text = (row.get(field) or "").strip()
+            yield {"id": row.get("id", i), "claim": text or None}
+
+
+def input_fingerprint(path: str) -> Dict[str, Any]:
+    """Identifies the input file by path, size and mtime, without reading it."""
+    st = os.stat(path)
+    return {"path": os.path.abspath(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def load_checkpoint(path: str, fingerprint: Dict[str, Any] = None, options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Returns the saved progress, or a fresh state when there is no checkpoint.
+    Raises ValueError when the checkpoint belongs to another input file or
+    other run options, since resuming would mix rows from two runs.
+    """
+    fresh = {"rows_done": 0, "output_bytes": 0, "input": fingerprint, "options": options}
+    if not (path and os.path.exists(path)):
+        return fresh
+    with open(path) as f:
+        state = json.load(f)
+    if state.get("input") != fingerprint or state.get("options") != options:
+        raise ValueError(
+            f"Checkpoint {path} was written for a different input file or options; "
+            "delete it (and the output) to start over"
+        )
+    return state
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    """Atomic write, so a crash never leaves a half-written checkpoint."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _batches(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+# -------------------------------------------------------------------------
+# Bulk run
+# -------------------------------------------------------------------------
+def run(pipeline, input_path: str, output_path: str, checkpoint_path: str = None,
+        batch_size: int = 32, llm_concurrency: int = 4, extract: bool = False,
+        explain: bool = False, reasoning_mode: str = None, top_k: int = None,
+        fmt: str = None, field: str = "claim") -> Dict[str, Any]:
+    """
+    Fact-checks every row of `input_path` into `output_path` and returns
+    run statistics (rows, claims, seconds, claims_per_sec) for this run.
+    """
+    if checkpoint_path is None:
+        checkpoint_path = f"{output_path}.ckpt"
+    if fmt is None:
+        fmt = "csv" if input_path.lower().endswith(".csv") else "jsonl"
+    options = {"format": fmt, "field": field, "extract": extract, "explain": explain,
+               "reasoning_mode": reasoning_mode, "top_k": top_k}
+    state = load_checkpoint(checkpoint_path, input_fingerprint(input_path), options)
+    if state["rows_done"]:
+        print(f"[bulk] Resuming after {state['rows_done']} rows")
+
+    executor = ThreadPoolExecutor(max_workers=max(1, llm_concurrency), thread_name_prefix="bulk-llm")
+    rows = itertools.islice(iter_claims(input_path, fmt, field), state["rows_done"], None)
+    stats = {"rows": 0, "claims": 0, "skipped": 0}
+    t_start = time.perf_counter()
+
+    def explain_one(result):
+        try:
+            return pipeline.generate_explanation(result, reasoning_mode)
+        except Exception as e:
+            print(f"[bulk] Explanation failed for '{result.claim[:60]}': {e}")
+            return None
+
+    def write(out, pending) -> None:
+        batch, entries, results, futures = pending
+        checked = iter(zip(results, futures))
+        for row_id, idx, skipped in entries:
+            record = {"id": row_id, "claim_index": idx}
+            if skipped:
+                record["skipped"] = skipped
+            else:
+                result, fut = next(checked)
+                record.update(pipeline.format_result(result))
+                if fut is not None:
+                    record["explanation"] = fut.result()
+            out.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        out.flush()
+        os.fsync(out.fileno())
+
+        state["rows_done"] += len(batch)
+        state["output_bytes"] = out.tell()
+        save_checkpoint(checkpoint_path, state)
+
+        stats["rows"] += len(batch)
+        stats["claims"] += len(results)
+        stats["skipped"] += len(entries) - len(results)
+        elapsed = time.perf_counter() - t_start
+        print(f"[bulk] {state['rows_done']} rows done | {stats['claims'] / elapsed:.1f} claims/s")
+
+    with open(output_path, "ab") as out:
+        # Drop output written after the last checkpoint (or all of it on a fresh run)
+        out.truncate(state["output_bytes"])
+        out.seek(state["output_bytes"])
+
+        pending = None
+        try:
+            for batch in _batches(rows, batch_size):
+                rows_with_text = [r for r in batch if r["claim"]]
+                if extract:
+                    extracted = list(executor.map(lambda r: pipeline.extract_claims(r["claim"]), rows_with_text))
+                    per_row = [claims if not no_claims else [] for claims, no_claims in extracted]
+                else:
+                    per_row = [[(r["claim"], "unknown")] for r in rows_with_text]
+                row_claims = {id(row): found for row, found in zip(rows_with_text, per_row)}
+
+                # (id, claim_index, skipped) per output line, in input order
+                entries, claims = [], []
+                for row in batch:
+                    if not row["claim"]:
+                        entries.append((row["id"], None, "empty claim"))
+                    elif not row_claims[id(row)]:
+                        entries.append((row["id"], None, "no claim"))
+                    for idx, claim in enumerate(row_claims.get(id(row), [])):
+                        entries.append((row["id"], idx, None))
+                        claims.append(claim)
+
+                results = pipeline.check_claims(claims, top_k=top_k) if claims else []
+                futures = [executor.submit(explain_one, r) if explain else None for r in results]
+
+                # Write the previous batch while this batch's LLM calls run
+                if pending is not None:
+                    write(out, pending)
+                pending = (batch, entries, results, futures)
+
+            if pending is not None:
+                write(out, pending)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    # Finished: a rerun starts over instead of resuming
+    Path(checkpoint_path).unlink(missing_ok=True)
+
+    stats["seconds"] = round(time.perf_counter() - t_start, 2)
+    stats["claims_per_sec"] = round(stats["claims"] / stats["seconds"], 2) if stats["seconds"] else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk fact-check a JSONL/CSV file of claims.")
+    parser.add_argument("input", help="JSONL or CSV file with one claim per row")
+    parser.add_argument("output", help="JSONL file to write results to")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="Input format (default: from extension)")
+    parser.add_argument("--field", default="claim", help="Column/key holding the claim text")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <output>.ckpt)")
+    parser.add_argument("--batch-size", type=int, default=int(os.environ.get("BULK_BATCH_SIZE", 32)))
+    parser.add_argument("--llm-concurrency", type=int, default=int(os.environ.get("BULK_LLM_CONCURRENCY", 4)),
+                        help="Maximum LLM calls in flight")
+    parser.add_argument("--top-k", type=int, default=None, help="Passages per claim (default: RETRIEVAL_TOP_K)")
+    parser.add_argument("--extract", action="store_true", help="Run LLM claim extraction on each row first")
+    parser.add_argument("--explain", action="store_true", help="Generate an LLM explanation per claim")
+    parser.add_argument("--reasoning-mode", default=None, choices=["fast", "standard", "full"])
+    args = parser.parse_args()
+
+    project_root = Path(__file__).resolve().parent.parent
+    load_dotenv(project_root / ".env")
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from log_setup import configure_logging
+    configure_logging()
+    from pipeline import FactCheckingPipeline
+
+    llm_provider = os.environ.get("LLM_PROVIDER")
+    if not llm_provider:
+        raise ValueError("LLM_PROVIDER not set. Run setup.sh first.")
+
+    pipeline = FactCheckingPipeline(
+        use_reasoning=True,
+        llm_provider=llm_provider,
+        qdrant_url=os.environ.get("QDRANT_URL"),
+        qdrant_api_key=os.environ.get("QDRANT_API_KEY")
+    )
+
+    stats = run(
+        pipeline, args.input, args.output,
+        checkpoint_path=args.checkpoint,
+        batch_size=args.batch_size,
+        llm_concurrency=args.llm_concurrency,
+        extract=args.extract,
+        explain=args.explain,
+        reasoning_mode=args.reasoning_mode,
+        top_k=args.top_k,
+        fmt=args.format,
+        field=args.field
+    )
+    print(f"\n[bulk] {stats['claims']} claims from {stats['rows']} rows ({stats['skipped']} skipped) "
+          f"in {stats['seconds']}s ({stats['claims_per_sec']} claims/sec)")
+
+
+if __name__ == "__main__":
+    main()
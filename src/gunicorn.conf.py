@@ -0,0 +1,44 @@
+"""
+Gunicorn configuration for production serving.
+
+    gunicorn -c src/gunicorn.conf.py server:app
+
+The app (and its NLI / embedding models) is loaded once in the master
+process (preload_app) and forked into the workers, so model weights are
+shared copy-on-write instead of being loaded once per worker. Connections
+(Qdrant clients, SQLite caches) are reopened in each worker by post_fork.
+Inside each
+worker, gthread threads accept requests and server.chat_gate bounds how
+many of them run the pipeline at once (CHAT_MAX_CONCURRENCY / CHAT_MAX_QUEUE).
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Make `server` / `pipeline` importable when launched from the project root
+sys.path.insert(0, str(Path(__file__).parent.resolve()))
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5005)}"
+workers = int(os.environ.get("WEB_WORKERS", 2))
+worker_class = "gthread"
+threads = int(os.environ.get("WEB_THREADS", 8))
+backlog = int(os.environ.get("WEB_BACKLOG", 64))
+timeout = int(os.environ.get("WEB_TIMEOUT", 120))
+preload_app = True
+
+# Torch/tokenizer thread pools are not fork-safe once used, so the master
+# skips the NLI warm-up and each worker warms up after the fork instead.
+# gunicorn forks even a single worker, so this holds for any WEB_WORKERS.
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+worker_warmup = os.environ.get("NLI_WARMUP", "1").strip().lower() not in {"0", "false", "no"}
+os.environ["NLI_WARMUP"] = "0"
+
+
+def post_fork(server, worker):
+    import server as app_module
+    # Sockets, SQLite connections and locks must not be shared with the master
+    app_module.pipeline.reopen_after_fork()
+    nli = getattr(app_module.pipeline.fact_validator, "nli", None)
+    if worker_warmup and hasattr(nli, "warmup"):
+        nli.warmup()
@@ -1,16 +1,32 @@
-import os, time, feedparser, requests
+import os, time, threading, hashlib, uuid, feedparser, requests
 from dotenv import load_dotenv
 load_dotenv()
 from bs4 import BeautifulSoup
+from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from datetime import datetime
+from urllib.parse import urlparse
 from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient, models
-from typing import List
+from typing import Iterable, Iterator, List
+from modules.cache.ingest_version import bump_ingest_version
+from modules.misinformation_module.src.bm25_index import BM25Index
 
 QDRANT_URL = os.getenv("QDRANT_URL")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 COLLECTION = os.getenv("COLLECTION_NAME", "nba_news_claims")
 
+# Streaming / concurrency knobs
+FEED_WORKERS = int(os.getenv("INGEST_FEED_WORKERS", 5))          # feeds fetched in parallel
+SCRAPE_WORKERS = int(os.getenv("INGEST_SCRAPE_WORKERS", 8))      # article pages fetched in parallel
+PER_HOST_LIMIT = int(os.getenv("INGEST_PER_HOST_LIMIT", 2))      # concurrent requests per host
+HOST_DELAY = float(os.getenv("INGEST_HOST_DELAY", 0.5))          # min seconds between requests to one host
+MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", 32))           # scraped articles buffered ahead of embedding
+EMBED_BATCH_SIZE = int(os.getenv("INGEST_EMBED_BATCH", 128))     # chunks per encoder call
+UPSERT_BATCH_SIZE = int(os.getenv("INGEST_UPSERT_BATCH", 256))   # points per Qdrant upsert
+STALE_CHUNK_WINDOW = 32                                          # chunk ids probed per round for shrunk articles
+
 qdrant = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
 embedder = SentenceTransformer("intfloat/e5-small-v2")
 
@@ -22,12 +38,53 @@ FEEDS = [
     "https://www.hoopsrumors.com/feed",                 # HoopsRumors NBA news (works)
 ]
 
+# -----------------------------
+#   PER-HOST POLITENESS
+# -----------------------------
+class HostLimiter:
+    """Caps concurrent requests per host and spaces them at least `delay` seconds apart."""
+
+    def __init__(self, per_host: int, delay: float):
+        self.delay = delay
+        self._semaphores = defaultdict(lambda: threading.BoundedSemaphore(per_host))
+        self._next_slot = defaultdict(float)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url: str):
+        host = urlparse(url).netloc
+        with self._lock:
+            sem = self._semaphores[host]
+        with sem:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_slot[host])
+                self._next_slot[host] = start + self.delay
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+    def fetch(self, url: str, **kwargs) -> requests.Response:
+        with self.slot(url):
+            return _session().get(url, **kwargs)
+
+
+_local = threading.local()
+
+def _session() -> requests.Session:
+    # One keep-alive session per worker thread
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+host_limiter = HostLimiter(PER_HOST_LIMIT, HOST_DELAY)
+
 # -----------------------------
 #   FULL ARTICLE SCRAPING
 # -----------------------------
 def scrape_full_text(url: str) -> str:
     try:
-        r = requests.get(url, timeout=7)
+        r = host_limiter.fetch(url, timeout=7)
         soup = BeautifulSoup(r.text, "html.parser")
 
         # ESPN / NBA.com / BleacherReport usually have <p> content
@@ -56,36 +113,63 @@ def chunk_text(text: str, chunk_size=500, overlap=100) -> List[str]:
 
 
 # -----------------------------
-#   FETCH ARTICLES
+#   FETCH ARTICLES (STREAMING)
 # -----------------------------
-def fetch_articles() -> List[dict]:
-    items = []
-
-    for url in FEEDS:
+def fetch_feed_entries(url: str) -> List[dict]:
+    with host_limiter.slot(url):
         feed = feedparser.parse(url)
-        for entry in feed.entries:
-            title = entry.get("title", "")
-            summary = entry.get("summary", "")
-            if "nba" not in (title + summary).lower():
-                continue
-
-            link = entry.get("link", "")
-            published = entry.get("published", str(datetime.utcnow()))
-
-            full_text = scrape_full_text(link)
-            base_text = full_text if full_text else summary
-
-            chunks = chunk_text(base_text)
-
-            items.append({
-                "id": entry.get("id", link),
-                "title": title,
-                "chunks": chunks,
-                "link": link,
-                "published": published
-            })
 
-    return items
+    entries = []
+    for entry in feed.entries:
+        title = entry.get("title", "")
+        summary = entry.get("summary", "")
+        if "nba" not in (title + summary).lower():
+            continue
+        entries.append({
+            "id": entry.get("id", entry.get("link", "")),
+            "title": title,
+            "summary": summary,
+            "link": entry.get("link", ""),
+            "published": entry.get("published", str(datetime.utcnow())),
+        })
+    return entries
+
+
+def build_article(entry: dict) -> dict:
+    full_text = scrape_full_text(entry["link"])
+    base_text = full_text if full_text else entry["summary"]
+    return {
+        "id": entry["id"],
+        "title": entry["title"],
+        "chunks": chunk_text(base_text),
+        "link": entry["link"],
+        "published": entry["published"]
+    }
+
+
+def iter_articles(feeds: List[str] = FEEDS) -> Iterator[dict]:
+    """
+    Yields articles as soon as their pages are scraped.
+    Feeds are fetched concurrently. At most MAX_PENDING article scrapes
+    are queued at once, so memory stays flat however many feeds there are.
+    """
+    with ThreadPoolExecutor(max_workers=FEED_WORKERS, thread_name_prefix="feed") as feed_pool, \
+         ThreadPoolExecutor(max_workers=SCRAPE_WORKERS, thread_name_prefix="scrape") as scrape_pool:
+        feed_futures = [feed_pool.submit(fetch_feed_entries, url) for url in feeds]
+        pending = set()
+        for feed_future in as_completed(feed_futures):
+            for entry in feed_future.result():
+                if len(pending) >= MAX_PENDING:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for f in done:
+                        yield f.result()
+                pending.add(scrape_pool.submit(build_article, entry))
+        for f in as_completed(pending):
+            yield f.result()
+
+
+def fetch_articles() -> List[dict]:
+    return list(iter_articles())
 
 def ensure_collection():
     collections = qdrant.get_collections().collections
@@ -103,41 +187,174 @@ def ensure_collection():
     else:
         print(f"Collection {COLLECTION} already exists.")
 
+def purge_legacy_points() -> None:
+    """Deletes points written before content-addressed IDs (they have no content_hash)."""
+    qdrant.delete(
+        collection_name=COLLECTION,
+        points_selector=models.FilterSelector(
+            filter=models.Filter(must=[
+                models.IsEmptyCondition(is_empty=models.PayloadField(key="content_hash"))
+            ])
+        )
+    )
+    print("Deleted legacy points without content_hash.")
+
+# -----------------------------
+#   STABLE IDS + CONTENT HASHES
+# -----------------------------
+def chunk_point_id(item: dict, idx: int) -> str:
+    """UUIDv5 of article URL + chunk index: identical on every run and host."""
+    key = item.get("link") or item["id"]
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{key}#{idx}"))
+
+
+def chunk_content_hash(title: str, chunk: str) -> str:
+    return hashlib.sha256(f"{title}\n{chunk}".encode("utf-8")).hexdigest()
+
+
+def _drop_unchanged(pending_chunks: List[dict]) -> List[dict]:
+    """Removes chunks whose point already exists with the same content_hash."""
+    existing = qdrant.retrieve(
+        collection_name=COLLECTION,
+        ids=[c["point_id"] for c in pending_chunks],
+        with_payload=["content_hash"],
+        with_vectors=False
+    )
+    stored = {str(p.id): (p.payload or {}).get("content_hash") for p in existing}
+    return [c for c in pending_chunks if stored.get(c["point_id"]) != c["content_hash"]]
+
+def _delete_stale_chunks(articles: List[tuple], bm25: BM25Index = None) -> int:
+    """
+    Deletes chunk points left over from a longer earlier version of an article.
+    `articles` holds (item, chunk_count) pairs. Chunk ids are deterministic, so
+    the ids from chunk_count on are probed STALE_CHUNK_WINDOW at a time, with one
+    retrieve() per round for the whole batch. Returns the number of points deleted.
+    """
+    stale = []
+    start = {i: count for i, (_, count) in enumerate(articles)}
+    while start:
+        probes = {
+            chunk_point_id(articles[i][0], idx): i
+            for i, first in start.items()
+            for idx in range(first, first + STALE_CHUNK_WINDOW)
+        }
+        existing = qdrant.retrieve(collection_name=COLLECTION, ids=list(probes), with_payload=False, with_vectors=False)
+        found = [str(p.id) for p in existing]
+        stale.extend(found)
+        # Only articles whose whole window still existed can have more
+        per_article = defaultdict(int)
+        for point_id in found:
+            per_article[probes[point_id]] += 1
+        start = {i: first + STALE_CHUNK_WINDOW for i, first in start.items() if per_article[i] == STALE_CHUNK_WINDOW}
+
+    if stale:
+        qdrant.delete(collection_name=COLLECTION, points_selector=models.PointIdsList(points=stale))
+        if bm25 is not None:
+            for point_id in stale:
+                bm25.remove(point_id)
+    return len(stale)
+
 # -----------------------------
-#   UPSERT TO QDRANT (CHUNKED)
+#   UPSERT TO QDRANT (STREAMING, BATCHED)
 # -----------------------------
-def upsert_to_qdrant(items: List[dict]):
-    all_points = []
+def _embed_and_upsert(pending_chunks: List[dict], bm25: BM25Index = None) -> int:
+    """
+    Embeds the new or changed chunks of a batch with one encoder call and
+    upserts them in bounded batches. Returns the number of points written.
+    Every chunk of the batch is (re-)added to `bm25`; unchanged ones are no-ops.
+    """
+    if bm25 is not None:
+        bm25.add_many((c["point_id"], c["content"]) for c in pending_chunks)
+    pending_chunks = _drop_unchanged(pending_chunks)
+    if not pending_chunks:
+        return 0
+
+    vectors = embedder.encode(
+        [c["content"] for c in pending_chunks],
+        batch_size=64,
+        normalize_embeddings=True
+    )
+    points = [
+        models.PointStruct(
+            id=c["point_id"],
+            vector=vec.tolist(),
+            payload={
+                "title": c["title"],
+                "content": c["content"],
+                "source": c["source"],
+                "published_at": c["published_at"],
+                "chunk_index": c["chunk_index"],
+                "content_hash": c["content_hash"]
+            }
+        )
+        for c, vec in zip(pending_chunks, vectors)
+    ]
+    for i in range(0, len(points), UPSERT_BATCH_SIZE):
+        qdrant.upsert(collection_name=COLLECTION, points=points[i:i + UPSERT_BATCH_SIZE])
+    return len(points)
+
+
+def upsert_to_qdrant(items: Iterable[dict]) -> int:
+    """
+    Consumes articles (a list or the iter_articles() stream), embedding chunks
+    EMBED_BATCH_SIZE at a time and upserting while fetching continues.
+    Chunks whose stable ID already holds the same content_hash are skipped,
+    and chunks past an article's new chunk count are deleted from Qdrant and
+    the BM25 index. Returns the number of points upserted.
+    """
+    started = time.perf_counter()
+    bm25 = BM25Index.load_or_create(COLLECTION)
+    pending_chunks = []
+    pending_articles = []
+    total = 0
+    seen = 0
+    articles = 0
+    removed = 0
 
     for item in items:
+        articles += 1
+        pending_articles.append((item, len(item["chunks"])))
         for idx, chunk in enumerate(item["chunks"]):
-            vec = embedder.encode(chunk, normalize_embeddings=True)
-
-            point_id = abs(hash(f"{item['id']}_{idx}")) % (2**63)
-
-            all_points.append(
-                models.PointStruct(
-                    id=point_id,
-                    vector=vec.tolist(),
-                    payload={
-                        "title": item["title"],
-                        "content": chunk,
-                        "source": item["link"],
-                        "published_at": item["published"]
-                    }
-                )
-            )
+            pending_chunks.append({
+                "point_id": chunk_point_id(item, idx),
+                "chunk_index": idx,
+                "content_hash": chunk_content_hash(item["title"], chunk),
+                "title": item["title"],
+                "content": chunk,
+                "source": item["link"],
+                "published_at": item["published"]
+            })
+        if len(pending_chunks) >= EMBED_BATCH_SIZE:
+            seen += len(pending_chunks)
+            total += _embed_and_upsert(pending_chunks, bm25)
+            removed += _delete_stale_chunks(pending_articles, bm25)
+            pending_chunks = []
+            pending_articles = []
+            elapsed = time.perf_counter() - started
+            print(f"  {articles} articles, {seen} chunks seen, {total} upserted ({seen / elapsed:.1f} chunks/sec)")
 
-    if all_points:
-        qdrant.upsert(collection_name=COLLECTION, points=all_points)
-        print(f"Upserted {len(all_points)} chunked vectors to Qdrant.")
-    else:
-        print("No articles to insert.")
+    if pending_chunks:
+        seen += len(pending_chunks)
+        total += _embed_and_upsert(pending_chunks, bm25)
+    if pending_articles:
+        removed += _delete_stale_chunks(pending_articles, bm25)
+
+    elapsed = time.perf_counter() - started
+    print(f"Processed {seen} chunks from {articles} articles in {elapsed:.1f}s "
+          f"({seen / elapsed if elapsed else 0:.1f} chunks/sec): "
+          f"{total} new or changed, {seen - total} unchanged and skipped, "
+          f"{removed} stale chunks of shortened articles deleted.")
+    if bm25.dirty:
+        bm25.save(COLLECTION)
+    if total or removed:
+        # Lets running servers drop cached fact-check results
+        bump_ingest_version(COLLECTION, total)
+    return total
 
 
 if __name__ == "__main__":
     ensure_collection()
+    if os.getenv("INGEST_PURGE_LEGACY", "0") == "1":
+        purge_legacy_points()
     print(f"[{datetime.utcnow()}] Fetching NBA news articles...")
-    articles = fetch_articles()
-    upsert_to_qdrant(articles)
-
+    upsert_to_qdrant(iter_articles())
@@ -0,0 +1,184 @@
+"""
+Logging for the server and the pipeline.
+
+Modules log through `logging.getLogger(__name__)` with %-style arguments,
+so a message below LOG_LEVEL costs one level check and is never formatted.
+configure_logging() installs a single handler on the root logger that
+only puts records on a bounded queue. A listener thread formats them and
+writes them out, so request threads never wait on stderr or a file. When
+the queue is full, records are dropped (and counted) instead of blocking.
+
+Every record carries the current request id (a contextvar) as
+%(request_id)s, so all lines of one /chat call can be grepped together.
+The server takes the id from the X-Request-ID header or makes a new one,
+and sends it back on the response.
+
+    LOG_LEVEL=INFO        DEBUG adds prompts, NLI scores and per-stage detail
+    LOG_QUEUE_SIZE=10000  records buffered before new ones are dropped
+    LOG_FILE=             also append to this file
+"""
+
+import atexit
+import contextvars
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import uuid
+from contextlib import contextmanager
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+
+_request_id = contextvars.ContextVar("request_id", default="-")
+_VALID_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+_queue_handler: Optional["NonBlockingQueueHandler"] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_settings: dict = {}
+
+
+# -------------------------------------------------------------------------
+# Request ids
+# -------------------------------------------------------------------------
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def clean_request_id(value: Optional[str]) -> str:
+    """Returns `value` if it is a safe id (e.g. from a client header), else a new one."""
+    if value and _VALID_ID.match(value):
+        return value
+    return new_request_id()
+
+
+def get_request_id() -> str:
+    return _request_id.get()
+
+
+def set_request_id(request_id: str) -> contextvars.Token:
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: contextvars.Token) -> None:
+    _request_id.reset(token)
+
+
+@contextmanager
+def request_context(request_id: Optional[str] = None):
+    """Tags every record logged inside the block with `request_id` (new if None)."""
+    token = _request_id.set(request_id or new_request_id())
+    try:
+        yield _request_id.get()
+    finally:
+        _request_id.reset(token)
+
+
+# -------------------------------------------------------------------------
+# Handlers
+# -------------------------------------------------------------------------
+class RequestIdFilter(logging.Filter):
+    """Stamps the caller's request id on the record (runs in the caller's thread)."""
+
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Puts records on a bounded queue without waiting. The message is not
+    formatted here: record.msg % record.args happens in the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Same process, so the record (args, exc_info) can travel as is
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _output_handlers(level: int) -> list:
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler(sys.stderr)]
+    log_file = os.environ.get("LOG_FILE")
+    if log_file:
+        handlers.append(logging.handlers.WatchedFileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        handler.setLevel(level)
+    return handlers
+
+
+def _install(level: int, queue_size: int) -> None:
+    global _queue_handler, _listener
+    root = logging.getLogger()
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(RequestIdFilter())
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *_output_handlers(level), respect_handler_level=True)
+    _listener.start()
+
+
+def configure_logging(level: Optional[str] = None, queue_size: Optional[int] = None) -> None:
+    """
+    Installs the queued root handler (once per process; later calls only
+    change the level). Arguments default to LOG_LEVEL / LOG_QUEUE_SIZE.
+    """
+    level_name = (level or os.environ.get("LOG_LEVEL", "INFO")).upper()
+    numeric = logging.getLevelName(level_name)
+    if not isinstance(numeric, int):
+        raise ValueError(f"Unknown LOG_LEVEL '{level_name}'")
+
+    if _queue_handler is not None:
+        logging.getLogger().setLevel(numeric)
+        return
+
+    _settings["level"] = numeric
+    _settings["queue_size"] = queue_size or int(os.environ.get("LOG_QUEUE_SIZE", 10000))
+    _install(numeric, _settings["queue_size"])
+
+    # httpx (Qdrant, OpenAI clients) logs every HTTP call at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flushes queued records and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def _reinit_after_fork() -> None:
+    # The listener thread does not survive fork (gunicorn workers), and the
+    # old queue's lock may have been held at fork time: start over in the child.
+    global _listener
+    if _queue_handler is not None:
+        _listener = None
+        _install(_settings["level"], _settings["queue_size"])
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
@@ -0,0 +1,66 @@
+"""
+ingest_version.py
+
+A version stamp for the vector collection, stored in a small JSON file.
+Ingestion bumps it after upserting new points. Readers compare it to the
+version they cached results under and drop those results when it changes.
+
+Location: INGEST_VERSION_FILE (default data/qdrant/ingest_version.json).
+Ingestion and the server must see the same file.
+"""
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_PATH = "data/qdrant/ingest_version.json"
+
+
+def version_path(path: Optional[str] = None) -> Path:
+    return Path(path or os.environ.get("INGEST_VERSION_FILE", DEFAULT_PATH))
+
+
+def bump_ingest_version(collection: str, points_upserted: int = 0, path: Optional[str] = None) -> str:
+    """Writes a new version stamp atomically and returns it."""
+    target = version_path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    version = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    tmp = target.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({
+            "version": version,
+            "collection": collection,
+            "points_upserted": points_upserted,
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }, f, indent=2)
+    os.replace(tmp, target)
+    return version
+
+
+class IngestVersionReader:
+    """
+    Reads the current version stamp, re-parsing the file only when its
+    mtime changes. Returns "0" when no ingestion has been recorded yet.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = version_path(path)
+        self._mtime = None
+        self._version = "0"
+
+    def current(self) -> str:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            return self._version
+        if mtime != self._mtime:
+            try:
+                with open(self.path) as f:
+                    self._version = str(json.load(f).get("version", "0"))
+                self._mtime = mtime
+            except (OSError, ValueError):
+                pass
+        return self._version
@@ -0,0 +1,106 @@
+# ==============================================================================
+# --- NLI SCORE CACHE (wraps any ModelInterface backend) ---
+# ==============================================================================
+import hashlib
+import os
+import re
+import threading
+from typing import List, Tuple
+
+from modules.cache.cache_store import make_cache
+from modules.claim_extraction.Fact_Validator_Data_models import ModelInterface
+
+
+def backend_table(backend: ModelInterface, prefix: str) -> str:
+    """
+    SQLite table name for one NLI backend's scores: `prefix` plus the
+    backend's cache_key (class, model, precision), or its class name.
+    Switching NLI_BACKEND therefore never serves another backend's scores.
+    """
+    key = getattr(backend, "cache_key", None) or type(backend).__name__
+    return f"{prefix}_" + re.sub(r"\W", "_", key)
+
+
+class CachedNLIModel(ModelInterface):
+    """
+    Memoizes (entail, contradict, neutral) scores per (claim, passage) pair.
+
+    The key is sha1(claim) + sha1(passage content). The same Qdrant point
+    retrieved for the same claim therefore hits the cache, and so does the
+    same text under a different point id. Only the misses of each predict()
+    call reach the wrapped backend, in a single batched call.
+
+    The cache is bounded (NLI_CACHE_SIZE entries). It is persisted to SQLite
+    when NLI_CACHE_PATH is set, in a table per backend (see backend_table).
+    Attributes other than predict() (warmup,
+    get_relatedness_score, ...) are forwarded to the wrapped backend.
+    """
+
+    def __init__(self, backend: ModelInterface, max_entries: int = None, path: str = None, table: str = None):
+        if max_entries is None:
+            max_entries = int(os.environ.get("NLI_CACHE_SIZE", 50000))
+        if path is None:
+            path = os.environ.get("NLI_CACHE_PATH") or None
+        if table is None:
+            table = backend_table(backend, "nli_scores")
+        self.backend = backend
+        self.cache = make_cache(max_entries=max_entries, path=path, table=table)
+        self._lock = threading.Lock()
+        self.pair_hits = 0
+        self.pair_misses = 0
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the wrapper itself
+        return getattr(self.__dict__["backend"], name)
+
+    @staticmethod
+    def _digest(text: str) -> str:
+        return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+    def pair_key(self, claim: str, passage_content: str) -> str:
+        return f"{self._digest(claim)}:{self._digest(passage_content)}"
+
+    def predict(self, inputs: List[Tuple[str, str]]) -> List[Tuple[float, float, float]]:
+        results: List[Tuple[float, float, float]] = [None] * len(inputs)
+        keys = [self.pair_key(claim, content) for claim, content in inputs]
+
+        missing = {}  # key -> input positions (duplicates inside one call share a slot)
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = tuple(cached)
+            else:
+                missing.setdefault(key, []).append(i)
+
+        if missing:
+            todo = [inputs[positions[0]] for positions in missing.values()]
+            scores = self.backend.predict(todo)
+            for (key, positions), score in zip(missing.items(), scores):
+                score = tuple(float(v) for v in score)
+                self.cache.set(key, score)
+                for i in positions:
+                    results[i] = score
+
+        with self._lock:
+            self.pair_misses += sum(len(p) for p in missing.values())
+            self.pair_hits += len(inputs) - sum(len(p) for p in missing.values())
+        return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.pair_hits + self.pair_misses
+            stats = {
+                "pair_hits": self.pair_hits,
+                "pair_misses": self.pair_misses,
+                "pair_hit_rate": round(self.pair_hits / lookups, 4) if lookups else 0.0,
+            }
+        stats.update({f"store_{k}": v for k, v in self.cache.stats().items()})
+        return stats
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+    def reopen(self) -> None:
+        """Gives a forked worker its own cache connection and lock."""
+        self._lock = threading.Lock()
+        self.cache.reopen()
@@ -1,23 +1,22 @@
+import logging
 import os
+from pathlib import Path
 from typing import List
 import joblib
-from sklearn.model_selection import train_test_split
 from modules.claim_extraction.Fact_Validator_Data_models import Citation, CitationValidationScoring, FactCheckFeatures, FactCheckResult, ModelInterface, SourcePassage, VerdictType
 import numpy as np
 from datetime import datetime
 from typing import Dict, List, Tuple
 from datetime import datetime, timezone
 
-
-# [!] IMPORT CHANGES
-from sklearn.preprocessing import LabelEncoder  # <-- Corrected import
-from sklearn.metrics import classification_report
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier # <-- NEW
-# from sklearn.tree import DecisionTreeClassifier # <-- REMOVED
-
+# sklearn is only imported by _train (and by _load when no compiled .npz model exists)
+from modules.claim_extraction.CachedNLIModel import CachedNLIModel, backend_table
+from modules.claim_extraction.forest_predictor import ForestPredictor, compiled_path
 from modules.claim_extraction.training.Validator_Training_Data import GoldStandardExample
 from modules.llm.llm_engine_interface import LLMInterface
+from modules.metrics.registry import stage_timer
+
+logger = logging.getLogger(__name__)
 
 class FactValidator:
 
@@ -40,21 +39,27 @@ class FactValidator:
         self.related_gate = 0.05 # Relevance threshold
         self.agree_cut = 0.60    # Entailment threshold
         self.contra_cut = 0.60   # Contradiction threshold
-        self.clf = None # [!] This will be a RandomForestClassifier
+        self.clf = None # [!] ForestPredictor (the RandomForestClassifier compiled to numpy arrays)
         self.encoder = encoder
         self.model_path = model_path
         if training_data:
-            print("Training data provided. Starting new training...")
+            logger.info("Training data provided. Starting new training...")
             self._train(training_data)
         else:
-            print(f"No training data. Attempting to load models from '{self.model_path}'...")
+            logger.info("No training data. Attempting to load models from '%s'...", self.model_path)
             self._load()
 
         # Final check
         if not self.clf or not self.encoder:
             raise RuntimeError("FactValidator initialization failed. No classifier or encoder is available.")
         
-        print("FactValidator is ready.")
+        logger.info("FactValidator is ready.")
+
+    def _set_models(self, clf, encoder: 'LabelEncoder') -> None:
+        self.clf = clf
+        self.encoder = encoder
+        # predict_proba column -> verdict string, so decoding is one array index
+        self._verdict_lookup = encoder.classes_[np.asarray(clf.classes_, dtype=int)]
 
     def _prepare_features(self, features: 'FactCheckFeatures', num_agree: int, num_disagree: int, len_valid_results: int, len_passages: int) -> np.ndarray:
         feature_vector = [
@@ -77,9 +82,6 @@ class FactValidator:
         Uses the trained Random Forest to predict the verdict AND
         calculate a confidence score based on the model's output probabilities.
         """
-        if not self.clf or not self.encoder:
-            raise ValueError("Classifier or Encoder not provided. Cannot predict.")
-            
         # 1. Assemble the feature vector in the correct order
         X_input = self._prepare_features(
             features, 
@@ -89,25 +91,22 @@ class FactValidator:
             len_passages
         )
 
-        # 2. Get the probabilities for ALL classes
-        all_probabilities = self.clf.predict_proba(X_input)
-        
-        # 3. Get the probabilities for our single input
-        class_probabilities = all_probabilities[0]
-        
-        # 4. Find the highest probability (confidence)
-        confidence = np.max(class_probabilities)
-        
-        # 5. Find the INDEX of the highest probability
-        predicted_numeric_label = np.argmax(class_probabilities)
-        
-        # 6. Decode the numeric label back to the string verdict
-        verdict: VerdictType = self.encoder.inverse_transform([predicted_numeric_label])[0]
-        
-        # 7. Convert confidence (0.0-1.0) to an integer score (0-100)
-        score = int(confidence * 100)
-        
-        return verdict, score
+        # 2. Predict (probabilities -> verdict and confidence score)
+        return self._predict_verdicts(X_input)[0]
+
+    def _predict_verdicts(self, X: np.ndarray) -> List[Tuple[VerdictType, int]]:
+        """
+        Scores every row of the feature matrix X in ONE predict_proba call.
+        Each row's verdict is its most probable class and its score is that
+        class's probability as an integer percentage (0-100).
+        """
+        if not self.clf or not self.encoder:
+            raise ValueError("Classifier or Encoder not provided. Cannot predict.")
+        with stage_timer("classifier"):
+            probabilities = self.clf.predict_proba(X)
+        best = probabilities.argmax(axis=1)
+        scores = (probabilities[np.arange(len(best)), best] * 100).astype(int)
+        return list(zip(self._verdict_lookup[best].tolist(), scores.tolist()))
     
     # --- STUBBED METHODS ---
 
@@ -115,11 +114,29 @@ class FactValidator:
         if not self.nli:
             raise ValueError("NLI backend not provided.")
         inputs = [(claim, content) for content in passage_contents]
-        return self.nli.predict(inputs) 
+        with stage_timer("nli"):
+            return self.nli.predict(inputs) 
+
+    def _get_nli_results_batch(self, claims_and_contents: List[Tuple[str, List[str]]],
+                               nli: ModelInterface = None) -> List[List[Tuple[float, float, float]]]:
+        """Runs NLI for several claims in ONE predict() call and splits the results per claim."""
+        nli = nli or self.nli
+        if not nli:
+            raise ValueError("NLI backend not provided.")
+        inputs = [(claim, content) for claim, contents in claims_and_contents for content in contents]
+        with stage_timer("nli"):
+            flat = nli.predict(inputs) if inputs else []
+        results, start = [], 0
+        for _, contents in claims_and_contents:
+            results.append(flat[start:start + len(contents)])
+            start += len(contents)
+        return results
 
     def _calculate_recency(self, published_at: datetime) -> Tuple[float, bool]:
         if not published_at:
             return (0.5, False)
+        if published_at.tzinfo is None:
+            published_at = published_at.replace(tzinfo=timezone.utc)  # gold-standard data uses naive datetimes
         days_diff = (datetime.now(timezone.utc) - published_at).days
         if days_diff < 30:
             return (1.0, True)
@@ -165,8 +182,64 @@ class FactValidator:
         # 2. Get NLI results
         passage_contents = [p.content for p in related_passages]
         nli_results = self._get_nli_results(claim, passage_contents)
-        print(f"[NLI] Processed {len(nli_results)} passages. Sample scores: {nli_results[:2]}")
+        logger.debug("NLI processed %d passages. Sample scores: %s", len(nli_results), nli_results[:2])
 
+        return self._build_result(claim, related_passages, nli_results)
+
+    def validate_claims_batch(self, items: List[Tuple[str, str, List[SourcePassage]]]) -> List[FactCheckResult]:
+        """
+        Validates several (claim, claim_type, passages) items at once.
+        NLI for every (claim, passage) pair runs in a single predict() call;
+        each claim then goes through the same steps as validate_claim.
+        """
+        related = [[p for p in passages if p.relevance_score >= self.related_gate] for _, _, passages in items]
+        nli_batches = self._get_nli_results_batch(
+            [(claim, [p.content for p in rel]) for (claim, _, _), rel in zip(items, related)]
+        )
+        logger.debug("NLI processed %d passages for %d claims", sum(map(len, nli_batches)), len(items))
+        return self._results_from_nli([claim for claim, _, _ in items], related, nli_batches)
+
+    def _results_from_nli(self, claims: List[str], related: List[List[SourcePassage]],
+                          nli_batches: List[List[Tuple[float, float, float]]]) -> List[FactCheckResult]:
+        """Steps 3-8 for several claims whose NLI scores are known; one predict_proba call for all."""
+        results: List[FactCheckResult] = [None] * len(claims)
+        pending, rows = [], []
+        for i, (claim, rel, nli_results) in enumerate(zip(claims, related, nli_batches)):
+            if not rel:
+                features = FactCheckFeatures(0, 0, 0, 0, 0, 0)
+                results[i] = FactCheckResult(claim, "Not enough evidence", 0, [], features)
+                continue
+            valid_results, features, num_agree, num_disagree = self._collect_evidence(rel, nli_results)
+            if not valid_results:
+                results[i] = FactCheckResult(claim, "Not enough evidence", 25, [], features)
+                continue
+            pending.append((i, claim, valid_results, features, num_agree, num_disagree))
+            rows.append(self._prepare_features(features, num_agree, num_disagree, len(valid_results), len(rel)))
+
+        if rows:
+            verdicts = self._predict_verdicts(np.vstack(rows))
+            for (i, claim, valid_results, features, num_agree, num_disagree), (verdict, score) in zip(pending, verdicts):
+                results[i] = self._finish_result(claim, verdict, score, valid_results, features, num_agree, num_disagree)
+        return results
+
+    def _build_result(self, claim: str, related_passages: List[SourcePassage], nli_results: List[Tuple[float, float, float]]) -> FactCheckResult:
+        """Steps 3-8 of validate_claim: combine NLI scores, compute features, predict the verdict."""
+        valid_results, features, num_agree, num_disagree = self._collect_evidence(related_passages, nli_results)
+        if not valid_results:
+            # We found passages, but they were all neutral.
+            return FactCheckResult(claim, "Not enough evidence", 25, [], features) # Score 25
+
+        # 7. Get final verdict (using the classifier)
+        verdict, score = self._calculate_final_score_and_verdict(
+            features, num_agree, num_disagree, len(valid_results), len(related_passages)
+        )
+        return self._finish_result(claim, verdict, score, valid_results, features, num_agree, num_disagree)
+
+    def _collect_evidence(self, related_passages: List[SourcePassage], nli_results: List[Tuple[float, float, float]]):
+        """
+        Steps 3-6 of validate_claim. Returns (valid_results, features, num_agree, num_disagree);
+        when every passage is neutral, valid_results is empty and features describe all passages.
+        """
         # 3. Combine all info
         all_results = []
         for passage, (e, c, n) in zip(related_passages, nli_results):
@@ -178,15 +251,11 @@ class FactValidator:
 
         # 4. Filter valid results (not strongly neutral)
         valid_results = [r for r in all_results if r.entail_prob > 0.5 or r.contradict_prob > 0.5]
-        print(f"[FILTER] {len(valid_results)} valid results from {len(all_results)} total (threshold: entail/contra > 0.5)")
+        logger.debug("%d valid results from %d total (threshold: entail/contra > 0.5)", len(valid_results), len(all_results))
 
-        len_valid_results = len(valid_results)
-        
         if not valid_results:
-            # We found passages, but they were all neutral.
             # We can calculate features from *all* results to show *why* it was NEI.
-            features = self._calculate_features(all_results) 
-            return FactCheckResult(claim, "Not enough evidence", 25, [], features) # Score 25
+            return [], self._calculate_features(all_results), 0, 0
 
         # 5. Get counts
         num_agree = sum(1 for r in valid_results if r.entail_prob > self.agree_cut)
@@ -194,12 +263,12 @@ class FactValidator:
 
         # 6. Calculate features
         features = self._calculate_features(valid_results)
+        return valid_results, features, num_agree, num_disagree
 
-        # 7. Get final verdict (using the classifier)
-        verdict, score = self._calculate_final_score_and_verdict(
-            features, num_agree, num_disagree, len_valid_results, len_passages
-        )
-        print(f"[VERDICT] {verdict} (score: {score}) | agree={num_agree}, disagree={num_disagree}, features: entail_max={features.entail_max:.2f}, contra_max={features.contradict_max:.2f}")
+    def _finish_result(self, claim: str, verdict: VerdictType, score: int, valid_results: List[CitationValidationScoring],
+                       features: FactCheckFeatures, num_agree: int, num_disagree: int) -> FactCheckResult:
+        logger.debug("Verdict %s (score: %s) | agree=%d, disagree=%d, entail_max=%.2f, contra_max=%.2f",
+                     verdict, score, num_agree, num_disagree, features.entail_max, features.contradict_max)
 
         # 8. Get citations
         # Get top 3 for display
@@ -217,50 +286,61 @@ class FactValidator:
     def generate_training_example(self, claim: str, passages: List[SourcePassage]) -> Tuple[FactCheckFeatures, int, int, int, int]:
         # 1. Filter by relevance
         related_passages = [p for p in passages if p.relevance_score >= self.related_gate]
-        len_passages = len(related_passages)
-
-        if not related_passages:
-            features = FactCheckFeatures(0, 0, 0, 0, 0, 0)
-            return features, 0, 0, 0, 0
 
         # 2. Get NLI results
-        passage_contents = [p.content for p in related_passages]
-        nli_results = self._get_nli_results(claim, passage_contents)
-        
-        # 3. Combine all info
-        all_results = []
-        for passage, (e, c, n) in zip(related_passages, nli_results):
-            recency_w, date_ok = self._calculate_recency(passage.published_at)
-            all_results.append(CitationValidationScoring(
-                passage=passage, entail_prob=e, contradict_prob=c, neutral_prob=n,
-                recency_weight=recency_w, numeric_date_ok=date_ok
-            ))
-        
-        # 4. Filter valid results
-        # [!] BUG FIX: Changed from 0.3 to 0.5 to match validate_claim
-        valid_results = [r for r in all_results if r.entail_prob > 0.5 or r.contradict_prob > 0.5]
-        len_valid_results = len(valid_results)
-        
-        if not valid_results:
-            features = self._calculate_features(all_results)
-            return features, 0, 0, 0, len_passages # Return len_passages
+        nli_results = self._get_nli_results(claim, [p.content for p in related_passages]) if related_passages else []
+        return self._training_example(related_passages, nli_results)
 
-        # 5. Get counts
-        num_agree = sum(1 for r in valid_results if r.entail_prob > self.agree_cut)
-        num_disagree = sum(1 for r in valid_results if r.contradict_prob > self.contra_cut)
+    def _training_example(self, related_passages: List[SourcePassage],
+                          nli_results: List[Tuple[float, float, float]]) -> Tuple[FactCheckFeatures, int, int, int, int]:
+        """Steps 3-6 of validate_claim, returning the raw features and counts the classifier is trained on."""
+        if not related_passages:
+            return FactCheckFeatures(0, 0, 0, 0, 0, 0), 0, 0, 0, 0
+        valid_results, features, num_agree, num_disagree = self._collect_evidence(related_passages, nli_results)
+        return features, num_agree, num_disagree, len(valid_results), len(related_passages)
 
-        # 6. Calculate features
-        features = self._calculate_features(valid_results)
+    def _training_nli(self, examples: List[GoldStandardExample]):
+        """
+        Related passages and NLI scores for every example, from ONE predict()
+        call over all (claim, passage) pairs. Scores are cached on disk, so
+        retraining (new hyperparameters, more examples) only runs NLI for new pairs.
+        """
+        related = [[p for p in ex.passages if p.relevance_score >= self.related_gate] for ex in examples]
+        nli = self.nli
+        cache_path = self._training_cache_path()
+        if cache_path:
+            # One table per backend, like the serving cache
+            table = backend_table(self.nli, "nli_train")
+            nli = CachedNLIModel(self.nli, max_entries=10_000_000, path=cache_path, table=table)
 
-        # 7. Return the raw features and counts
-        return features, num_agree, num_disagree, len_valid_results, len_passages
+        try:
+            nli_batches = self._get_nli_results_batch(
+                [(ex.claim, [p.content for p in rel]) for ex, rel in zip(examples, related)], nli=nli
+            )
+        finally:
+            if nli is not self.nli:
+                nli.cache.close()
+        if nli is not self.nli:
+            print(f"NLI scores: {nli.pair_hits} pairs from {cache_path}, {nli.pair_misses} computed")
+        return related, nli_batches
+
+    def _training_cache_path(self):
+        """NLI_TRAIN_CACHE_PATH, else <model_path>_nli_cache.sqlite; None (no disk cache) without a model_path."""
+        path = os.environ.get("NLI_TRAIN_CACHE_PATH")
+        if path is None and self.model_path:
+            path = f"{Path(self.model_path).with_suffix('')}_nli_cache.sqlite"
+        return path or None
 
     def _train(self, gold_standard_dataset: List[GoldStandardExample]):
         """
         Trains the classifier and encoder for the specific
         FactValidator instance passed in.
         """
-        
+        from sklearn.preprocessing import LabelEncoder
+        from sklearn.metrics import classification_report
+        from sklearn.model_selection import train_test_split
+        from sklearn.ensemble import RandomForestClassifier
+
         # Check if the validator has an NLI backend
         if not self.nli:
             raise ValueError("The provided FactValidator must have a valid .nli backend for training.")
@@ -294,16 +374,18 @@ class FactValidator:
         # --- Step 2: Generate Training Data ---
         print("\nGenerating training data from raw examples...")
 
+        # NLI for the train AND test examples runs once, here; the test
+        # evaluation in Step 5 reuses these scores
+        related, nli_batches = self._training_nli(train_dataset + test_dataset)
+        n_train = len(train_dataset)
+
         X_train_list = []
         y_labels = []
 
         # [!] MODIFIED: Iterate over the train_dataset only
         for i, item in enumerate(train_dataset):
-            # 1. Use the *passed-in validator's* method to process the text
-            # This ensures we use the same settings (e.g., related_gate)
-            features, num_a, num_d, len_v, len_p = self.generate_training_example( # <-- CHANGED
-                item.claim, item.passages
-            )
+            # 1. Same steps (and settings, e.g. related_gate) as validate_claim
+            features, num_a, num_d, len_v, len_p = self._training_example(related[i], nli_batches[i])
             
             # 2. Get the feature vector
             feature_vector_1d = self._prepare_features( # <-- CHANGED
@@ -335,7 +417,8 @@ class FactValidator:
             random_state=42, 
             n_estimators=100,     # Use 100 "mini-trees"
             min_samples_leaf=3,   # Prevents 100% scores and overfitting
-            max_depth=10          # Prevents trees from getting too deep
+            max_depth=10,         # Prevents trees from getting too deep
+            n_jobs=int(os.environ.get("TRAIN_N_JOBS", -1))  # Trees are fit in parallel (same model for any n_jobs)
         )
         clf.fit(X_train, y_train)
         print("\n--- Random Forest Classifier Trained ---")
@@ -349,13 +432,14 @@ class FactValidator:
                 "encoder": encoder
             }
             joblib.dump(models_to_save, self.model_path)
+            ForestPredictor.from_sklearn(clf).save(compiled_path(self.model_path), encoder.classes_)
             print("Models saved successfully.")
         # --- [!] NEW: Step 4: Assign Trained Models to the Validator ---
         print("\nAssigning trained models to the self...")
         
         # This is the key part: we modify the validator instance directly.
-        self.clf = clf
-        self.encoder = encoder
+        # Predictions go through the compiled forest (same probabilities as clf).
+        self._set_models(ForestPredictor.from_sklearn(clf), encoder)
 
         # --- Step 5: Test the New Validator and Collect Results ---
         print("\n--- Testing the *newly trained* validator on UNSEEN test data ---")
@@ -363,11 +447,13 @@ class FactValidator:
         y_true = [] # The ground truth labels
         y_pred = [] # The model's predicted labels
 
+        # Same verdicts as validate_claim, from the NLI scores computed in Step 2
+        test_results = self._results_from_nli(
+            [ex.claim for ex in test_dataset], related[n_train:], nli_batches[n_train:]
+        )
+
         correct_predictions = 0
-        for i, test_example in enumerate(test_dataset):
-            # Run the full validation pipeline on the validator we just trained
-            result = self.validate_claim(test_example.claim, '', test_example.passages) # <-- CHANGED
-            
+        for i, (test_example, result) in enumerate(zip(test_dataset, test_results)):
             expected = test_example.ground_truth_verdict
             predicted = result.verdict
             
@@ -400,19 +486,34 @@ class FactValidator:
 
 
     def _load(self):
-        """Loads the classifier and encoder from the specified model_path."""
-        if not os.path.exists(self.model_path):
+        """
+        Loads the classifier and encoder. Prefers the compiled forest
+        (<model_path>.npz, no sklearn import) unless the joblib file is newer;
+        otherwise loads the joblib bundle and compiles it in memory.
+        """
+        compiled = compiled_path(self.model_path)
+        joblib_exists = os.path.exists(self.model_path)
+        if compiled.exists() and (not joblib_exists or compiled.stat().st_mtime >= os.path.getmtime(self.model_path)):
+            logger.info("Loading compiled models from %s...", compiled)
+            try:
+                self._set_models(*ForestPredictor.load(compiled))
+                logger.info("Models loaded: %d classes %s", len(self.encoder.classes_), list(self.encoder.classes_))
+                return
+            except Exception as e:
+                if not joblib_exists:
+                    raise IOError(f"Failed to load or parse model file at {compiled}: {e}")
+                logger.warning("Could not load %s (%s); falling back to %s", compiled, e, self.model_path)
+
+        if not joblib_exists:
             raise FileNotFoundError(
                 f"No training data provided and model file not found at '{self.model_path}'. "
                 "Please provide 'training_data' to train a new model or place the file in the correct path."
             )
         
-        print(f"Loading models from {self.model_path}...")
+        logger.info("Loading models from %s...", self.model_path)
         try:
             loaded_models = joblib.load(self.model_path)
-            self.clf = loaded_models["clf"]
-            self.encoder = loaded_models["encoder"]
-            print("Models loaded successfully.")
-            print(f"Loaded {len(self.encoder.classes_)} classes: {self.encoder.classes_}")
+            self._set_models(ForestPredictor.from_sklearn(loaded_models["clf"]), loaded_models["encoder"])
+            logger.info("Models loaded: %d classes %s", len(self.encoder.classes_), list(self.encoder.classes_))
         except Exception as e:
-            raise IOError(f"Failed to load or parse model file at {self.model_path}: {e}")
\ No newline at end of file
+            raise IOError(f"Failed to load or parse model file at {self.model_path}: {e}")
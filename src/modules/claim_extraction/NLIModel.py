@@ -2,6 +2,9 @@
 # --- REAL NLI MODEL (with the required .predict() method) ---
 # ==============================================================================
 NLI_LABELS = ["contradiction", "neutral", "entailment"]
+import logging
+import os
+import threading
 from typing import List, Tuple
 import torch
 from sentence_transformers import SentenceTransformer, util
@@ -13,33 +16,143 @@ from modules.claim_extraction.Fact_Validator_Data_models import ModelInterface
 # Suppress heavy logging
 hf_logging.set_verbosity_error()
 
+logger = logging.getLogger(__name__)
+
 
 class NLIModel(ModelInterface): # Inherit from stub
     """
     Concrete implementation of ModelInterface using Sentence-Transformers and Hugging Face's NLI model.
     """
-    def __init__(self, emb_model_name: str, nli_model_name: str, nli_labels: list[str]):
-        print("Initializing heavy models... This happens once.")
-        self.emb_model = SentenceTransformer(emb_model_name)
+    # Tensor type handed to _forward() by the tokenizer
+    tensor_type = "pt"
+
+    def __init__(self, emb_model_name: str, nli_model_name: str, nli_labels: list[str], batch_size: int = None,
+                 device: str = None, num_threads: int = None, interop_threads: int = None, quantize: bool = False,
+                 emb_model: SentenceTransformer = None):
+        logger.info("Initializing heavy models... This happens once.")
+        self._configure_threads(num_threads, interop_threads)
+
+        self._init_emb_model(emb_model_name, emb_model)
+        self.nli_model_name = nli_model_name
         self.nli_tok = AutoTokenizer.from_pretrained(nli_model_name)
         self.nli_model = AutoModelForSequenceClassification.from_pretrained(nli_model_name)
         self.NLI_LABELS = nli_labels
 
+        # Number of (claim, passage) pairs per forward pass in predict()
+        if batch_size is None:
+            batch_size = int(os.environ.get("NLI_BATCH_SIZE", 16))
+        self.batch_size = max(1, batch_size)
+
+        # Place the model once; every forward pass reuses this device
+        if device is None:
+            device = os.environ.get("NLI_DEVICE") or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.device = torch.device(device)
+        self.nli_model.to(self.device)
+        self.nli_model.eval()
+
+        # Dynamic int8 quantization of the Linear layers (CPU only)
+        self.quantize = quantize
+        if quantize:
+            if self.device.type != "cpu":
+                raise ValueError("int8 quantization is only supported on CPU")
+            self.nli_model = torch.quantization.quantize_dynamic(
+                self.nli_model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+    @staticmethod
+    def _configure_threads(num_threads: int = None, interop_threads: int = None) -> None:
+        """
+        Applies torch CPU thread settings from the arguments or from
+        NLI_NUM_THREADS / NLI_INTEROP_THREADS. Unset values keep torch defaults.
+        """
+        if num_threads is None and os.environ.get("NLI_NUM_THREADS"):
+            num_threads = int(os.environ["NLI_NUM_THREADS"])
+        if interop_threads is None and os.environ.get("NLI_INTEROP_THREADS"):
+            interop_threads = int(os.environ["NLI_INTEROP_THREADS"])
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        if interop_threads:
+            try:
+                torch.set_num_interop_threads(interop_threads)
+            except RuntimeError as e:
+                # Torch only allows this before any inter-op parallel work has run
+                logger.warning("Could not set interop threads: %s", e)
+
+    def warmup(self, rounds: int = 1) -> None:
+        """
+        Runs dummy batches through the model so the first real request
+        does not pay for lazy kernel selection and allocator growth.
+        """
+        pair = ("The team won the game.", "The team lost the game in overtime.")
+        for _ in range(max(1, rounds)):
+            self._predict_probabilities([pair] * self.batch_size)
+
+    def _init_emb_model(self, emb_model_name: str, emb_model: SentenceTransformer = None) -> None:
+        """
+        The relatedness encoder is only needed by get_relatedness_score(), so it
+        is loaded on first use. Pass `emb_model` to reuse an already-loaded model.
+        """
+        self.emb_model_name = emb_model_name
+        self._emb_model = emb_model
+        self._emb_model_lock = threading.Lock()
+
+    @property
+    def emb_model(self) -> SentenceTransformer:
+        if self._emb_model is None:
+            with self._emb_model_lock:
+                if self._emb_model is None:
+                    logger.info("Loading relatedness encoder '%s'...", self.emb_model_name)
+                    self._emb_model = SentenceTransformer(self.emb_model_name)
+        return self._emb_model
+
+    @property
+    def cache_key(self) -> str:
+        """Names this backend's scores in persistent caches: class, model and weight precision."""
+        return f"{type(self).__name__}:{self.nli_model_name}:{'int8' if self.quantize else 'fp32'}"
+
     def get_relatedness_score(self, s1: str, s2: str) -> float:
         e1, e2 = self.emb_model.encode([s1, s2], convert_to_tensor=True)
         cos = util.cos_sim(e1, e2).item()
         return (cos + 1) / 2  # map [-1,1] → [0,1]
 
     def get_nli_probabilities(self, a: str, b: str) -> dict[str, float]:
-        # Ensure model is on the correct device (e.g., CUDA if available)
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.nli_model.to(device)
-        
-        x = self.nli_tok.encode_plus(a, b, return_tensors="pt", truncation=True).to(device)
-        with torch.no_grad():
-            p = torch.softmax(self.nli_model(**x).logits, dim=-1).squeeze().tolist()
+        p = self._predict_probabilities([(a, b)])[0]
         return dict(zip(self.NLI_LABELS, p))
 
+    def _forward(self, batch: dict) -> List[List[float]]:
+        """
+        Runs one forward pass over a padded micro-batch of token ids.
+        Returns one probability row per pair, ordered like self.NLI_LABELS.
+        """
+        x = {k: v.to(self.device) for k, v in batch.items()}
+        with torch.inference_mode():
+            p = torch.softmax(self.nli_model(**x).logits, dim=-1)
+        return p.tolist()
+
+    def _predict_probabilities(self, inputs: List[Tuple[str, str]]) -> List[List[float]]:
+        """
+        Tokenizes all pairs in one call, then runs them in micro-batches of
+        self.batch_size. Pairs are sorted by token length so each batch pads
+        only to a similar length. Results come back in input order.
+        """
+        if not inputs:
+            return []
+
+        firsts = [a for a, _ in inputs]
+        seconds = [b for _, b in inputs]
+        encoded = self.nli_tok(firsts, seconds, truncation=True)
+        order = sorted(range(len(inputs)), key=lambda i: len(encoded["input_ids"][i]))
+
+        results: List[List[float]] = [None] * len(inputs)
+        for start in range(0, len(order), self.batch_size):
+            batch_ids = order[start:start + self.batch_size]
+            features = [{k: encoded[k][i] for k in encoded.keys()} for i in batch_ids]
+            batch = self.nli_tok.pad(features, padding=True, return_tensors=self.tensor_type)
+            for i, p in zip(batch_ids, self._forward(batch)):
+                results[i] = p
+        return results
+
     # --- [!] IMPLEMENTED .predict() METHOD ---
     def predict(self, inputs: List[Tuple[str, str]]) -> List[Tuple[float, float, float]]:
         """
@@ -47,10 +160,34 @@ class NLIModel(ModelInterface): # Inherit from stub
         the gap with FactValidator.
         """
         results = []
-        for claim, passage_content in inputs:
-            prob_dict = self.get_nli_probabilities(claim, passage_content)
+        for p in self._predict_probabilities(inputs):
+            prob_dict = dict(zip(self.NLI_LABELS, p))
             e = prob_dict.get("entailment", 0.0)
             c = prob_dict.get("contradiction", 0.0)
             n = prob_dict.get("neutral", 0.0)
             results.append((e, c, n))
-        return results
\ No newline at end of file
+        return results
+
+
+NLI_BACKENDS = ("torch", "torch-int8", "onnx")
+
+
+def create_nli_model(emb_model_name: str, nli_model_name: str, nli_labels: list[str], backend: str = None) -> ModelInterface:
+    """
+    Builds the NLI backend named by `backend` or the NLI_BACKEND env var:
+        torch       fp32 PyTorch (default)
+        torch-int8  PyTorch with dynamic int8 quantization
+        onnx        ONNX Runtime (see ONNXNLIModel)
+    """
+    if backend is None:
+        backend = os.environ.get("NLI_BACKEND", "torch")
+    backend = backend.strip().lower()
+
+    if backend == "torch":
+        return NLIModel(emb_model_name, nli_model_name, nli_labels)
+    if backend == "torch-int8":
+        return NLIModel(emb_model_name, nli_model_name, nli_labels, device="cpu", quantize=True)
+    if backend == "onnx":
+        from modules.claim_extraction.ONNXNLIModel import ONNXNLIModel
+        return ONNXNLIModel(emb_model_name, nli_model_name, nli_labels)
+    raise ValueError(f"Unknown NLI backend '{backend}'. Allowed values: {list(NLI_BACKENDS)}")
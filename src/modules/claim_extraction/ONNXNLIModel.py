@@ -0,0 +1,119 @@
+# ==============================================================================
+# --- ONNX RUNTIME NLI MODEL (same .predict() contract as NLIModel) ---
+# ==============================================================================
+import logging
+import os
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+from transformers import AutoTokenizer
+
+from modules.claim_extraction.NLIModel import NLIModel
+
+try:
+    import onnxruntime as ort
+except ImportError as e:
+    raise ImportError("Install onnxruntime to use the ONNX NLI backend: pip install onnxruntime") from e
+
+logger = logging.getLogger(__name__)
+
+
+class ONNXNLIModel(NLIModel):
+    """
+    NLIModel variant that runs the cross-encoder with ONNX Runtime.
+
+    The Hugging Face model is exported to ONNX on first use and cached at
+    `onnx_path` (default: NLI_ONNX_PATH or data/models/onnx/<model>.onnx).
+    With quantize=True (or NLI_ONNX_QUANTIZE=1) the exported graph is
+    dynamically quantized to int8 weights. Tokenization, micro-batching
+    and predict() are inherited from NLIModel.
+
+    torch is still imported (via NLIModel and sentence-transformers, whose
+    relatedness encoder needs it), but no torch NLI weights are loaded and
+    torch thread settings are left alone; only the ONNX session runs NLI.
+    """
+
+    tensor_type = "np"
+
+    def __init__(self, emb_model_name: str, nli_model_name: str, nli_labels: list[str], batch_size: int = None,
+                 onnx_path: str = None, num_threads: int = None, quantize: bool = None,
+                 emb_model: SentenceTransformer = None):
+        logger.info("Initializing heavy models (ONNX Runtime)... This happens once.")
+        self._init_emb_model(emb_model_name, emb_model)
+        self.nli_model_name = nli_model_name
+        self.nli_tok = AutoTokenizer.from_pretrained(nli_model_name)
+        self.NLI_LABELS = nli_labels
+
+        if batch_size is None:
+            batch_size = int(os.environ.get("NLI_BATCH_SIZE", 16))
+        self.batch_size = max(1, batch_size)
+
+        if quantize is None:
+            quantize = os.environ.get("NLI_ONNX_QUANTIZE", "0").strip().lower() in {"1", "true", "yes"}
+        if onnx_path is None:
+            default_path = Path("data/models/onnx") / f"{nli_model_name.replace('/', '__')}.onnx"
+            onnx_path = os.environ.get("NLI_ONNX_PATH", str(default_path))
+        onnx_path = Path(onnx_path)
+
+        if not onnx_path.exists():
+            self._export(nli_model_name, onnx_path)
+        self.quantize = quantize
+        if quantize:
+            onnx_path = self._quantize(onnx_path)
+        self.onnx_path = str(onnx_path)
+
+        if num_threads is None and os.environ.get("NLI_NUM_THREADS"):
+            num_threads = int(os.environ["NLI_NUM_THREADS"])
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(self.onnx_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = [i.name for i in self.session.get_inputs()]
+
+    @staticmethod
+    def _export(nli_model_name: str, onnx_path: Path) -> None:
+        """Exports the Hugging Face classifier to ONNX with dynamic batch/sequence axes."""
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        logger.info("Exporting %s to %s ...", nli_model_name, onnx_path)
+        model = AutoModelForSequenceClassification.from_pretrained(nli_model_name)
+        model.config.return_dict = False
+        model.eval()
+        tok = AutoTokenizer.from_pretrained(nli_model_name)
+        sample = tok(["A claim."], ["A passage about the claim."], return_tensors="pt")
+
+        onnx_path.parent.mkdir(parents=True, exist_ok=True)
+        dynamic = {0: "batch", 1: "sequence"}
+        with torch.inference_mode():
+            torch.onnx.export(
+                model,
+                (sample["input_ids"], sample["attention_mask"]),
+                str(onnx_path),
+                input_names=["input_ids", "attention_mask"],
+                output_names=["logits"],
+                dynamic_axes={"input_ids": dynamic, "attention_mask": dynamic, "logits": {0: "batch"}},
+                opset_version=17,
+            )
+
+    @staticmethod
+    def _quantize(onnx_path: Path) -> Path:
+        """Writes (once) and returns an int8 dynamically-quantized copy of the graph."""
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantized_path = onnx_path.with_name(onnx_path.stem + ".int8.onnx")
+        if not quantized_path.exists():
+            logger.info("Quantizing %s to %s ...", onnx_path, quantized_path)
+            quantize_dynamic(str(onnx_path), str(quantized_path), weight_type=QuantType.QInt8)
+        return quantized_path
+
+    def _forward(self, batch: dict) -> List[List[float]]:
+        feeds = {name: np.asarray(batch[name], dtype=np.int64) for name in self._input_names}
+        logits = self.session.run(None, feeds)[0]
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        p = np.exp(logits)
+        p /= p.sum(axis=-1, keepdims=True)
+        return p.tolist()
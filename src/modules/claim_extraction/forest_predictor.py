@@ -0,0 +1,166 @@
+"""
+forest_predictor.py
+
+The verdict RandomForest compiled to flat numpy arrays. Every tree's nodes
+are concatenated into one node table (feature, threshold, left, right,
+leaf class probabilities), and predict_proba walks all trees for all rows
+at once with array indexing. It gives the same probabilities as
+sklearn's RandomForestClassifier.predict_proba, without sklearn's
+per-call input validation and joblib dispatch, and the saved .npz loads
+without importing sklearn.
+
+Export an existing model (FactValidator._train also writes it on save):
+
+    python src/modules/claim_extraction/forest_predictor.py fact_validator_models.joblib
+"""
+
+from pathlib import Path
+from typing import Sequence, Union
+
+import numpy as np
+
+
+def compiled_path(model_path: Union[str, Path]) -> Path:
+    """fact_validator_models.joblib -> fact_validator_models.npz"""
+    return Path(model_path).with_suffix(".npz")
+
+
+class VerdictDecoder:
+    """The part of LabelEncoder FactValidator uses: classes_ and inverse_transform."""
+
+    def __init__(self, classes: Sequence[str]):
+        self.classes_ = np.asarray(classes)
+
+    def inverse_transform(self, y) -> np.ndarray:
+        return self.classes_[np.asarray(y, dtype=int)]
+
+
+class ForestPredictor:
+    """
+    Array form of a fitted RandomForestClassifier (trees without missing-value
+    support, as trained by FactValidator).
+
+    Leaves point to themselves, so after `max_depth` steps every row has
+    reached a leaf in every tree.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, classes, max_depth: int, n_features_in: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(n_features_in)
+
+    def __len__(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_sklearn(cls, clf) -> "ForestPredictor":
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset, max_depth = 0, 0
+        for estimator in clf.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left < 0
+            own = np.arange(offset, offset + n)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset))
+            # sklearn >= 1.4 stores class fractions per node and returns them as
+            # is; older versions store counts and normalise them in predict_proba
+            value = tree.value[:, 0, :].astype(np.float64)
+            totals = value.sum(axis=1, keepdims=True)
+            if not np.allclose(totals, 1.0):
+                totals[totals == 0.0] = 1.0
+                value = value / totals
+            values.append(value)
+            roots.append(offset)
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            classes=np.asarray(clf.classes_),
+            max_depth=max_depth,
+            n_features_in=clf.n_features_in_,
+        )
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """(n_samples, n_trees) array of the leaf each row reaches in each tree."""
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected X of shape (n, {self.n_features_in_}), got {X.shape}")
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        leaves = self.apply(X)
+        # Accumulate tree by tree, in the same order as sklearn
+        proba = np.zeros((leaves.shape[0], self.value.shape[1]))
+        for t in range(leaves.shape[1]):
+            proba += self.value[leaves[:, t]]
+        proba /= leaves.shape[1]
+        return proba
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+    # -------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------
+    def save(self, path: Union[str, Path], verdicts: Sequence[str]) -> None:
+        """Writes the forest and the encoder's verdict names to one .npz file."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f, feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+                value=self.value, roots=self.roots, classes=self.classes_,
+                max_depth=self.max_depth, n_features_in=self.n_features_in_,
+                verdicts=np.asarray(verdicts, dtype=str),
+            )
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]):
+        """Returns (ForestPredictor, VerdictDecoder)."""
+        with np.load(path, allow_pickle=False) as data:
+            forest = cls(
+                feature=data["feature"], threshold=data["threshold"], left=data["left"], right=data["right"],
+                value=data["value"], roots=data["roots"], classes=data["classes"],
+                max_depth=data["max_depth"], n_features_in=data["n_features_in"],
+            )
+            return forest, VerdictDecoder(data["verdicts"])
+
+
+def export_model(model_path: Union[str, Path], output_path: Union[str, Path] = None) -> Path:
+    """Compiles the joblib {"clf", "encoder"} bundle at model_path into a .npz file."""
+    import joblib
+    models = joblib.load(model_path)
+    output_path = Path(output_path) if output_path else compiled_path(model_path)
+    ForestPredictor.from_sklearn(models["clf"]).save(output_path, models["encoder"].classes_)
+    return output_path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile the FactValidator forest to a numpy .npz file.")
+    parser.add_argument("model_path", nargs="?", default="fact_validator_models.joblib")
+    parser.add_argument("--output", default=None, help="Output file (default: <model_path>.npz)")
+    args = parser.parse_args()
+    print(f"Wrote {export_model(args.model_path, args.output)}")
@@ -1,8 +1,9 @@
 from dotenv import load_dotenv
 from modules.llm.llm_engine_interface import LLMInterface
 import re
-from modules.llm.llm_reasoning_interface import LLMReasoningInterface
+from modules.llm.llm_reasoning_interface import LLMReasoningInterface, check_mode
 from typing import List, Dict, Any, Optional
+import os
 
 load_dotenv(override=True)
 
@@ -12,8 +13,9 @@ class EnhancedLLMReasoning(LLMReasoningInterface):
     particularly for contested claims with multiple valid but conflicting data points.
     """
     
-    def __init__(self, llm: LLMInterface):
+    def __init__(self, llm: LLMInterface, mode: str = None):
         self.llm = llm.build()
+        self.mode = check_mode(mode or os.environ.get("REASONING_MODE", "full"))
 
     def call_llm(self, prompt, temperature=0.0):
         """Call LLM with adjustable temperature for different reasoning stages"""
@@ -177,15 +179,15 @@ Reconciliation:"""
 
         return self.call_llm(prompt)
 
-    def generate_verdict_explanation(self, parsed_input):
+    def generate_verdict_explanation(self, parsed_input, mode="full"):
         """Generate a comprehensive explanation for the verdict"""
         claim = parsed_input.get('claim', '')
         verdict = parsed_input.get('verdict', '')
         score = parsed_input.get('score', '')
         citations = parsed_input.get('citation_list', [])
         
-        # For contested claims, use specialized reasoning
-        if verdict.lower() == "contested":
+        # For contested claims, use specialized reasoning (skipped in fast mode)
+        if verdict.lower() == "contested" and mode != "fast":
             analysis = self.analyze_contested_claim(parsed_input)
             reconciliation = self.reconcile_evidence(claim, analysis, citations)
             
@@ -228,8 +230,15 @@ Explanation:"""
             
             return self.call_llm(prompt)
 
-    def reasoning_agent(self, question):
-        """Main entry point for reasoning about fact-check results"""
+    def reasoning_agent(self, question, mode=None):
+        """
+        Main entry point for reasoning about fact-check results.
+
+        In "fast" mode every verdict gets the single-call explanation; contested
+        claims skip the separate analysis and reconciliation calls. This chain
+        has no discarded verification step, so "standard" and "full" behave the same.
+        """
+        mode = check_mode(mode) if mode else self.mode
         parsed_input = self.parse_fact_check_input(question)
         
         if not parsed_input.get('verdict'):
@@ -241,7 +250,7 @@ Explanation:"""
             return "We don't have enough evidence and data for this claim."
             
         # For all other verdicts, generate a specialized explanation
-        return self.generate_verdict_explanation(parsed_input)
+        return self.generate_verdict_explanation(parsed_input, mode)
 
 
 class NBA_Statistics_Reasoner(EnhancedLLMReasoning):
@@ -250,8 +259,8 @@ class NBA_Statistics_Reasoner(EnhancedLLMReasoning):
     and can explain apparent contradictions in player data across different seasons, teams, or metrics.
     """
     
-    def __init__(self, llm: LLMInterface):
-        super().__init__(llm)
+    def __init__(self, llm: LLMInterface, mode: str = None):
+        super().__init__(llm, mode)
         
     def identify_statistical_pattern(self, claim, citations):
         """Identify statistical patterns in NBA data"""
@@ -345,8 +354,8 @@ class Temporal_Context_Reasoner(EnhancedLLMReasoning):
     particularly useful for claims that may have been true in one period but not another.
     """
     
-    def __init__(self, llm: LLMInterface):
-        super().__init__(llm)
+    def __init__(self, llm: LLMInterface, mode: str = None):
+        super().__init__(llm, mode)
         
     def extract_temporal_context(self, claim, citations):
         """Extract temporal context from claims and evidence"""
@@ -401,8 +410,8 @@ class Multi_Perspective_Reasoner(EnhancedLLMReasoning):
     why claims might be contested rather than simply true or false.
     """
     
-    def __init__(self, llm: LLMInterface):
-        super().__init__(llm)
+    def __init__(self, llm: LLMInterface, mode: str = None):
+        super().__init__(llm, mode)
         
     def identify_perspectives(self, claim, citations):
         """Identify different valid perspectives on the claim"""
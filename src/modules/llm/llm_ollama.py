@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import List
 import ollama
 from modules.llm.llm_engine_interface import LLMInterface
+from modules.metrics.registry import track_llm_call
 import subprocess
 
 class llm_ollama(LLMInterface):
@@ -35,12 +36,21 @@ class llm_ollama(LLMInterface):
             time.sleep(3)
 
     def raw_messages(self, messages: List) -> str:
-        response = ollama.chat(model=self.model, messages=messages)
+        with track_llm_call("ollama", self.model) as usage:
+            response = ollama.chat(model=self.model, messages=messages)
+            self._record_usage(response, usage)
         return response.message.content
     
     def message(self, message: str) -> str:
-        response = ollama.chat(model=self.model, messages=[{"role": self.role, "content": message}])
+        with track_llm_call("ollama", self.model) as usage:
+            response = ollama.chat(model=self.model, messages=[{"role": self.role, "content": message}])
+            self._record_usage(response, usage)
         return response.message.content
+
+    @staticmethod
+    def _record_usage(response, usage: dict) -> None:
+        usage["prompt_tokens"] = getattr(response, "prompt_eval_count", None)
+        usage["completion_tokens"] = getattr(response, "eval_count", None)
     
     def set_role(self, role):
         self.role = role
@@ -2,6 +2,7 @@ from typing import List
 from dotenv import load_dotenv
 load_dotenv(override=True)
 from modules.llm.llm_engine_interface import LLMInterface
+from modules.metrics.registry import track_llm_call
 from openai import OpenAI
 import os
 
@@ -14,21 +15,31 @@ class llm_openai(LLMInterface):
         self.max_tokens = 1000
     
     def raw_messages(self, messages: List) -> str:
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens
-        )
+        with track_llm_call("openai", self.model) as usage:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens
+            )
+            self._record_usage(response, usage)
         return response.choices[0].message.content
     
     def message(self, message: str) -> str:
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": self.role, "content": message}],
-            temperature=self.temperature
-        )
+        with track_llm_call("openai", self.model) as usage:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": self.role, "content": message}],
+                temperature=self.temperature
+            )
+            self._record_usage(response, usage)
         return response.choices[0].message.content
+
+    @staticmethod
+    def _record_usage(response, usage: dict) -> None:
+        if getattr(response, "usage", None) is not None:
+            usage["prompt_tokens"] = response.usage.prompt_tokens
+            usage["completion_tokens"] = response.usage.completion_tokens
     
     def build(self) -> LLMInterface:
         return llm_openai(self.role, self.temperature, self.model)
\ No newline at end of file
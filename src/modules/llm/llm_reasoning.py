@@ -2,11 +2,13 @@ from dotenv import load_dotenv
 from modules.llm.llm_engine_interface import LLMInterface
 load_dotenv(override=True)
 
-from modules.llm.llm_reasoning_interface import LLMReasoningInterface
+import os
+from modules.llm.llm_reasoning_interface import LLMReasoningInterface, check_mode
 
 class llm_reasoning(LLMReasoningInterface):
-    def __init__(self, llm: LLMInterface):
+    def __init__(self, llm: LLMInterface, mode: str = None):
         self.llm = llm.build()
+        self.mode = check_mode(mode or os.environ.get("REASONING_MODE", "full"))
 
     def call_llm(self, prompt):
         return self.llm.raw_messages(
@@ -16,6 +18,19 @@ class llm_reasoning(LLMReasoningInterface):
             ],
         ).strip()
 
+    def single_step_explain(self, question):
+        prompt = f"""Answer the following problem in a single pass:
+
+Problem: {question}
+
+Respond with these sections:
+Core question: <one sentence>
+Key evidence: <the facts that decide the answer>
+Reasoning: <short step-by-step reasoning>
+Final answer: <the conclusion and why>
+"""
+        return self.call_llm(prompt)
+
     def step_1_understand(self, question):
         prompt = f"""Understand the following problem and describe what is being asked:
 
@@ -124,11 +139,16 @@ Is this answer correct? If not, explain the mistake. If yes, justify it.
             "citations": citations
         }
 
-    def reasoning_agent(self, question):
+    def reasoning_agent(self, question, mode=None):
+        mode = check_mode(mode) if mode else self.mode
+        if mode == "fast":
+            return self.single_step_explain(question)
+
         understanding = self.step_1_understand(question)
         decomposition = self.step_2_decompose(understanding)
         solutions = self.step_3_solve_each(decomposition)
         final = self.step_4_combine(solutions)
-        verification = self.step_5_verify(final, question)
-        #explanation = self.extract_components(verification, final, solutions)
+        if mode == "full":
+            verification = self.step_5_verify(final, question)
+            #explanation = self.extract_components(verification, final, solutions)
         return final
@@ -1,5 +1,15 @@
 from abc import abstractmethod, ABC
 
+REASONING_MODES = ("fast", "standard", "full")
+
+
+def check_mode(mode: str) -> str:
+    """Normalizes a reasoning mode name; raises ValueError for unknown modes."""
+    mode = (mode or "").strip().lower()
+    if mode not in REASONING_MODES:
+        raise ValueError(f"Invalid reasoning mode '{mode}'. Allowed values: {list(REASONING_MODES)}")
+    return mode
+
 
 # New Abstract Class for the LLM Dependency
 class LLMReasoningInterface(ABC):
@@ -7,5 +17,12 @@ class LLMReasoningInterface(ABC):
     Abstract interface for any underlying Language Model (e.g., OpenAI, Gemini, HuggingFace).
     """
     @abstractmethod
-    def reasoning_agent(self, message:str) :
+    def reasoning_agent(self, message:str, mode: str = None) :
+        """
+        mode selects the reasoning depth (see REASONING_MODES):
+            fast      one structured prompt, one LLM call
+            standard  multi-step chain without the extra verification pass
+            full      the complete multi-step chain
+        None uses the implementation's default mode.
+        """
         pass
@@ -0,0 +1,279 @@
+"""
+bm25_index.py
+
+A local BM25 inverted index over the passages stored in Qdrant, used for
+the sparse half of hybrid retrieval. Dense E5 search misses exact-match
+passages for claims full of player names and stat numbers, so the pipeline
+fuses both rankings with reciprocal-rank fusion (RRF).
+
+The index is built at ingest time, next to the Qdrant writes, and saved to
+data/qdrant/bm25_<collection>.joblib (BM25_INDEX_PATH overrides the path).
+Documents are keyed by Qdrant point id, so re-ingesting a point replaces
+its entry. Ingestion and the server must see the same file.
+
+Rebuild it from an existing collection with:
+
+    python src/modules/misinformation_module/src/bm25_index.py --collection nba_claims
+"""
+
+import heapq
+import logging
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import joblib
+
+DEFAULT_DIR = "data/qdrant"
+
+logger = logging.getLogger(__name__)
+
+# Words, numbers and decimals ("3.5", "o'neal") survive; punctuation splits tokens
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be but by did do does for from had has have he her his in is it its "
+    "of on or she that the their they this to was were what when where which who will with".split()
+)
+
+
+def index_path(collection: str, path: Optional[str] = None) -> Path:
+    path = path or os.environ.get("BM25_INDEX_PATH")
+    return Path(path) if path else Path(DEFAULT_DIR) / f"bm25_{collection}.joblib"
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def passage_text(payload: Dict[str, Any]) -> str:
+    """The text a point is indexed under (same fallback order as the pipeline's passages)."""
+    payload = payload or {}
+    return (
+        payload.get("content") or
+        payload.get("summary") or
+        payload.get("claim") or
+        payload.get("title") or
+        ""
+    )
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a growing set of documents.
+
+    Postings map term -> {doc slot: term frequency}. Re-adding a point id
+    reuses its slot, so updates do not grow the index.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids: List[Any] = []                 # slot -> point id (None once removed)
+        self.doc_len: List[int] = []
+        self.doc_terms: List[Dict[str, int]] = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.total_len = 0
+        self.meta: Dict[str, Any] = {}           # free-form ingest bookkeeping
+        self.dirty = False
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._norms = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, point_id) -> bool:
+        return str(point_id) in self._slots
+
+    def add(self, point_id, text: str) -> None:
+        """Indexes (or re-indexes) one point. A no-op when the text's terms are unchanged."""
+        terms = dict(Counter(tokenize(text)))
+        key = str(point_id)
+        slot = self._slots.get(key)
+        if slot is not None:
+            if self.doc_terms[slot] == terms:
+                return
+            self._unlink(slot)
+        else:
+            slot = self._free.pop() if self._free else len(self.ids)
+            if slot == len(self.ids):
+                self.ids.append(None)
+                self.doc_len.append(0)
+                self.doc_terms.append({})
+            self._slots[key] = slot
+
+        self.ids[slot] = point_id
+        self.doc_terms[slot] = terms
+        self.doc_len[slot] = sum(terms.values())
+        self.total_len += self.doc_len[slot]
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[slot] = tf
+        self._norms = None
+        self.dirty = True
+
+    def add_many(self, items: Iterable[Tuple[Any, str]]) -> None:
+        for point_id, text in items:
+            self.add(point_id, text)
+
+    def remove(self, point_id) -> None:
+        slot = self._slots.pop(str(point_id), None)
+        if slot is None:
+            return
+        self._unlink(slot)
+        self.ids[slot] = None
+        self.doc_terms[slot] = {}
+        self.doc_len[slot] = 0
+        self._free.append(slot)
+        self._norms = None
+        self.dirty = True
+
+    def _unlink(self, slot: int) -> None:
+        for term in self.doc_terms[slot]:
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(slot, None)
+                if not docs:
+                    del self.postings[term]
+        self.total_len -= self.doc_len[slot]
+
+    def search(self, query: str, top_k: int = 50) -> List[Tuple[Any, float]]:
+        """Returns up to top_k (point_id, bm25_score) pairs, best first."""
+        n_docs = len(self._slots)
+        if not n_docs:
+            return []
+        if self._norms is None:
+            # Per-document length normalisation, recomputed only after changes
+            avgdl = self.total_len / n_docs or 1.0
+            self._norms = [self.k1 * (1 - self.b + self.b * dl / avgdl) for dl in self.doc_len]
+        norms = self._norms
+
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            df = len(docs)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            k1p1 = self.k1 + 1
+            for slot, tf in docs.items():
+                scores[slot] = scores.get(slot, 0.0) + idf * tf * k1p1 / (tf + norms[slot])
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda kv: kv[1])
+        return [(self.ids[slot], score) for slot, score in best]
+
+    # -------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------
+    def save(self, collection: str, path: Optional[str] = None) -> None:
+        """Writes the index atomically (readers never see a partial file)."""
+        target = index_path(collection, path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(".tmp")
+        self.dirty = False
+        norms, self._norms = self._norms, None
+        try:
+            joblib.dump(self, tmp)
+        finally:
+            self._norms = norms
+        os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, collection: str, path: Optional[str] = None) -> Optional["BM25Index"]:
+        target = index_path(collection, path)
+        if not target.exists():
+            return None
+        return joblib.load(target)
+
+    @classmethod
+    def load_or_create(cls, collection: str, path: Optional[str] = None) -> "BM25Index":
+        index = cls.load(collection, path)
+        return index if index is not None else cls()
+
+
+class BM25IndexReader:
+    """
+    Serves the saved index to query paths, reloading it only when the
+    file's mtime changes (i.e. after an ingest run saved a new one).
+    current() returns None while no index has been built.
+    """
+
+    def __init__(self, collection: str, path: Optional[str] = None):
+        self.path = index_path(collection, path)
+        self._mtime = None
+        self._index: Optional[BM25Index] = None
+
+    def current(self) -> Optional[BM25Index]:
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except OSError:
+            return self._index
+        if mtime != self._mtime:
+            try:
+                self._index = joblib.load(self.path)
+                self._mtime = mtime
+                logger.info("Loaded BM25 index with %d passages from %s", len(self._index), self.path)
+            except Exception as e:
+                logger.warning("Could not load BM25 index %s: %s", self.path, e)
+        return self._index
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Hashable]], k: int = 60,
+                           limit: int = None) -> List[Tuple[Hashable, float]]:
+    """
+    Fuses several best-first rankings: score(d) = sum over rankings of 1 / (k + rank).
+    Returns (key, score) pairs, best first, cut to `limit`.
+    """
+    fused: Dict[Hashable, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            fused[key] = fused.get(key, 0.0) + 1.0 / (k + rank)
+    ordered = sorted(fused.items(), key=lambda kv: kv[1], reverse=True)
+    return ordered[:limit] if limit is not None else ordered
+
+
+def rebuild_from_collection(client, collection: str, path: Optional[str] = None,
+                            batch_size: int = 1000) -> BM25Index:
+    """Builds a fresh index from every point in a Qdrant collection and saves it."""
+    index = BM25Index()
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=False
+        )
+        index.add_many((p.id, passage_text(p.payload)) for p in points)
+        if offset is None:
+            break
+    index.meta["collection"] = collection
+    index.save(collection, path)
+    return index
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+    from dotenv import load_dotenv
+    from qdrant_client import QdrantClient
+
+    # Pickle the index under its package path so the pipeline can load it
+    sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+    from modules.misinformation_module.src.bm25_index import index_path, rebuild_from_collection
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Rebuild the BM25 index from a Qdrant collection.")
+    parser.add_argument("--collection", default="nba_claims")
+    parser.add_argument("--path", default=None, help="Output file (default BM25_INDEX_PATH)")
+    args = parser.parse_args()
+
+    if os.environ.get("QDRANT_URL"):
+        qdrant = QdrantClient(url=os.environ["QDRANT_URL"], api_key=os.environ.get("QDRANT_API_KEY"))
+    else:
+        qdrant = QdrantClient(path=os.environ.get("QDRANT_LOCATION", "data/qdrant"))
+    built = rebuild_from_collection(qdrant, args.collection, args.path)
+    print(f"[BM25] Indexed {len(built)} passages into {index_path(args.collection, args.path)}")
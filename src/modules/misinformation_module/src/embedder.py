@@ -1,20 +1,142 @@
+import os
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from typing import List
 
+from modules.cache.cache_store import TTLCache
+
+
+def parallel_min_texts() -> int:
+    """Below EMBED_PARALLEL_MIN texts (default 1000) a process pool costs more than it saves."""
+    return int(os.environ.get("EMBED_PARALLEL_MIN", 1000))
+
+
+def encode_parallel(model: SentenceTransformer, texts: List[str], workers: int = None, batch_size: int = None,
+                    normalize: bool = False, pool: dict = None) -> np.ndarray:
+    """
+    Encodes `texts` by sharding them across `workers` processes, using
+    SentenceTransformer's multi-process pool. Returns a float32 array in
+    input order.
+
+    workers defaults to EMBED_WORKERS (or the CPU count) and batch_size to
+    EMBED_BATCH_SIZE (64). With workers <= 1, or fewer texts than
+    EMBED_PARALLEL_MIN, this encodes in-process. Pass `pool` to reuse an
+    already-started pool instead of starting one per call.
+    """
+    if workers is None:
+        workers = int(os.environ.get("EMBED_WORKERS", os.cpu_count() or 1))
+    if batch_size is None:
+        batch_size = int(os.environ.get("EMBED_BATCH_SIZE", 64))
+    if not texts:
+        return np.empty((0, model.get_sentence_embedding_dimension()), dtype=np.float32)
+
+    if pool is None and (workers <= 1 or len(texts) < parallel_min_texts()):
+        embs = model.encode(texts, batch_size=batch_size, normalize_embeddings=normalize)
+        return np.asarray(embs, dtype=np.float32)
+
+    own_pool = pool is None
+    if own_pool:
+        pool = model.start_multi_process_pool(target_devices=["cpu"] * workers)
+    try:
+        # Chunks small enough that every worker gets several, so they finish together
+        chunk_size = max(batch_size, min(5000, len(texts) // (len(pool["processes"]) * 4) or batch_size))
+        embs = model.encode_multi_process(
+            texts, pool, batch_size=batch_size, chunk_size=chunk_size, normalize_embeddings=normalize
+        )
+    finally:
+        if own_pool:
+            model.stop_multi_process_pool(pool)
+    return np.asarray(embs, dtype=np.float32)
+
 # E5 uses instruction prefixes:
 #  - "passage: ..." for stored text
 #  - "query: ..."   for user queries
 class E5Embedder:
-    def __init__(self, model_name: str = "intfloat/e5-small-v2", normalize: bool = True):
+    def __init__(self, model_name: str = "intfloat/e5-small-v2", normalize: bool = True, query_cache_size: int = None):
         self.model = SentenceTransformer(model_name)
         self.normalize = normalize
 
+        # LRU of query text -> float32 vector (QUERY_EMBED_CACHE_SIZE=0 disables)
+        if query_cache_size is None:
+            query_cache_size = int(os.environ.get("QUERY_EMBED_CACHE_SIZE", 1024))
+        self.query_cache = TTLCache(max_entries=query_cache_size) if query_cache_size > 0 else None
+
     def embed_passages(self, texts: List[str]) -> List[list]:
+        return [e.tolist() for e in self.embed_passages_array(texts)]
+
+    def embed_passages_array(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Same as embed_passages, but returns one (n, dim) float32 array instead of Python lists."""
         texts = [f"passage: {t}" for t in texts]
-        embs = self.model.encode(texts, normalize_embeddings=self.normalize)
-        return [e.tolist() for e in embs]
+        embs = self.model.encode(texts, batch_size=batch_size, normalize_embeddings=self.normalize)
+        return np.asarray(embs, dtype=np.float32)
 
-    def embed_query(self, text: str) -> list:
+    def embed_passages_bulk(self, texts: List[str], workers: int = None, batch_size: int = None) -> np.ndarray:
+        """
+        Bulk-corpus variant of embed_passages: shards the texts across a
+        process pool (see encode_parallel) and returns a float32 array in
+        input order. The pool is started by the first call with at least
+        EMBED_PARALLEL_MIN texts and kept for later calls; smaller calls
+        before that encode in-process. Release it with close_pool().
+        """
+        if workers is None:
+            workers = int(os.environ.get("EMBED_WORKERS", os.cpu_count() or 1))
+        texts = [f"passage: {t}" for t in texts]
+        pool = getattr(self, "_pool", None)
+        if workers > 1 and pool is None and len(texts) >= parallel_min_texts():
+            pool = self._pool = self.model.start_multi_process_pool(target_devices=["cpu"] * workers)
+        return encode_parallel(
+            self.model, texts, workers=workers, batch_size=batch_size,
+            normalize=self.normalize, pool=pool if workers > 1 else None
+        )
+
+    def close_pool(self) -> None:
+        if getattr(self, "_pool", None) is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """
+        Returns the query embedding as a read-only float32 array.
+        Repeated queries are served from the LRU without touching the encoder.
+        """
         q = f"query: {text}"
+        if self.query_cache is not None:
+            cached = self.query_cache.get(q)
+            if cached is not None:
+                return cached
+
         emb = self.model.encode([q], normalize_embeddings=self.normalize)[0]
-        return emb.tolist()
+        emb = np.asarray(emb, dtype=np.float32)
+        emb.flags.writeable = False
+
+        if self.query_cache is not None:
+            self.query_cache.set(q, emb)
+        return emb
+
+    def embed_queries(self, texts: List[str]) -> np.ndarray:
+        """
+        Embeds several queries as one (n, dim) float32 array.
+        Cache hits are reused and all misses go through a single encode() call.
+        """
+        qs = [f"query: {t}" for t in texts]
+        rows = [self.query_cache.get(q) if self.query_cache is not None else None for q in qs]
+        missing = [i for i, row in enumerate(rows) if row is None]
+
+        if missing:
+            embs = self.model.encode([qs[i] for i in missing], normalize_embeddings=self.normalize)
+            embs = np.asarray(embs, dtype=np.float32)
+            for i, emb in zip(missing, embs):
+                emb = emb.copy()
+                emb.flags.writeable = False
+                rows[i] = emb
+                if self.query_cache is not None:
+                    self.query_cache.set(qs[i], emb)
+
+        if not rows:
+            return np.empty((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.stack(rows)
+
+    def query_cache_stats(self) -> dict:
+        if self.query_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.query_cache.stats()}
@@ -3,8 +3,17 @@ Embed and upload NBA claims to local Qdrant vector DB.
 """
 
 import json
+import sys
+import time
+from pathlib import Path
+
+# Allow running as a script: make src/ importable for `modules.*`
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
 from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient, models
+from modules.misinformation_module.src.embedder import encode_parallel
+from modules.misinformation_module.src.bm25_index import BM25Index
 
 def ingest_nba():
     nba_path = "data/nba.json"
@@ -20,7 +29,11 @@ def ingest_nba():
 
     print(f"Encoding {len(claims)} claims...")
     model = SentenceTransformer(model_name)
-    embeddings = model.encode(claims, batch_size=64, show_progress_bar=True)
+    # Sharded across EMBED_WORKERS processes (EMBED_BATCH_SIZE per batch)
+    started = time.perf_counter()
+    embeddings = encode_parallel(model, claims)
+    elapsed = time.perf_counter() - started
+    print(f"Encoded {len(claims)} claims in {elapsed:.1f}s ({len(claims) / elapsed:.1f} claims/sec)")
 
     print("Connecting to Qdrant...")
     client = QdrantClient(path="data/qdrant")
@@ -41,6 +54,13 @@ def ingest_nba():
 
     print(f"Uploaded {len(records)} NBA claims to Qdrant collection '{collection}'")
 
+    # The collection was recreated, so the sparse index starts from scratch too
+    bm25 = BM25Index()
+    bm25.add_many(zip(ids, claims))
+    bm25.meta["collection"] = collection
+    bm25.save(collection)
+    print(f"Indexed {len(bm25)} claims for BM25")
+
 if __name__ == "__main__":
     ingest_nba()
 
@@ -1,6 +1,38 @@
 import os
+import logging
+import time
 from typing import List, Dict, Any
+import httpx
+import numpy as np
 from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: rate limiting and an unavailable/overloaded server
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    True for errors a retry can fix: transport failures, timeouts, and
+    429/5xx-unavailable responses (HTTP or gRPC). Bad requests, unknown
+    collections and schema errors are not retried.
+    """
+    if isinstance(error, ResponseHandlingException):
+        error = error.source
+    if isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code in RETRY_STATUSES
+    try:
+        import grpc
+    except ImportError:
+        return False
+    if isinstance(error, grpc.RpcError) and hasattr(error, "code"):
+        return error.code() in (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED,
+                                grpc.StatusCode.RESOURCE_EXHAUSTED)
+    return False
 
 
 class QdrantDB:
@@ -8,7 +40,9 @@ class QdrantDB:
         self,
         collection: str,
         vector_size: int = 384,
-        client: QdrantClient = None
+        client: QdrantClient = None,
+        retries: int = None,
+        retry_backoff: float = 0.2
     ):
         """
         QdrantDB wrapper that works for BOTH:
@@ -19,10 +53,15 @@ class QdrantDB:
             collection: Name of collection to use
             vector_size: Dimension of embedding vectors
             client: QdrantClient instance (Cloud or Local)
+            retries: Extra attempts for searches that fail with a transient error
+                (see is_transient; default QDRANT_RETRIES or 2)
+            retry_backoff: Base delay in seconds, doubled after every failed attempt
         """
 
         self.collection = collection
         self.vector_size = vector_size
+        self.retries = int(os.environ.get("QDRANT_RETRIES", 2)) if retries is None else retries
+        self.retry_backoff = retry_backoff
 
         # Use provided cloud client
         if client is not None:
@@ -44,7 +83,7 @@ class QdrantDB:
         existing = [c.name for c in collections]
 
         if self.collection not in existing:
-            print(f"[QdrantDB] Creating collection '{self.collection}'...")
+            logger.info("Creating collection '%s'...", self.collection)
             self.client.create_collection(
                 collection_name=self.collection,
                 vectors_config=models.VectorParams(
@@ -54,7 +93,7 @@ class QdrantDB:
             )
         else:
             # Optional diagnostic
-            print(f"[QdrantDB] Collection '{self.collection}' already exists.")
+            logger.info("Collection '%s' already exists.", self.collection)
 
 
     # -------------------------------------------------------
@@ -66,7 +105,7 @@ class QdrantDB:
         existing = [c.name for c in collections]
 
         if self.collection in existing:
-            print(f"[QdrantDB] Resetting collection '{self.collection}'...")
+            logger.info("Resetting collection '%s'...", self.collection)
             self.client.delete_collection(self.collection)
 
         self.ensure_collection()
@@ -86,19 +125,141 @@ class QdrantDB:
         )
 
 
+    # -------------------------------------------------------
+    # BULK UPLOAD (numpy)
+    # -------------------------------------------------------
+    def upload_vectors(
+        self,
+        ids: List[Any],
+        vectors: np.ndarray,
+        payloads: List[Dict[str, Any]] = None,
+        batch_size: int = None,
+        parallel: int = None
+    ):
+        """
+        Bulk-upload an (n, vector_size) float32 array without building
+        PointStruct objects or per-float Python lists up front.
+        The client slices the array into `batch_size` batches and, with
+        parallel > 1, sends them from several worker processes.
+        """
+        if batch_size is None:
+            batch_size = int(os.environ.get("QDRANT_UPLOAD_BATCH", 256))
+        if parallel is None:
+            parallel = int(os.environ.get("QDRANT_UPLOAD_PARALLEL", 1))
+
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.vector_size:
+            raise ValueError(f"Expected vectors of shape (n, {self.vector_size}), got {vectors.shape}")
+        if len(ids) != vectors.shape[0]:
+            raise ValueError(f"Got {len(ids)} ids for {vectors.shape[0]} vectors")
+
+        self.client.upload_collection(
+            collection_name=self.collection,
+            ids=ids,
+            vectors=vectors,
+            payload=payloads,
+            batch_size=batch_size,
+            parallel=parallel,
+            wait=True
+        )
+
+
+    # -------------------------------------------------------
+    # CLIENT FACTORY
+    # -------------------------------------------------------
+    @staticmethod
+    def client_options(url: str = None, api_key: str = None) -> Dict[str, Any]:
+        """
+        Connection settings for the Qdrant client:
+        QDRANT_PREFER_GRPC=1 switches to a persistent gRPC channel, and
+        QDRANT_TIMEOUT sets the request timeout in seconds. The client
+        keeps its HTTP connections alive between requests.
+        """
+        return {
+            "url": url,
+            "api_key": api_key,
+            "prefer_grpc": os.environ.get("QDRANT_PREFER_GRPC", "0") == "1",
+            "timeout": int(os.environ.get("QDRANT_TIMEOUT", 10)),
+        }
+
+
     # -------------------------------------------------------
     # SEARCH
     # -------------------------------------------------------
     def search(self, query_vector: list, top_k: int = 5):
         """
         Search the collection using cosine similarity.
-        Returns list of ScoredPoint objects.
+        Returns list of ScoredPoint objects. Uses query_points
+        (qdrant-client >= 1.10) and falls back to search on older clients.
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                if hasattr(self.client, "query_points"):
+                    return self.client.query_points(
+                        collection_name=self.collection,
+                        query=np.asarray(query_vector, dtype=np.float32).tolist(),
+                        limit=top_k,
+                        with_payload=True
+                    ).points
+                return self.client.search(
+                    collection_name=self.collection,
+                    query_vector=query_vector,
+                    limit=top_k,
+                    with_payload=True
+                )
+            except Exception as e:
+                if attempt == self.retries or not is_transient(e):
+                    raise
+                logger.warning("Search failed (%s); retrying...", e)
+                time.sleep(self.retry_backoff * (2 ** attempt))
+
+    def search_batch(self, query_vectors, top_k: int = 5):
         """
-        return self.client.search(
+        Searches for several query vectors in ONE request.
+        Uses query_batch_points (qdrant-client >= 1.10) and falls back to
+        search_batch on older clients. Accepts an (n, vector_size) array or
+        a list of vectors; returns one list of ScoredPoint objects per query,
+        in input order.
+        """
+        vectors = [np.asarray(v, dtype=np.float32).tolist() for v in query_vectors]
+        if not vectors:
+            return []
+        for attempt in range(self.retries + 1):
+            try:
+                if hasattr(self.client, "query_batch_points"):
+                    responses = self.client.query_batch_points(
+                        collection_name=self.collection,
+                        requests=[
+                            models.QueryRequest(query=v, limit=top_k, with_payload=True)
+                            for v in vectors
+                        ]
+                    )
+                    return [r.points for r in responses]
+                return self.client.search_batch(
+                    collection_name=self.collection,
+                    requests=[
+                        models.SearchRequest(vector=v, limit=top_k, with_payload=True)
+                        for v in vectors
+                    ]
+                )
+            except Exception as e:
+                if attempt == self.retries or not is_transient(e):
+                    raise
+                logger.warning("Batch search failed (%s); retrying...", e)
+                time.sleep(self.retry_backoff * (2 ** attempt))
+
+    # -------------------------------------------------------
+    # RETRIEVE BY ID
+    # -------------------------------------------------------
+    def retrieve(self, ids: List[Any], with_vectors: bool = False):
+        """Fetches points by id (with payloads). Unknown ids are silently missing from the result."""
+        if not ids:
+            return []
+        return self.client.retrieve(
             collection_name=self.collection,
-            query_vector=query_vector,
-            limit=top_k,
-            with_payload=True
+            ids=ids,
+            with_payload=True,
+            with_vectors=with_vectors
         )
 
 
@@ -109,3 +270,21 @@ class QdrantDB:
         """Return number of points in the collection."""
         info = self.client.get_collection(self.collection)
         return info.points_count
+
+
+    # -------------------------------------------------------
+    # RECONNECT (after fork)
+    # -------------------------------------------------------
+    def reconnect(self, client: QdrantClient):
+        """
+        Switches to a new client without closing the old one: in a forked
+        worker the old connection still belongs to the parent process.
+        """
+        self.client = client
+
+
+    # -------------------------------------------------------
+    # CLOSE
+    # -------------------------------------------------------
+    def close(self):
+        self.client.close()
@@ -0,0 +1,126 @@
+"""
+reranker.py
+
+Optional reranking stage between retrieval and NLI. Retrieval returns
+10-20 passages, and nearly all clear FactValidator's relevance gate, so each
+one costs a roberta-large-mnli forward pass. A reranker re-scores the
+passages cheaply and only the best RERANK_TOP_N move on to NLI.
+
+Rerankers only reorder and cut the list. A passage's relevance_score
+(cosine similarity) is left as is, because the validator's features are
+computed from it.
+
+    RERANKER=none | embedding | cross-encoder
+    RERANK_TOP_N=8
+    RERANKER_MODEL=cross-encoder/ms-marco-MiniLM-L-6-v2   (cross-encoder only)
+
+debug/bench_rerank.py compares latency and verdict agreement as N varies.
+"""
+
+import logging
+import os
+import threading
+from typing import List, Tuple
+
+from modules.claim_extraction.Fact_Validator_Data_models import SourcePassage
+
+RERANKERS = ("none", "embedding", "cross-encoder")
+DEFAULT_CROSS_ENCODER = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+logger = logging.getLogger(__name__)
+
+
+class RerankerInterface:
+    """Keeps the top_n passages for a query, best first."""
+
+    name = "none"
+
+    def __init__(self, top_n: int = None):
+        if top_n is None:
+            top_n = int(os.environ.get("RERANK_TOP_N", 8))
+        self.top_n = top_n
+
+    def rerank(self, query: str, passages: List[SourcePassage], top_n: int = None) -> List[SourcePassage]:
+        return self.rerank_batch([(query, passages)], top_n)[0]
+
+    def rerank_batch(self, items: List[Tuple[str, List[SourcePassage]]], top_n: int = None) -> List[List[SourcePassage]]:
+        """Reranks several (query, passages) items; subclasses score them all in one call."""
+        return [list(passages) for _, passages in items]
+
+
+class EmbeddingReranker(RerankerInterface):
+    """
+    Dot-product re-score with the already-loaded E5 embedder.
+
+    Every passage from the pipeline already has relevance_score set to the
+    cosine similarity between the E5 query and passage vectors. That
+    includes BM25-only hits, which are scored against their stored vectors.
+    Re-encoding would reproduce the same numbers, so this reranker sorts
+    on them. Its only cost is the sort, and it replaces the fused RRF
+    order with pure semantic order before the cut.
+    """
+
+    name = "embedding"
+
+    def rerank_batch(self, items, top_n=None):
+        top_n = self.top_n if top_n is None else top_n
+        return [
+            sorted(passages, key=lambda p: p.relevance_score, reverse=True)[:top_n]
+            for _, passages in items
+        ]
+
+
+class CrossEncoderReranker(RerankerInterface):
+    """
+    MiniLM-class cross-encoder (RERANKER_MODEL) scoring (query, passage) pairs.
+    All pairs of a batch go through a single predict() call; the model is
+    loaded on first use.
+    """
+
+    name = "cross-encoder"
+
+    def __init__(self, model_name: str = None, top_n: int = None, batch_size: int = 64):
+        super().__init__(top_n)
+        self.model_name = model_name or os.environ.get("RERANKER_MODEL", DEFAULT_CROSS_ENCODER)
+        self.batch_size = batch_size
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+                    logger.info("Loading cross-encoder %s...", self.model_name)
+                    self._model = CrossEncoder(self.model_name)
+        return self._model
+
+    def rerank_batch(self, items, top_n=None):
+        top_n = self.top_n if top_n is None else top_n
+        pairs = [(query, p.content or "") for query, passages in items for p in passages]
+        if not pairs:
+            return [[] for _ in items]
+        scores = self.model.predict(pairs, batch_size=self.batch_size)
+
+        results, start = [], 0
+        for _, passages in items:
+            scored = zip(scores[start:start + len(passages)], range(len(passages)))
+            order = sorted(scored, key=lambda s: s[0], reverse=True)[:top_n]
+            results.append([passages[i] for _, i in order])
+            start += len(passages)
+        return results
+
+
+def create_reranker(name: str = None, top_n: int = None) -> RerankerInterface:
+    """Builds the reranker named by `name` or RERANKER (default "none": pass-through)."""
+    if name is None:
+        name = os.environ.get("RERANKER", "none")
+    name = name.strip().lower()
+    if name == "none":
+        return RerankerInterface(top_n)
+    if name == "embedding":
+        return EmbeddingReranker(top_n)
+    if name == "cross-encoder":
+        return CrossEncoderReranker(top_n=top_n)
+    raise ValueError(f"Unknown reranker '{name}'. Expected one of {RERANKERS}")
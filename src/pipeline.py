@@ -3,24 +3,38 @@ CMPE297 Fact-Checking System - Integration Pipeline
 Connects: Input Extraction â†’ Vector DB â†’ Fact Validation â†’ LLM Response â†’ Output
 """
 
+import contextvars
 import json
+import logging
 import os
-from typing import Dict, Any, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
 from dataclasses import asdict
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, models
+import numpy as np
 from datetime import timezone
 from modules.llm.enhanced_llm_reasoning import NBA_Statistics_Reasoner
 # Module imports - adjust paths based on actual repo structure
 from modules.claim_extraction.Fact_Validator import FactValidator
-from modules.claim_extraction.NLIModel import NLI_LABELS, NLIModel
+from modules.claim_extraction.NLIModel import NLI_LABELS, create_nli_model
+from modules.claim_extraction.CachedNLIModel import CachedNLIModel
 from modules.llm.llm_ollama import llm_ollama
 from modules.misinformation_module.src.qdrant_db import QdrantDB
 from modules.misinformation_module.src.embedder import E5Embedder
+from modules.misinformation_module.src.reranker import create_reranker
+from modules.misinformation_module.src.bm25_index import BM25Index, BM25IndexReader, index_path, passage_text, reciprocal_rank_fusion
 from modules.claim_extraction.Fact_Validator_Data_models import SourcePassage, FactCheckResult
 from modules.llm.llm_openai import llm_openai
 from modules.llm.llm_reasoning import llm_reasoning 
 from modules.input_extraction.input_extractor import extract_claim_from_input
+from modules.input_extraction.input_normalizer import normalize_ocr_asr
+from modules.cache.cache_store import make_cache
+from modules.cache.ingest_version import IngestVersionReader, bump_ingest_version
+from modules.metrics.registry import STAGE_SECONDS, stage_timer
+
+logger = logging.getLogger(__name__)
 
 
 class FactCheckingPipeline:
@@ -37,7 +51,9 @@ class FactCheckingPipeline:
         use_reasoning: bool = True,
         llm_provider: str = None,
         qdrant_url: str = None,          # <-- NEW
-        qdrant_api_key: str = None       # <-- NEW
+        qdrant_api_key: str = None,      # <-- NEW
+        echo_llm_response: bool = None,
+        vector_db: QdrantDB = None
     ):
         if llm_provider is None:
             raise ValueError("llm_provider must be specified")
@@ -47,8 +63,39 @@ class FactCheckingPipeline:
 
         self.use_reasoning = use_reasoning
         self.qdrant_location = qdrant_location
+
+        # The raw LLM echo of the user input is optional and runs off the critical path
+        if echo_llm_response is None:
+            echo_llm_response = os.environ.get("ECHO_LLM_RESPONSE", "0").strip().lower() in {"1", "true", "yes"}
+        self.echo_llm_response = echo_llm_response
+        # Retrieve evidence for the raw input while the LLM extracts the claim;
+        # used when the extracted claim is the input itself (SPECULATIVE_RETRIEVAL=0 disables)
+        self.speculative_retrieval = os.environ.get("SPECULATIVE_RETRIEVAL", "1").strip().lower() not in {"0", "false", "no"}
+        self._executor = self._make_executor()
+
+        # Cache of complete fact-check responses, keyed by the normalized claim
+        # and the collection's ingestion version (RESULT_CACHE_SIZE=0 disables it)
+        result_cache_size = int(os.environ.get("RESULT_CACHE_SIZE", 1024))
+        self.result_cache = make_cache(
+            max_entries=result_cache_size,
+            ttl=float(os.environ.get("RESULT_CACHE_TTL", 3600)),
+            path=os.environ.get("RESULT_CACHE_PATH") or None,
+            table="fact_check_results"
+        ) if result_cache_size > 0 else None
+        self._ingest_version = IngestVersionReader()
+        self._result_cache_version = None
         self.embedder = E5Embedder(embedding_model, normalize=True)
 
+        # Hybrid retrieval: the BM25 index built at ingest time is fused with
+        # dense search via reciprocal-rank fusion (HYBRID_RETRIEVAL=0 disables it)
+        self.hybrid_retrieval = os.environ.get("HYBRID_RETRIEVAL", "1") != "0"
+        self.hybrid_candidates = int(os.environ.get("HYBRID_CANDIDATES", 50))
+        self.rrf_k = int(os.environ.get("RRF_K", 60))
+        retrieval_top_k = os.environ.get("RETRIEVAL_TOP_K")
+        self.retrieval_top_k = int(retrieval_top_k) if retrieval_top_k else None
+        # Optional cheap re-score between retrieval and NLI (RERANKER, RERANK_TOP_N)
+        self.reranker = create_reranker()
+
         # ---------------------------------------------
         # USE PASSED-IN QDRANT CLOUD PARAMS
         # ---------------------------------------------
@@ -58,14 +105,20 @@ class FactCheckingPipeline:
         if qdrant_api_key is None:
             qdrant_api_key = os.getenv("QDRANT_API_KEY")
 
-        self.vector_db = QdrantDB(
-            collection=os.getenv("COLLECTION_NAME", "nba_news_claims"),
-            vector_size=vector_size,
-            client=QdrantClient(
-                url=qdrant_url,
-                api_key=qdrant_api_key
+        # Reuse a caller-provided QdrantDB (and its open connections) when given
+        self._client_options = None
+        if vector_db is not None:
+            self.vector_db = vector_db
+        else:
+            client_options = QdrantDB.client_options(qdrant_url, qdrant_api_key)
+            self._client_options = client_options
+            self.vector_db = QdrantDB(
+                collection=os.getenv("COLLECTION_NAME", "nba_news_claims"),
+                vector_size=vector_size,
+                client=QdrantClient(**client_options)
             )
-        )
+
+        self.bm25 = BM25IndexReader(self.vector_db.collection)
 
         # Choose LLM provider
         if llm_provider.lower() == "ollama":
@@ -78,21 +131,57 @@ class FactCheckingPipeline:
         self.current_llm_provider = llm_provider.lower()
 
         # Fact validator
-        nli = NLIModel(
+        nli = create_nli_model(
             emb_model_name="sentence-transformers/all-mpnet-base-v2",
             nli_model_name="roberta-large-mnli",
             nli_labels=NLI_LABELS
         )
+        if os.environ.get("NLI_WARMUP", "1").strip().lower() not in {"0", "false", "no"}:
+            nli.warmup()
+        # Shared across requests: identical (claim, passage) pairs skip the NLI model
+        if int(os.environ.get("NLI_CACHE_SIZE", 50000)) > 0:
+            nli = CachedNLIModel(nli)
         self.fact_validator = FactValidator(self.llm, nli, training_data=None)
 
         # Reasoning
         if self.use_reasoning:
             self.reasoning_engine = NBA_Statistics_Reasoner(self.llm)
         
-        print(f"Pipeline initialized:")
-        print(f"  Collection: '{collection_name}'")
-        print(f"  LLM: {llm_provider}")
-        print(f"  Reasoning: {'enabled' if self.use_reasoning else 'disabled'}")
+        logger.info("Pipeline initialized: collection='%s' llm=%s reasoning=%s",
+                    collection_name, llm_provider, "enabled" if self.use_reasoning else "disabled")
+
+
+    @staticmethod
+    def _make_executor() -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=int(os.environ.get("PIPELINE_THREADS", 4)),
+            thread_name_prefix="pipeline"
+        )
+
+    def reopen_after_fork(self) -> None:
+        """
+        Gives a forked (preloaded) worker its own Qdrant connections, cache
+        connections and locks, and thread pool. Model weights and the loaded
+        BM25 index stay shared copy-on-write with the parent.
+        """
+        self._executor = self._make_executor()
+        if self._client_options is not None:
+            self.vector_db.reconnect(QdrantClient(**self._client_options))
+        if self.result_cache is not None:
+            self.result_cache.reopen()
+        if self.embedder.query_cache is not None:
+            self.embedder.query_cache.reopen()
+        if isinstance(self.fact_validator.nli, CachedNLIModel):
+            self.fact_validator.nli.reopen()
+
+
+    def close(self) -> None:
+        """
+        Stops the pipeline's thread pool without waiting; tasks already
+        submitted still finish. The vector_db is left open because a
+        replacement pipeline may share it.
+        """
+        self._executor.shutdown(wait=False)
 
 
     # --- Runtime LLM Provider Switching ---
@@ -117,7 +206,7 @@ class FactCheckingPipeline:
         
         self.llm = new_llm
         self.current_llm_provider = normalized
-        print(f"[DEBUG] Current LLM provider: {self.current_llm_provider}")
+        logger.info("Current LLM provider: %s", self.current_llm_provider)
         
         # Keep the FactValidator and reasoning engine in sync with the refreshed LLM.
         if hasattr(self, "fact_validator") and self.fact_validator:
@@ -131,107 +220,180 @@ class FactCheckingPipeline:
     def compute_source_hash(self, data_path: str) -> str:
         """Compute SHA256 hash of source file"""
         import hashlib
+        digest = hashlib.sha256()
         with open(data_path, 'rb') as f:
-            return hashlib.sha256(f.read()).hexdigest()
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _metadata_dir(self):
+        from pathlib import Path
+        return Path(self.qdrant_location or os.environ.get("QDRANT_LOCATION", "data/qdrant"))
     
     def save_metadata(self, source_path: str, source_hash: str) -> None:
         """Save metadata about loaded knowledge base"""
-        from pathlib import Path
         metadata = {
             "source_file": os.path.basename(source_path),
             "source_hash": source_hash,
             "embedding_model": os.environ.get('EMBEDDING_MODEL', 'intfloat/e5-small-v2'),
             "vector_size": self.vector_db.vector_size,
+            "collection": self.vector_db.collection,
             "loaded_at": datetime.now().isoformat()
         }
-        metadata_path = Path(self.qdrant_location) / 'metadata.json'
+        metadata_path = self._metadata_dir() / 'metadata.json'
         metadata_path.parent.mkdir(parents=True, exist_ok=True)
         with open(metadata_path, 'w') as f:
             json.dump(metadata, f, indent=2)
     
     def load_metadata(self) -> Dict[str, Any]:
         """Load metadata about knowledge base"""
-        from pathlib import Path
-        metadata_path = Path(self.qdrant_location) / 'metadata.json'
+        metadata_path = self._metadata_dir() / 'metadata.json'
         if metadata_path.exists():
             with open(metadata_path, 'r') as f:
                 return json.load(f)
         return {}
+
+    @staticmethod
+    def _iter_records(data_path: str):
+        """
+        Streams records from a JSON array file. Uses the incremental ijson
+        parser when installed; otherwise falls back to json.load.
+        """
+        try:
+            import ijson
+        except ImportError:
+            logger.info("Reading whole file (install ijson to stream large knowledge bases)...")
+            with open(data_path, 'r') as f:
+                yield from json.load(f)
+            return
+        with open(data_path, 'rb') as f:
+            yield from ijson.items(f, "item", use_float=True)
+
+    @staticmethod
+    def _record_hash(row: Dict[str, Any]) -> str:
+        import hashlib
+        key = f"{row['claim']}\x1f{row['source']}\x1f{row.get('confidence', 1.0)}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _changed_records(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keeps only records whose id is new or whose stored content_hash differs."""
+        existing = self.vector_db.client.retrieve(
+            collection_name=self.vector_db.collection,
+            ids=[row["id"] for row in rows],
+            with_payload=["content_hash"],
+            with_vectors=False
+        )
+        stored = {p.id: (p.payload or {}).get("content_hash") for p in existing}
+        return [row for row in rows if stored.get(row["id"]) != row["content_hash"]]
     
-    def load_knowledge_base(self, data_path: str) -> None:
+    def load_knowledge_base(self, data_path: str, batch_size: int = 1000, force: bool = False) -> None:
         """
-        Load and index knowledge base into vector DB.
+        Load and index knowledge base into vector DB, incrementally.
+
+        - Skips entirely when metadata.json already records this file's hash
+          (and the same embedding model / collection) and the collection's
+          BM25 index exists, unless force=True.
+        - Otherwise streams records, and per batch only embeds records whose
+          id is new or whose content changed (content_hash in the payload).
+        - Progress is checkpointed after every batch; an interrupted load
+          resumes from the last completed batch of the same source file.
         
         Args:
             data_path: Path to JSON file with format:
                 [{"id": int, "claim": str, "source": str, "confidence": float}, ...]
         """
-        print(f"Loading source data from {os.path.basename(data_path)}...")
-        with open(data_path, 'r') as f:
-            data = json.load(f)
-        
-        print(f"Processing {len(data)} claims...")
-        
-        # Batch embedding with progress
-        texts = [d["claim"] for d in data]
-        batch_size = 1000
-        vectors = []
-        
-        try:
-            from tqdm import tqdm
-            with tqdm(total=len(texts), desc="Embedding claims", unit="claims") as pbar:
-                for i in range(0, len(texts), batch_size):
-                    batch = texts[i:i + batch_size]
-                    batch_vectors = self.embedder.embed_passages(batch)
-                    vectors.extend(batch_vectors)
-                    pbar.update(len(batch))
-        except ImportError:
-            # Fallback without tqdm
-            print("Embedding claims (install tqdm for progress bar)...")
-            for i in range(0, len(texts), batch_size):
-                batch = texts[i:i + batch_size]
-                batch_vectors = self.embedder.embed_passages(batch)
-                vectors.extend(batch_vectors)
-                if (i // batch_size) % 10 == 0:
-                    print(f"  Progress: {i}/{len(texts)} claims embedded")
-        
-        print("Inserting into vector database...")
-        from qdrant_client import models
-        points = []
-        for row, vec in zip(data, vectors):
-            points.append(
-                models.PointStruct(
-                    id=row["id"],
-                    vector=vec,
-                    payload={
-                        "claim": row["claim"],
-                        "source": row["source"],
-                        "confidence": row.get("confidence", 1.0),
-                    },
+        source_hash = self.compute_source_hash(data_path)
+        metadata = self.load_metadata()
+        embedding_model = os.environ.get('EMBEDDING_MODEL', 'intfloat/e5-small-v2')
+        if (not force
+                and metadata.get("source_hash") == source_hash
+                and metadata.get("embedding_model") == embedding_model
+                and metadata.get("collection", self.vector_db.collection) == self.vector_db.collection
+                and index_path(self.vector_db.collection).exists()):
+            logger.info("Knowledge base %s unchanged since %s; skipping load.",
+                        os.path.basename(data_path), metadata.get("loaded_at"))
+            return
+
+        checkpoint_path = self._metadata_dir() / 'load_checkpoint.json'
+        resume_from = 0
+        if checkpoint_path.exists():
+            with open(checkpoint_path, 'r') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("source_hash") == source_hash:
+                resume_from = checkpoint.get("records_done", 0)
+
+        # The BM25 index is saved less often than the checkpoint, so resume
+        # from whichever of the two is further behind
+        bm25 = BM25Index.load_or_create(self.vector_db.collection)
+        bm25_done = bm25.meta.get("records_done", 0) if bm25.meta.get("source_hash") == source_hash else 0
+        resume_from = min(resume_from, bm25_done)
+        if resume_from:
+            logger.info("Resuming load from record %d...", resume_from)
+
+        logger.info("Loading source data from %s...", os.path.basename(data_path))
+        # Records before resume_from were checked by the interrupted run
+        seen = resume_from
+        written = 0
+        batch: List[Dict[str, Any]] = []
+
+        def flush(rows: List[Dict[str, Any]]) -> int:
+            for row in rows:
+                row["content_hash"] = self._record_hash(row)
+            # Cheap next to embedding, and a no-op for points already indexed with this text
+            bm25.add_many((row["id"], row["claim"]) for row in rows)
+            changed = self._changed_records(rows)
+            if changed:
+                # float32 (n, dim) array straight from the encoder into Qdrant
+                vectors = self.embedder.embed_passages_bulk([row["claim"] for row in changed])
+                self.vector_db.upload_vectors(
+                    ids=[row["id"] for row in changed],
+                    vectors=vectors,
+                    payloads=[
+                        {
+                            "claim": row["claim"],
+                            "source": row["source"],
+                            "confidence": row.get("confidence", 1.0),
+                            "content_hash": row["content_hash"],
+                        }
+                        for row in changed
+                    ]
                 )
-            )
-        
-        # Batch insert with progress
-        insert_batch_size = 100
+            with open(checkpoint_path, 'w') as f:
+                json.dump({"source_hash": source_hash, "records_done": seen}, f)
+            return len(changed)
+
+        def save_bm25() -> None:
+            bm25.meta.update({"source_hash": source_hash, "records_done": seen})
+            bm25.save(self.vector_db.collection)
+
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
         try:
-            from tqdm import tqdm
-            with tqdm(total=len(points), desc="Inserting vectors", unit="vectors") as pbar:
-                for i in range(0, len(points), insert_batch_size):
-                    batch = points[i:i + insert_batch_size]
-                    self.vector_db.upsert_points(batch)
-                    pbar.update(len(batch))
-        except ImportError:
-            for i in range(0, len(points), insert_batch_size):
-                batch = points[i:i + insert_batch_size]
-                self.vector_db.upsert_points(batch)
-                if (i // insert_batch_size) % 100 == 0:
-                    print(f"  Progress: {i}/{len(points)} vectors inserted")
-        
-        print(f"Loaded {len(points)} entries into knowledge base")
+            for i, row in enumerate(self._iter_records(data_path)):
+                if i < resume_from:
+                    continue
+                batch.append(row)
+                seen = i + 1
+                if len(batch) >= batch_size:
+                    written += flush(batch)
+                    batch = []
+                    if (seen // batch_size) % 10 == 0:
+                        logger.info("Progress: %d records checked, %d embedded", seen, written)
+                        save_bm25()
+            if batch:
+                written += flush(batch)
+            save_bm25()
+        finally:
+            self.embedder.close_pool()
+
+        logger.info("Loaded knowledge base: %d records checked, %d new or changed entries embedded", seen, written)
         
         # Save metadata
-        source_hash = self.compute_source_hash(data_path)
         self.save_metadata(data_path, source_hash)
+        checkpoint_path.unlink(missing_ok=True)
+        if written:
+            bump_ingest_version(self.vector_db.collection, written)
+            if self.result_cache is not None:
+                self.result_cache.clear()
 
     def _extract_domain(self, url: str) -> str:
         """Extract clean domain from a URL."""
@@ -243,7 +405,7 @@ class FactCheckingPipeline:
             return "unknown"
 
     
-    def retrieve_evidence(self, query: str, top_k: int = 20) -> List[SourcePassage]:
+    def retrieve_evidence(self, query: str, top_k: int = None) -> List[SourcePassage]:
         """
         Retrieve relevant passages from vector DB.
         Supports NEWS payloads:
@@ -254,11 +416,145 @@ class FactCheckingPipeline:
         And older CLAIM payloads:
             • claim
             • source
+
+        With a BM25 index available, dense and BM25 candidates are fused
+        with RRF before the top_k cut (see _bm25_index).
+        """
+
+        index = self._bm25_index()
+        top_k = self._resolve_top_k(top_k, index)
+        with stage_timer("query_embedding"):
+            query_vec = self.embedder.embed_query(query)
+        with stage_timer("vector_search"):
+            dense = self.vector_db.search(query_vec, top_k=top_k if index is None else max(top_k, self.hybrid_candidates))
+        if index is None:
+            hits = dense
+        else:
+            with stage_timer("hybrid_fusion"):
+                hits = self._fuse_hybrid([query], query_vec[None, :], [dense], index, top_k)[0]
+        return self._hits_to_passages(hits)
+
+    def retrieve_evidence_batch(self, queries: List[str], top_k: int = None) -> List[List[SourcePassage]]:
+        """
+        Batched retrieve_evidence: every query is embedded in one encoder call
+        and searched in one Qdrant round trip. Returns one passage list per query.
+        """
+        if not queries:
+            return []
+        index = self._bm25_index()
+        top_k = self._resolve_top_k(top_k, index)
+        with stage_timer("query_embedding"):
+            query_vecs = self.embedder.embed_queries(queries)
+        with stage_timer("vector_search"):
+            dense = self.vector_db.search_batch(query_vecs, top_k=top_k if index is None else max(top_k, self.hybrid_candidates))
+        if index is None:
+            hits_per_query = dense
+        else:
+            with stage_timer("hybrid_fusion"):
+                hits_per_query = self._fuse_hybrid(queries, query_vecs, dense, index, top_k)
+        return [self._hits_to_passages(hits) for hits in hits_per_query]
+
+    def _bm25_index(self):
+        """The current BM25 index, or None when hybrid retrieval is off or no index was built."""
+        if not self.hybrid_retrieval:
+            return None
+        index = self.bm25.current()
+        return index if index else None
+
+    def _resolve_top_k(self, top_k: int, index) -> int:
+        """
+        Passages handed to NLI. Explicit argument > RETRIEVAL_TOP_K > default:
+        10 with hybrid retrieval (exact-match passages are fused in, so fewer
+        are needed) and 20 for dense-only search.
+        """
+        if top_k is not None:
+            return top_k
+        if self.retrieval_top_k is not None:
+            return self.retrieval_top_k
+        return 10 if index is not None else 20
+
+    def _fuse_hybrid(self, queries: List[str], query_vecs: np.ndarray, dense_per_query,
+                     index: BM25Index, top_k: int):
+        """
+        RRF-fuses each query's dense hits with its BM25 hits and keeps top_k.
+        Passages a query found only by BM25 are fetched (one retrieve() call
+        for the whole batch) and scored by cosine similarity to that query's
+        own vector, so relevance_score means the same thing for every passage
+        the validator sees, whichever claims share the batch.
+        """
+        fused_per_query = []
+        known_per_query = []  # each query's own dense hits, scored against its own vector
+        missing = {}
+        for query, dense in zip(queries, dense_per_query):
+            known = {str(hit.id): hit for hit in dense}
+            sparse = index.search(query, top_k=self.hybrid_candidates)
+            fused = reciprocal_rank_fusion(
+                [[str(h.id) for h in dense], [str(pid) for pid, _ in sparse]],
+                k=self.rrf_k,
+                limit=top_k
+            )
+            needed = {key for key, _ in fused}
+            for point_id, _ in sparse:
+                key = str(point_id)
+                if key in needed and key not in known:
+                    missing[key] = point_id
+            known_per_query.append(known)
+            fused_per_query.append(fused)
+
+        # One retrieve() for the BM25-only passages of every query
+        records = {str(r.id): r for r in self.vector_db.retrieve(list(missing.values()), with_vectors=True)} if missing else {}
+
+        results = []
+        for query_vec, known, fused in zip(query_vecs, known_per_query, fused_per_query):
+            hits = []
+            for key, _ in fused:
+                if key in known:
+                    hits.append(known[key])
+                elif key in records:
+                    # Stale BM25 entries (points deleted from Qdrant) are simply skipped
+                    record = records[key]
+                    vec = np.asarray(record.vector, dtype=np.float32)
+                    denom = float(np.linalg.norm(vec) * np.linalg.norm(query_vec)) or 1.0
+                    hits.append(models.ScoredPoint(
+                        id=record.id,
+                        version=0,
+                        score=float(np.dot(vec, query_vec)) / denom,
+                        payload=record.payload
+                    ))
+            results.append(hits)
+        return results
+
+    def check_claims(self, claims: List[Tuple[str, str]], top_k: int = None,
+                     timings: Dict[str, float] = None) -> List[FactCheckResult]:
+        """
+        Fact-checks several (claim_text, claim_type) pairs together:
+        one batched retrieval, then one NLI pass over all (claim, passage) pairs.
+        Stage times are added to `timings` when given. No explanations are generated.
         """
+        if timings is None:
+            timings = {}
+        t0 = time.perf_counter()
+        passages_per_claim = self.retrieve_evidence_batch([text for text, _ in claims], top_k=top_k)
+        timings["retrieval_ms"] = timings.get("retrieval_ms", 0.0) + (time.perf_counter() - t0) * 1000
 
-        query_vec = self.embedder.embed_query(query)
-        hits = self.vector_db.search(query_vec, top_k=top_k)
+        if self.reranker.name != "none":
+            t0 = time.perf_counter()
+            with stage_timer("rerank"):
+                passages_per_claim = self.reranker.rerank_batch(
+                    [(text, passages) for (text, _), passages in zip(claims, passages_per_claim)]
+                )
+            timings["rerank_ms"] = timings.get("rerank_ms", 0.0) + (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        results = self.fact_validator.validate_claims_batch([
+            (text, claim_type, passages)
+            for (text, claim_type), passages in zip(claims, passages_per_claim)
+        ])
+        timings["validation_ms"] = timings.get("validation_ms", 0.0) + (time.perf_counter() - t0) * 1000
+        return results
 
+    def _hits_to_passages(self, hits) -> List[SourcePassage]:
+        """Converts Qdrant ScoredPoints (news or claim payloads) into SourcePassages."""
         passages = []
 
         for hit in hits:
@@ -267,13 +563,7 @@ class FactCheckingPipeline:
             # ----------------------------
             # Smart fallback content logic
             # ----------------------------
-            content = (
-                payload.get("content") or
-                payload.get("summary") or
-                payload.get("claim") or
-                payload.get("title") or
-                ""
-            )
+            content = passage_text(payload)
 
             # ----------------------------
             # Smart title logic
@@ -323,18 +613,21 @@ class FactCheckingPipeline:
         return passages
 
     
-    def process_query(self, user_input: str) -> Dict[str, Any]:
+    def process_query(self, user_input: str, reasoning_mode: str = None) -> Dict[str, Any]:
         """
         Main pipeline entry point.
         
         Pipeline steps:
         1. Extract claim from user input (Danny's module)
-        2. Retrieve evidence from vector DB (Adam's module)
+        2. Retrieve evidence from vector DB (Adam's module); with
+           SPECULATIVE_RETRIEVAL this runs for the raw input during step 1
+           and is kept when the extracted claim is the input itself
         3. Validate claim against evidence (Sam's module)
         4. Format response for LLM/UI
         
         Args:
             user_input: Raw user query text
+            reasoning_mode: "fast" | "standard" | "full"; None uses the engine default
             
         Returns:
             Dict with:
@@ -344,70 +637,187 @@ class FactCheckingPipeline:
                 - citations: List of citation dicts
                 - features: Feature scores dict
                 - raw_result: Full FactCheckResult object
+                - llm_response: Raw LLM echo of the input (only with ECHO_LLM_RESPONSE=1)
+                - timings: Per-stage wall time in milliseconds
+                - claims: Per-claim results when the input contains several claims
+                  (the top-level fields then describe the first claim)
         """
         
-        # Step 1: Extract claim
+        timings: Dict[str, float] = {}
+        t_start = time.perf_counter()
 
-        # Call the currently selected LLM with the raw user text so its response can
-        # be returned alongside the fact-check verdict.
-        llm_response = None
-        try:
-            llm_response = self.llm.message(user_input)
-            preview = (llm_response or "None")[:100]
-            print(f"[process_query] LLM response preview: {preview}")
-        except Exception as llm_error:
-            print(f"LLM call failed: {llm_error}")
-        try:
-            print("Extracting claim from user input...")
-            claim_data = extract_claim_from_input(self.llm, user_input)
-            print("Extracted claim data:", claim_data)
-            if isinstance(claim_data, dict) and "claims" in claim_data:
-                claims = claim_data["claims"]
-                if not claims:
-                    return {
-                        "claim": user_input,
-                        "verdict": "Not enough evidence",
-                        "score": 0,
-                        "citations": [],
-                        "features": {},
-                        "message": "No factual claims found in input"
-                    }
-                claim_text = claims[0]["normalized"]
-                claim_type = claims[0].get("type", "unknown")
+        # Optional: call the currently selected LLM with the raw user text so its
+        # response can be returned alongside the fact-check verdict. It runs
+        # concurrently with claim extraction and is never waited on. The worker
+        # runs in a copy of this context so its logs keep the request id.
+        echo_future = None
+        if self.echo_llm_response:
+            echo_future = self._executor.submit(contextvars.copy_context().run, self._timed, self._echo_llm, user_input)
+
+        # Speculative retrieval for the raw input overlaps the extraction LLM call
+        speculative = None
+        if self.speculative_retrieval:
+            speculative = self._executor.submit(contextvars.copy_context().run, self.retrieve_evidence, user_input)
+
+        # Step 1: Extract claims
+        t0 = time.perf_counter()
+        claims, no_claims = self.extract_claims(user_input)
+        timings["claim_extraction_ms"] = (time.perf_counter() - t0) * 1000
+
+        passages = None
+        if speculative is not None:
+            if not no_claims and len(claims) == 1 and self._same_claim(claims[0][0], user_input):
+                t0 = time.perf_counter()
+                try:
+                    passages = speculative.result()
+                except Exception as e:
+                    logger.warning("Speculative retrieval failed (%s); retrieving again", e)
+                timings["retrieval_ms"] = (time.perf_counter() - t0) * 1000
             else:
-                claim_text = user_input
-                claim_type = "unknown"
-        except Exception as e:
-            print(f"Claim extraction failed: {e}")
-            claim_text = user_input
-            claim_type = "unknown"
-        
+                # The extracted claim differs; a search already running just finishes unused
+                speculative.cancel()
+        if no_claims:
+            return self._no_claims_response(user_input, timings, t_start)
+
+        if len(claims) > 1:
+            return self._complete_multi_query(claims, reasoning_mode, timings, t_start, echo_future)
+        claim_text, claim_type = claims[0]
+        return self._complete_query(claim_text, claim_type, reasoning_mode, timings, t_start, echo_future, passages)
+
+    @staticmethod
+    def _same_claim(a: str, b: str) -> bool:
+        norm = lambda t: normalize_ocr_asr(t or "").casefold().rstrip(" .!?")
+        return norm(a) == norm(b)
+
+    def _no_claims_response(self, user_input: str, timings: Dict[str, float], t_start: float) -> Dict[str, Any]:
+        return {
+            "claim": user_input,
+            "verdict": "Not enough evidence",
+            "score": 0,
+            "citations": [],
+            "features": {},
+            "message": "No factual claims found in input",
+            "timings": self._finish_timings(timings, t_start)
+        }
+
+    def _complete_query(self, claim_text: str, claim_type: str, reasoning_mode: str,
+                        timings: Dict[str, float], t_start: float, echo_future=None,
+                        passages: List[SourcePassage] = None) -> Dict[str, Any]:
+        """
+        Steps 2-4 of process_query for an extracted claim: result cache,
+        retrieval (unless speculative retrieval already fetched `passages`),
+        validation, explanation and response formatting.
+        """
+        # Repeated claims are served from the result cache
+        cache_key = self._result_cache_key(claim_text, reasoning_mode)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            logger.info("Result cache hit for claim: %.80s", claim_text)
+            cached["cached"] = True
+            cached["timings"] = self._finish_timings(timings, t_start)
+            return cached
+
         # Step 2: Retrieve evidence
-        print("Retrieving evidence from knowledge base...")
-        passages = self.retrieve_evidence(claim_text, top_k=20)
-        print(f"Retrieved {len(passages)} passages")
+        if passages is None:
+            t0 = time.perf_counter()
+            passages = self.retrieve_evidence(claim_text)
+            timings["retrieval_ms"] = timings.get("retrieval_ms", 0.0) + (time.perf_counter() - t0) * 1000
+        logger.debug("Retrieved %d passages", len(passages))
+
+        # Only the reranker's top N passages go on to the NLI model
+        if passages and self.reranker.name != "none":
+            t0 = time.perf_counter()
+            with stage_timer("rerank"):
+                passages = self.reranker.rerank(claim_text, passages)
+            timings["rerank_ms"] = (time.perf_counter() - t0) * 1000
+            logger.debug("Reranked (%s) down to %d passages", self.reranker.name, len(passages))
         
         if not passages:
-            return {
+            response = {
                 "claim": claim_text,
                 "verdict": "Not enough evidence",
                 "score": 0,
                 "citations": [],
                 "features": {},
-                "message": "No relevant evidence found in knowledge base"
+                "message": "No relevant evidence found in knowledge base",
+                "timings": self._finish_timings(timings, t_start)
             }
+            self._store_cached_result(cache_key, response)
+            return response
         
         # Step 3: Fact validation
-        print("Validating claim against evidence...")
+        t0 = time.perf_counter()
         result: FactCheckResult = self.fact_validator.validate_claim(
             claim=claim_text,
             claim_type=claim_type,
             passages=passages
         )
-        print(f"Validation result: Verdict={result.verdict}, Score={result.score}")
+        timings["validation_ms"] = (time.perf_counter() - t0) * 1000
+        logger.info("Verdict=%s score=%s for claim: %.80s", result.verdict, result.score, claim_text)
+
+        t0 = time.perf_counter()
+        explanation = self.generate_explanation(result, reasoning_mode)
+        timings["explanation_ms"] = (time.perf_counter() - t0) * 1000
+
+        # Only use the echo if it already finished; never block the response on it
+        llm_response = None
+        if echo_future is not None and echo_future.done():
+            llm_response, timings["llm_echo_ms"] = echo_future.result()
         
         # Step 4: Format response
-        response = {
+        response = self.format_result(result)
+        response.update({
+            "raw_result": result,  # For debugging
+            "explanation": explanation,
+            "llm_response": llm_response,  # Surface direct model output for the UI if needed
+            "timings": self._finish_timings(timings, t_start)
+        })
+        self._store_cached_result(cache_key, response)
+        
+        return response
+
+    def _complete_multi_query(self, claims: List[Tuple[str, str]], reasoning_mode: str,
+                              timings: Dict[str, float], t_start: float, echo_future=None) -> Dict[str, Any]:
+        """
+        _complete_query for inputs with several claims. All claims are checked
+        together through check_claims(); only the first claim gets an explanation.
+        """
+        cache_key = self._result_cache_key("\n".join(text for text, _ in claims), reasoning_mode)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            logger.info("Result cache hit for %d claims", len(claims))
+            cached["cached"] = True
+            cached["timings"] = self._finish_timings(timings, t_start)
+            return cached
+
+        logger.debug("Checking %d claims in one batch", len(claims))
+        results = self.check_claims(claims, timings=timings)
+        primary = results[0]
+        logger.info("Checked %d claims; first: verdict=%s score=%s", len(results), primary.verdict, primary.score)
+
+        t0 = time.perf_counter()
+        explanation = self.generate_explanation(primary, reasoning_mode)
+        timings["explanation_ms"] = (time.perf_counter() - t0) * 1000
+
+        llm_response = None
+        if echo_future is not None and echo_future.done():
+            llm_response, timings["llm_echo_ms"] = echo_future.result()
+
+        response = self.format_result(primary)
+        response.update({
+            "claims": [self.format_result(r) for r in results],
+            "raw_result": primary,
+            "explanation": explanation,
+            "llm_response": llm_response,
+            "timings": self._finish_timings(timings, t_start)
+        })
+        self._store_cached_result(cache_key, response)
+        return response
+
+    @staticmethod
+    def format_result(result: FactCheckResult) -> Dict[str, Any]:
+        """JSON-safe claim/verdict/score/citations/features view of a FactCheckResult."""
+        return {
             "claim": result.claim,
             "verdict": result.verdict,
             "score": result.score,
@@ -427,14 +837,92 @@ class FactCheckingPipeline:
                 "agree_domain_count": result.features.agree_domain_count,
                 "relevance_avg": result.features.relevance_score_avg,
                 "recency_max": result.features.recency_weight_max
-            },
-            "raw_result": result,  # For debugging
-            "explanation": self.generate_explanation(result),
-            "llm_response": llm_response  # Surface direct model output for the UI if needed
-
+            }
         }
-        
-        return response
+
+    # --- Result cache helpers ---
+    def _result_cache_key(self, claim_text: str, reasoning_mode: str = None) -> str:
+        """
+        Key = ingestion version + normalized claim + everything that changes the
+        explanation (reasoning on/off, reasoning mode, LLM provider).
+        """
+        import hashlib
+        normalized = normalize_ocr_asr(claim_text or "").casefold().rstrip(" .!?")
+        if reasoning_mode is None:
+            reasoning_mode = getattr(getattr(self, "reasoning_engine", None), "mode", "default")
+        parts = [
+            self._ingest_version.current(),
+            normalized,
+            "reasoning" if self.use_reasoning else "plain",
+            str(reasoning_mode),
+            self.current_llm_provider,
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def _get_cached_result(self, cache_key: str):
+        if self.result_cache is None:
+            return None
+        # A new ingestion version makes every older entry stale
+        version = self._ingest_version.current()
+        if version != self._result_cache_version:
+            if self._result_cache_version is not None:
+                logger.info("Ingestion version changed to %s; clearing result cache", version)
+                self.result_cache.clear()
+            self._result_cache_version = version
+        cached = self.result_cache.get(cache_key)
+        return dict(cached) if cached is not None else None
+
+    def _store_cached_result(self, cache_key: str, response: Dict[str, Any]) -> None:
+        if self.result_cache is None:
+            return
+        # raw_result is a dataclass graph and llm_response/timings are per-request
+        value = {k: v for k, v in response.items() if k not in ("raw_result", "llm_response", "timings")}
+        self.result_cache.set(cache_key, value)
+
+    def extract_claims(self, user_input: str):
+        """
+        Runs LLM claim extraction on the user input.
+        Returns ([(claim_text, claim_type), ...], no_claims); falls back to the raw input on failure.
+        """
+        with stage_timer("claim_extraction"):
+            try:
+                claim_data = extract_claim_from_input(self.llm, user_input)
+                logger.debug("Extracted claim data: %s", claim_data)
+                if isinstance(claim_data, dict) and "claims" in claim_data:
+                    claims = [
+                        (c["normalized"], c.get("type", "unknown"))
+                        for c in claim_data["claims"] if c.get("normalized")
+                    ]
+                    if not claims:
+                        return [(user_input, "unknown")], True
+                    return claims, False
+                return [(user_input, "unknown")], False
+            except Exception as e:
+                logger.warning("Claim extraction failed: %s", e)
+                return [(user_input, "unknown")], False
+
+    def _echo_llm(self, user_input: str):
+        try:
+            with stage_timer("llm_echo"):
+                llm_response = self.llm.message(user_input)
+            logger.debug("LLM response preview: %.100s", llm_response)
+            return llm_response
+        except Exception as llm_error:
+            logger.warning("LLM call failed: %s", llm_error)
+            return None
+
+    @staticmethod
+    def _timed(fn, *args):
+        """Runs fn(*args) and returns (result, elapsed_ms)."""
+        t0 = time.perf_counter()
+        out = fn(*args)
+        return out, (time.perf_counter() - t0) * 1000
+
+    @staticmethod
+    def _finish_timings(timings: Dict[str, float], t_start: float) -> Dict[str, float]:
+        timings["total_ms"] = (time.perf_counter() - t_start) * 1000
+        STAGE_SECONDS.observe(timings["total_ms"] / 1000, stage="total")
+        return {k: round(v, 1) for k, v in timings.items()}
     
     def format_for_ui(self, response: Dict[str, Any]) -> str:
         """
@@ -473,17 +961,19 @@ Citations:
         
         return output.strip()
 
-    def generate_explanation(self, result: FactCheckResult) -> str:
+    def generate_explanation(self, result: FactCheckResult, reasoning_mode: str = None) -> str:
         """Generate explanation using reasoning with full citation context"""
+        # Every LLM call of the reasoning chain is attributed to this stage
+        with stage_timer("explanation"):
+            return self._generate_explanation(result, reasoning_mode)
+
+    def _generate_explanation(self, result: FactCheckResult, reasoning_mode: str = None) -> str:
         
         # Use all_evidence if available, fall back to citations
         evidence_to_analyze = result.all_evidence if result.all_evidence else result.citations
         
-        print(f"\n[REASONING INPUT]")
-        print(f"  Claim: {result.claim}")
-        print(f"  Verdict: {result.verdict}")
-        print(f"  Score: {result.score}")
-        print(f"  Evidence passages: {len(evidence_to_analyze)}")
+        logger.debug("Reasoning input: claim=%r verdict=%s score=%s evidence=%d",
+                     result.claim, result.verdict, result.score, len(evidence_to_analyze))
         
         if not self.use_reasoning:
             prompt = f"Explain this verdict: {result.claim} is {result.verdict} (score: {result.score}/100)"
@@ -512,11 +1002,11 @@ Citations:
     2. Any temporal or contextual conflicts in the evidence
     3. Why the score is {result.score}/100"""
         
-        print(f"[REASONING PROMPT]:\n{question[:500]}...")
+        logger.debug("Reasoning prompt:\n%.500s", question)
         
-        explanation = self.reasoning_engine.reasoning_agent(question)
+        explanation = self.reasoning_engine.reasoning_agent(question, mode=reasoning_mode)
         
-        print(f"[REASONING OUTPUT]: {explanation[:200]}...")
+        logger.debug("Reasoning output: %.200s", explanation)
         
         return explanation
 
@@ -529,9 +1019,11 @@ def main():
     from pathlib import Path
     import os
     from dotenv import load_dotenv
+    from log_setup import configure_logging
     
     # Load environment
     load_dotenv()
+    configure_logging()
     
     # Compute paths relative to project root
     project_root = Path(__file__).parent
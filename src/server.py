@@ -4,8 +4,9 @@ Provides REST API endpoint for the React frontend
 """
 from dotenv import load_dotenv
 load_dotenv()
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
+import logging
 import sys
 import os
 from pathlib import Path
@@ -26,7 +27,15 @@ os.chdir(PROJECT_ROOT)  # Change working directory to project root
 # Load .env from project root
 load_dotenv(PROJECT_ROOT / '.env')
 
+from log_setup import clean_request_id, configure_logging, dropped_records, reset_request_id, set_request_id
+configure_logging()
+logger = logging.getLogger("server")
+
 from pipeline import FactCheckingPipeline
+from admission import AdmissionGate, QueueFullError, QueueTimeoutError
+from modules.llm.llm_reasoning_interface import REASONING_MODES
+from modules.metrics.registry import REGISTRY
+import time
 
 # -------------------------------------------------------------------------
 # Flask app setup
@@ -35,6 +44,14 @@ app = Flask(__name__)
 CORS(app)
 pipeline_lock = Lock()
 
+# Bounded concurrency for /chat: extra requests wait in a short queue,
+# and once that is full they get 429 instead of piling up.
+chat_gate = AdmissionGate(
+    max_concurrent=int(os.environ.get('CHAT_MAX_CONCURRENCY', 4)),
+    max_queue=int(os.environ.get('CHAT_MAX_QUEUE', 16)),
+    queue_timeout=float(os.environ.get('CHAT_QUEUE_TIMEOUT', 30)),
+)
+
 # -------------------------------------------------------------------------
 # Initialize pipeline once at startup
 # -------------------------------------------------------------------------
@@ -44,9 +61,7 @@ LLM_PROVIDER = os.environ.get('LLM_PROVIDER')
 if not LLM_PROVIDER:
     raise ValueError("LLM_PROVIDER not set. Run setup.sh first.")
 
-print("\nInitializing Fact-Checking Pipeline...")
-print(f"  LLM Provider: {LLM_PROVIDER}")
-print(f"  Project Root: {PROJECT_ROOT}")
+logger.info("Initializing Fact-Checking Pipeline (LLM provider: %s, project root: %s)", LLM_PROVIDER, PROJECT_ROOT)
 
 # Use absolute paths from project root
 QDRANT_URL = os.environ["QDRANT_URL"]
@@ -68,13 +83,12 @@ collection_name = "nba_claims"
 try:
     size = pipeline.vector_db.get_collection_size()
     if size == 0:
-        print(f" Qdrant collection '{collection_name}' is empty.")
-        print(f"    → Run ingestion manually: python src/modules/misinformation_module/src/ingest_nba.py")
+        logger.warning("Qdrant collection '%s' is empty. Run ingestion manually: "
+                       "python src/modules/misinformation_module/src/ingest_nba.py", collection_name)
     else:
-        print(f" Qdrant collection '{collection_name}' loaded successfully with {size} entries.")
+        logger.info("Qdrant collection '%s' loaded successfully with %d entries.", collection_name, size)
 except Exception as e:
-    print(f" Could not check collection size: {e}")
-    print("    → Run ingestion manually if you haven't already.")
+    logger.warning("Could not check collection size: %s. Run ingestion manually if you haven't already.", e)
 
 # -------------------------------------------------------------------------
 # Flask API endpoints
@@ -98,34 +112,29 @@ def rebuild_pipeline(new_provider: str) -> bool:
     
     # Lock ensures no other process changes pipeline during rebuild
     with pipeline_lock:
-        try:
-            if hasattr(pipeline, "vector_db") and hasattr(pipeline.vector_db, "client"):
-                pipeline.vector_db.client.close()  # Free older qdrant
-                print("Closed previous Qdrant client.")
-        except Exception as e:
-            print(f"Warning: could not close Qdrant client: {e}")          
-
         current_provider = (LLM_PROVIDER or '').lower()
         if normalized_provider == current_provider:
-            print(f"LLM provider already set to '{LLM_PROVIDER}'. No changes made.")
+            logger.info("LLM provider already set to '%s'. No changes made.", LLM_PROVIDER)
             return False
         
         # Log the provider switch
-        print(f"Switching LLM provider: {LLM_PROVIDER} → {normalized_provider}")
-        print("Reinitializing fact-checking pipeline with requested provider...")
+        logger.info("Switching LLM provider: %s -> %s; reinitializing pipeline", LLM_PROVIDER, normalized_provider)
         current_reasoning = getattr(pipeline, 'use_reasoning', True)
+        # Keep the existing Qdrant connections instead of closing and reconnecting
         new_pipeline = FactCheckingPipeline(
             use_reasoning=current_reasoning,
             llm_provider=normalized_provider,
             qdrant_url=QDRANT_URL,
-            qdrant_api_key=QDRANT_API_KEY
+            qdrant_api_key=QDRANT_API_KEY,
+            vector_db=pipeline.vector_db
         )
 
 
-        # Replace old pipeline with new one
-        pipeline = new_pipeline
+        # Replace old pipeline with new one; the shared vector_db stays open
+        old_pipeline, pipeline = pipeline, new_pipeline
+        old_pipeline.close()
         LLM_PROVIDER = normalized_provider
-        print(f"LLM provider switched successfully to '{LLM_PROVIDER}'.")
+        logger.info("LLM provider switched successfully to '%s'.", LLM_PROVIDER)
         return True
 
 @app.route('/chat', methods=['GET', 'POST'])
@@ -133,8 +142,9 @@ def chat():
     """
     Main chat endpoint that processes user queries.
     
-    GET params: ?question=<user_query>
-    POST body: {"question": "<user_query>"}
+    GET params: ?question=<user_query>&reasoning_mode=<fast|standard|full>
+    POST body: {"question": "<user_query>", "reasoning_mode": "fast"}
+    reasoning_mode is optional; it defaults to REASONING_MODE (full).
     
     Returns: JSON response with verdict, score, explanation, citations
     """
@@ -142,9 +152,19 @@ def chat():
         # Support both GET and POST
         if request.method == 'GET':
             question = request.args.get('question', '')
+            reasoning_mode = request.args.get('reasoning_mode')
         else:
             data = request.get_json(force=True)
             question = data.get("question", "")
+            reasoning_mode = data.get("reasoning_mode")
+
+        if reasoning_mode is not None:
+            reasoning_mode = str(reasoning_mode).strip().lower()
+            if reasoning_mode not in REASONING_MODES:
+                return jsonify({
+                    'error': f"Invalid reasoning_mode '{reasoning_mode}'",
+                    'allowed_reasoning_modes': list(REASONING_MODES)
+                }), 400
 
         if not question.strip():
             return jsonify({
@@ -160,8 +180,21 @@ def chat():
         # Only use NBA data
         pipeline.available_collections = ["nba_claims"]
 
-        # Run query through pipeline
-        result = pipeline.process_query(question)
+        # Run query through pipeline (bounded by the admission gate)
+        try:
+            with chat_gate.slot():
+                result = pipeline.process_query(question, reasoning_mode=reasoning_mode)
+        except (QueueFullError, QueueTimeoutError) as busy:
+            status = 429 if isinstance(busy, QueueFullError) else 503
+            return jsonify({
+                "error": str(busy),
+                "claim": question,
+                "verdict": "Error",
+                "score": 0,
+                "explanation": "The server is busy. Please retry shortly.",
+                "citations": [],
+                "features": {}
+            }), status, {"Retry-After": os.environ.get('CHAT_RETRY_AFTER', '5')}
 
         # Prepare JSON for frontend
         response = {
@@ -171,16 +204,17 @@ def chat():
             "explanation": result.get("explanation", "No explanation available."),
             "citations": result.get("citations", []),
             "features": result.get("features", {}),
+            "timings": result.get("timings", {}),
             "formatted_text": pipeline.format_for_ui(result)
         }
+        if "claims" in result:
+            response["claims"] = result["claims"]
 
         return jsonify(response)
 
     except Exception as e:
-        print(f"Error processing query: {e}")
-        import traceback
-        traceback.print_exc()
-        
+        logger.exception("Error processing query: %s", e)
+
         return jsonify({
             'error': str(e),
             'claim': question if 'question' in locals() else '',
@@ -240,13 +274,77 @@ def chat():
 #         traceback.print_exc()
 #         return jsonify({'error': str(e)}), 500
 
+# -------------------------------------------------------------------------
+# Metrics (Prometheus text format at /metrics)
+# -------------------------------------------------------------------------
+HTTP_SECONDS = REGISTRY.summary("http_request_seconds", "HTTP request latency", ("endpoint", "method"))
+HTTP_REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests by status", ("endpoint", "method", "status"))
+REGISTRY.gauge("chat_requests_active", "/chat requests running a pipeline", lambda: chat_gate.stats()["active"])
+REGISTRY.gauge("chat_requests_queued", "/chat requests waiting for a slot", lambda: chat_gate.stats()["queued"])
+REGISTRY.gauge("chat_requests_rejected_total", "/chat requests rejected with 429/503",
+               lambda: {"queue_full": chat_gate.rejected, "queue_timeout": chat_gate.timed_out},
+               ("reason",), kind="counter")
+REGISTRY.gauge("cache_hits_total", "Cache hits since start", lambda: _cache_counts("hits"), ("cache",), kind="counter")
+REGISTRY.gauge("cache_misses_total", "Cache misses since start", lambda: _cache_counts("misses"), ("cache",), kind="counter")
+REGISTRY.gauge("log_records_dropped_total", "Log records dropped because the log queue was full",
+               dropped_records, kind="counter")
+
+
+def _cache_counts(field):
+    """{cache name: hits or misses} for the result, NLI pair and query embedding caches."""
+    nli = pipeline.fact_validator.nli
+    nli_stats = nli.stats() if hasattr(nli, "stats") else {}
+    caches = {
+        "result": pipeline.result_cache.stats() if pipeline.result_cache is not None else {},
+        "nli_pair": {"hits": nli_stats.get("pair_hits"), "misses": nli_stats.get("pair_misses")},
+        "query_embedding": pipeline.embedder.query_cache_stats(),
+    }
+    return {name: stats[field] for name, stats in caches.items() if stats.get(field) is not None}
+
+
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
+    # Correlation id for every log line of this request (echoed back in the response)
+    g.request_id = clean_request_id(request.headers.get("X-Request-ID"))
+    g.request_id_token = set_request_id(g.request_id)
+
+
+@app.after_request
+def _record_request(response):
+    if request.endpoint != "metrics" and hasattr(g, "request_started"):
+        endpoint = request.endpoint or "unknown"
+        HTTP_SECONDS.observe(time.perf_counter() - g.request_started, endpoint=endpoint, method=request.method)
+        HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    if hasattr(g, "request_id"):
+        response.headers["X-Request-ID"] = g.request_id
+    return response
+
+
+@app.teardown_request
+def _clear_request_id(exc):
+    token = g.pop("request_id_token", None)
+    if token is not None:
+        reset_request_id(token)
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint; quantiles are computed here, not on the request path."""
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     return jsonify({
         "status": "ok",
         "service": "fact-checking-api",
-        "reasoning_enabled": getattr(pipeline, "use_reasoning", True)
+        "reasoning_enabled": getattr(pipeline, "use_reasoning", True),
+        "chat_queue": chat_gate.stats(),
+        "result_cache": pipeline.result_cache.stats() if pipeline.result_cache is not None else None,
+        "nli_cache": pipeline.fact_validator.nli.stats() if hasattr(pipeline.fact_validator.nli, "stats") else None,
+        "query_embedding_cache": pipeline.embedder.query_cache_stats()
     })
 
 
@@ -296,7 +394,7 @@ def set_llm():
             'allowed_providers': ['openai', 'ollama']
         }), 400
     except Exception as exc:
-        print(f"Error switching LLM provider: {exc}")
+        logger.exception("Error switching LLM provider: %s", exc)
         return jsonify({
             'error': 'Failed to update LLM provider.',
             'details': str(exc)
@@ -317,4 +415,6 @@ if __name__ == '__main__':
     print(f"Health check: http://localhost:{PORT}/health")
     print(f"Reasoning: {'Enabled' if pipeline.use_reasoning else 'Disabled'}")
     print(f"{'='*60}\n")
-    app.run(host='0.0.0.0', port=PORT, debug=True, use_reloader=False)
+    print("Development server only; for production run: gunicorn -c src/gunicorn.conf.py server:app")
+    app.run(host='0.0.0.0', port=PORT, debug=os.environ.get('FLASK_DEBUG', '1') == '1',
+            use_reloader=False, threaded=True)
@@ -0,0 +1,51 @@
+# tests/integration/test_nli_backends.py
+# Parity check: the ONNX Runtime backend must agree with the torch backend
+# on the gold-standard (claim, passage) pairs used to train the validator.
+# Downloads and runs the real roberta-large-mnli, so it lives with the
+# integration tests.
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("onnxruntime")
+
+from modules.claim_extraction.NLIModel import NLI_LABELS, create_nli_model
+from modules.claim_extraction.training.Validator_Training_Data import get_training_data
+
+EMB_MODEL = "sentence-transformers/all-mpnet-base-v2"
+NLI_MODEL = "roberta-large-mnli"
+
+# Minimum fraction of pairs whose argmax label must match the torch backend
+MIN_LABEL_AGREEMENT = 0.97
+
+
+@pytest.fixture(scope="module")
+def gold_pairs():
+    return [
+        (example.claim, passage.content)
+        for example in get_training_data()
+        for passage in example.passages
+    ]
+
+
+@pytest.fixture(scope="module")
+def torch_results(gold_pairs):
+    backend = create_nli_model(EMB_MODEL, NLI_MODEL, NLI_LABELS, backend="torch")
+    return backend.predict(gold_pairs)
+
+
+def _label(probs):
+    return max(range(3), key=lambda i: probs[i])
+
+
+@pytest.mark.parametrize("backend_name", ["onnx", "torch-int8"])
+def test_backend_label_agreement(backend_name, gold_pairs, torch_results):
+    backend = create_nli_model(EMB_MODEL, NLI_MODEL, NLI_LABELS, backend=backend_name)
+    results = backend.predict(gold_pairs)
+
+    assert len(results) == len(torch_results)
+    agree = sum(_label(a) == _label(b) for a, b in zip(results, torch_results))
+    agreement = agree / len(results)
+    assert agreement >= MIN_LABEL_AGREEMENT, (
+        f"{backend_name}: only {agree}/{len(results)} labels agree with torch ({agreement:.1%})"
+    )
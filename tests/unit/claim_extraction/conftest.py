@@ -0,0 +1,121 @@
+# tests/unit/claim_extraction/conftest.py
+import hashlib
+import importlib
+import importlib.util
+import sys
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+from modules.claim_extraction.Fact_Validator import FactValidator
+from modules.claim_extraction.Fact_Validator_Data_models import ModelInterface
+from modules.claim_extraction.training.Validator_Training_Data import get_training_data
+
+# Heavy model libraries NLIModel / ONNXNLIModel import at module level. The
+# unit tests below never load a real model, so missing ones are replaced by
+# placeholders while the module under test is imported.
+_MODEL_LIBRARIES = ("torch", "transformers", "transformers.utils", "sentence_transformers")
+_NLI_MODULES = ("modules.claim_extraction.NLIModel", "modules.claim_extraction.ONNXNLIModel")
+
+
+def _installed(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ModuleNotFoundError, ValueError):
+        return False
+
+
+class HashNLI(ModelInterface):
+    """
+    Deterministic stand-in NLI: (entail, contradict, neutral) derived from a
+    hash of the pair. Counts predict() calls and scored pairs.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.pairs = 0
+
+    def predict(self, inputs):
+        self.calls += 1
+        self.pairs += len(inputs)
+        out = []
+        for claim, passage in inputs:
+            d = hashlib.sha1(f"{claim}\x1f{passage}".encode("utf-8")).digest()
+            e, c = d[0] / 255.0, d[1] / 255.0 * (1.0 - d[0] / 255.0)
+            out.append((e, c, max(0.0, 1.0 - e - c)))
+        return out
+
+
+class StubTokenizer:
+    """
+    Tokenizer stand-in: pair i of a call becomes `lengths[i]` copies of token
+    id i (cycling through `lengths`), so a model stub can tell which pair a
+    padded row came from. pad() right-pads with -1.
+    """
+
+    def __init__(self, lengths=(5, 2, 9, 3, 7, 1, 4)):
+        self.lengths = lengths
+        self.pad_calls = []
+
+    def __call__(self, firsts, seconds, truncation=True):
+        ids = [[i] * self.lengths[i % len(self.lengths)] for i in range(len(firsts))]
+        return {"input_ids": ids, "attention_mask": [[1] * len(x) for x in ids]}
+
+    def pad(self, features, padding=True, return_tensors=None):
+        width = max(len(f["input_ids"]) for f in features)
+        self.pad_calls.append(([len(f["input_ids"]) for f in features], return_tensors))
+        return {
+            "input_ids": [f["input_ids"] + [-1] * (width - len(f["input_ids"])) for f in features],
+            "attention_mask": [f["attention_mask"] + [0] * (width - len(f["attention_mask"])) for f in features],
+        }
+
+
+@pytest.fixture
+def nli_modules():
+    """
+    Imports NLIModel and ONNXNLIModel afresh, with placeholder modules for
+    missing model libraries and a fake onnxruntime. Everything is removed
+    from sys.modules again afterwards.
+    """
+    names = _MODEL_LIBRARIES + ("onnxruntime",) + _NLI_MODULES
+    saved = {name: sys.modules.get(name) for name in names}
+    for name in _NLI_MODULES:
+        sys.modules.pop(name, None)
+    missing = [name for name in _MODEL_LIBRARIES if name not in sys.modules and not _installed(name.split(".")[0])]
+    for name in missing:
+        sys.modules[name] = MagicMock(name=name)
+    sys.modules["onnxruntime"] = types.ModuleType("onnxruntime")
+    try:
+        yield (importlib.import_module("modules.claim_extraction.NLIModel"),
+               importlib.import_module("modules.claim_extraction.ONNXNLIModel"))
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+@pytest.fixture
+def stub_tokenizer():
+    return StubTokenizer()
+
+
+@pytest.fixture
+def hash_nli():
+    """The HashNLI class; call it for a fresh instance."""
+    return HashNLI
+
+
+@pytest.fixture(scope="session")
+def trained_validator(tmp_path_factory):
+    """
+    One FactValidator trained on the gold-standard set with HashNLI and saved
+    to a temporary model_path. Returns (validator, nli, training data).
+    """
+    data = get_training_data()
+    nli = HashNLI()
+    model_path = tmp_path_factory.mktemp("model") / "fact_validator_models.joblib"
+    validator = FactValidator(llm=None, nli_backend=nli, training_data=data, model_path=str(model_path))
+    return validator, nli, data
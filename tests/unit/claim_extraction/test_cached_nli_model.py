@@ -0,0 +1,67 @@
+# tests/unit/claim_extraction/test_cached_nli_model.py
+from modules.claim_extraction.CachedNLIModel import CachedNLIModel
+from modules.claim_extraction.Fact_Validator_Data_models import ModelInterface
+
+
+class CountingNLI(ModelInterface):
+    """Deterministic stand-in backend that records every pair it scores."""
+
+    def __init__(self):
+        self.seen = []
+
+    def predict(self, inputs):
+        self.seen.extend(inputs)
+        return [(0.7, 0.2, 0.1) if "won" in p else (0.1, 0.8, 0.1) for _, p in inputs]
+
+    def warmup(self):
+        return "warm"
+
+
+def test_only_new_pairs_reach_backend(tmp_path):
+    backend = CountingNLI()
+    nli = CachedNLIModel(backend, max_entries=100, path=None)
+
+    first = nli.predict([("Lakers won", "The Lakers won."), ("Lakers won", "The Lakers lost.")])
+    second = nli.predict([("Lakers won", "The Lakers lost."), ("Lakers won", "The Lakers won in OT.")])
+
+    assert first == [(0.7, 0.2, 0.1), (0.1, 0.8, 0.1)]
+    assert second == [(0.1, 0.8, 0.1), (0.7, 0.2, 0.1)]
+    assert len(backend.seen) == 3
+    assert nli.stats()["pair_hits"] == 1
+    assert nli.stats()["pair_misses"] == 3
+
+
+def test_duplicate_pairs_in_one_call_scored_once():
+    backend = CountingNLI()
+    nli = CachedNLIModel(backend, max_entries=100, path=None)
+
+    out = nli.predict([("c", "won"), ("c", "won"), ("c", "lost")])
+    assert out[0] == out[1]
+    assert len(backend.seen) == 2
+
+
+def test_persisted_scores_survive_restart(tmp_path):
+    path = str(tmp_path / "nli.sqlite")
+    CachedNLIModel(CountingNLI(), max_entries=100, path=path).predict([("c", "won")])
+
+    backend = CountingNLI()
+    nli = CachedNLIModel(backend, max_entries=100, path=path)
+    assert nli.predict([("c", "won")]) == [(0.7, 0.2, 0.1)]
+    assert backend.seen == []
+
+
+def test_backends_do_not_share_persisted_scores(tmp_path):
+    path = str(tmp_path / "nli.sqlite")
+    torch_backend = CountingNLI()
+    torch_backend.cache_key = "NLIModel:roberta-large-mnli:fp32"
+    CachedNLIModel(torch_backend, max_entries=100, path=path).predict([("c", "won")])
+
+    onnx_backend = CountingNLI()
+    onnx_backend.cache_key = "ONNXNLIModel:roberta-large-mnli:fp32"
+    CachedNLIModel(onnx_backend, max_entries=100, path=path).predict([("c", "won")])
+    assert onnx_backend.seen == [("c", "won")]
+
+
+def test_forwards_backend_attributes():
+    nli = CachedNLIModel(CountingNLI(), max_entries=10, path=None)
+    assert nli.warmup() == "warm"
@@ -0,0 +1,47 @@
+# tests/unit/claim_extraction/test_fact_validator_training.py
+import numpy as np
+
+from modules.claim_extraction.Fact_Validator import FactValidator
+from modules.claim_extraction.training.Validator_Training_Data import get_training_data
+
+
+def test_training_runs_nli_once_and_reuses_the_disk_cache(tmp_path, monkeypatch, hash_nli):
+    monkeypatch.delenv("NLI_TRAIN_CACHE_PATH", raising=False)
+    data = get_training_data()
+    model_path = str(tmp_path / "fact_validator_models.joblib")
+    probe = np.random.default_rng(0).uniform(0, 3, size=(100, 11))
+
+    nli = hash_nli()
+    first = FactValidator(None, nli, training_data=data, model_path=model_path)
+    related_pairs = sum(1 for ex in data for p in ex.passages if p.relevance_score >= first.related_gate)
+    assert nli.calls == 1  # train and test examples in one sweep
+    assert 0 < nli.pairs <= related_pairs
+    assert (tmp_path / "fact_validator_models_nli_cache.sqlite").exists()
+
+    # Retraining with the same NLI model takes every score from the cache
+    nli = hash_nli()
+    second = FactValidator(None, nli, training_data=data, model_path=model_path)
+    assert nli.pairs == 0
+    np.testing.assert_array_equal(second.clf.predict_proba(probe), first.clf.predict_proba(probe))
+
+
+def test_each_nli_backend_gets_its_own_cache_table(tmp_path, monkeypatch, hash_nli):
+    monkeypatch.delenv("NLI_TRAIN_CACHE_PATH", raising=False)
+    data = get_training_data()
+    model_path = str(tmp_path / "fact_validator_models.joblib")
+    FactValidator(None, hash_nli(), training_data=data, model_path=model_path)
+
+    # Same scores, but a different backend (e.g. the int8 variant) must not reuse them
+    nli = hash_nli()
+    nli.cache_key = "HashNLI:int8"
+    FactValidator(None, nli, training_data=data, model_path=model_path)
+    assert nli.pairs > 0
+
+
+def test_training_features_match_generate_training_example(trained_validator):
+    validator, _, data = trained_validator
+    data = data[:20]
+
+    related, nli_batches = validator._training_nli(data)
+    for ex, rel, nli_results in zip(data, related, nli_batches):
+        assert validator._training_example(rel, nli_results) == validator.generate_training_example(ex.claim, ex.passages)
@@ -0,0 +1,75 @@
+# tests/unit/claim_extraction/test_forest_predictor.py
+import subprocess
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pytest
+
+from modules.claim_extraction.Fact_Validator import FactValidator
+from modules.claim_extraction.forest_predictor import ForestPredictor, compiled_path, export_model
+
+SRC_DIR = Path(__file__).resolve().parents[3] / "src"
+
+
+@pytest.fixture(scope="module")
+def sklearn_model(trained_validator):
+    """The forest FactValidator._train saved, plus the features of the whole gold-standard set."""
+    validator, _, data = trained_validator
+    models = joblib.load(validator.model_path)
+    X = np.vstack([
+        validator._prepare_features(*validator.generate_training_example(ex.claim, ex.passages))
+        for ex in data
+    ])
+    return models["clf"], models["encoder"], X, validator
+
+
+def test_trained_validator_predicts_with_the_saved_forest(sklearn_model):
+    clf, _, X, validator = sklearn_model
+    assert isinstance(validator.clf, ForestPredictor)
+    assert compiled_path(validator.model_path).exists()
+    np.testing.assert_array_equal(validator.clf.predict_proba(X), clf.predict_proba(X))
+
+
+def test_probabilities_match_sklearn(sklearn_model):
+    clf, _, X, _ = sklearn_model
+    forest = ForestPredictor.from_sklearn(clf)
+    probe = np.random.default_rng(0).uniform(X.min(axis=0), X.max(axis=0), size=(500, X.shape[1]))
+
+    for rows in (X, probe, X[:1]):
+        np.testing.assert_array_equal(forest.predict_proba(rows), clf.predict_proba(rows))
+    np.testing.assert_array_equal(forest.predict(X), clf.predict(X))
+
+
+def test_compiled_model_loads_without_sklearn(sklearn_model, tmp_path):
+    clf, encoder, X, _ = sklearn_model
+    model_path = tmp_path / "fact_validator_models.joblib"
+    joblib.dump({"clf": clf, "encoder": encoder}, model_path)
+    assert export_model(model_path) == compiled_path(model_path)
+
+    script = (
+        "import sys\n"
+        "import numpy as np\n"
+        "from modules.claim_extraction.Fact_Validator import FactValidator\n"
+        f"v = FactValidator(None, None, model_path={str(model_path)!r})\n"
+        "assert 'sklearn' not in sys.modules\n"
+        f"np.save({str(tmp_path / 'proba.npy')!r}, v.clf.predict_proba(np.load({str(tmp_path / 'X.npy')!r})))\n"
+        "print(v.encoder.classes_.tolist())\n"
+    )
+    np.save(tmp_path / "X.npy", X)
+    out = subprocess.run([sys.executable, "-c", script], cwd=SRC_DIR, capture_output=True, text=True)
+    assert out.returncode == 0, out.stderr
+
+    np.testing.assert_array_equal(np.load(tmp_path / "proba.npy"), clf.predict_proba(X))
+    assert out.stdout.splitlines()[-1] == str(encoder.classes_.tolist())
+
+
+def test_unreadable_compiled_model_falls_back_to_joblib(sklearn_model, tmp_path):
+    clf, encoder, X, _ = sklearn_model
+    model_path = tmp_path / "fact_validator_models.joblib"
+    joblib.dump({"clf": clf, "encoder": encoder}, model_path)
+    compiled_path(model_path).write_bytes(b"not an npz")
+
+    validator = FactValidator(None, None, model_path=str(model_path))
+    np.testing.assert_array_equal(validator.clf.predict_proba(X), clf.predict_proba(X))
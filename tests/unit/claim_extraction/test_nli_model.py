@@ -0,0 +1,55 @@
+# tests/unit/claim_extraction/test_nli_model.py
+# Micro-batching in NLIModel._predict_probabilities, with a stub tokenizer and model.
+
+
+def _model(nli_modules, tokenizer, batch_size):
+    NLIModel = nli_modules[0].NLIModel
+    model = NLIModel.__new__(NLIModel)  # skip loading real weights
+    model.nli_tok = tokenizer
+    model.NLI_LABELS = ["contradiction", "neutral", "entailment"]
+    model.batch_size = batch_size
+    model.forward_batches = []
+
+    def forward(batch):
+        # One row per padded pair; the first token id says which pair it is
+        model.forward_batches.append(len(batch["input_ids"]))
+        return [[float(row[0]), 0.0, 1.0] for row in batch["input_ids"]]
+
+    model._forward = forward
+    return model
+
+
+def test_results_come_back_in_input_order_across_batches(nli_modules, stub_tokenizer):
+    model = _model(nli_modules, stub_tokenizer, batch_size=3)
+    pairs = [(f"claim {i}", f"passage {i}") for i in range(7)]
+
+    results = model._predict_probabilities(pairs)
+
+    assert [row[0] for row in results] == list(range(7))
+    assert model.forward_batches == [3, 3, 1]
+
+
+def test_batches_group_pairs_of_similar_length(nli_modules, stub_tokenizer):
+    model = _model(nli_modules, stub_tokenizer, batch_size=3)
+    model._predict_probabilities([("c", "p")] * 7)
+
+    lengths = [batch for batch, _ in stub_tokenizer.pad_calls]
+    assert lengths == [[1, 2, 3], [4, 5, 7], [9]]
+    assert all(tensors == "pt" for _, tensors in stub_tokenizer.pad_calls)
+
+
+def test_predict_maps_labels_to_entail_contradict_neutral(nli_modules, stub_tokenizer):
+    model = _model(nli_modules, stub_tokenizer, batch_size=16)
+    model._forward = lambda batch: [[0.1, 0.2, 0.7] for _ in batch["input_ids"]]
+
+    assert model.predict([("c", "p"), ("c", "q")]) == [(0.7, 0.1, 0.2)] * 2
+    assert model.predict([]) == []
+
+
+def test_cache_key_names_backend_model_and_precision(nli_modules, stub_tokenizer):
+    model = _model(nli_modules, stub_tokenizer, batch_size=16)
+    model.nli_model_name = "roberta-large-mnli"
+    model.quantize = False
+    assert model.cache_key == "NLIModel:roberta-large-mnli:fp32"
+    model.quantize = True
+    assert model.cache_key == "NLIModel:roberta-large-mnli:int8"
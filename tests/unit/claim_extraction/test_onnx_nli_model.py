@@ -0,0 +1,63 @@
+# tests/unit/claim_extraction/test_onnx_nli_model.py
+# ONNXNLIModel batching and label mapping, with a fake onnxruntime session.
+from types import SimpleNamespace
+
+import numpy as np
+
+
+class FakeSession:
+    """Logits favour the label whose index is the pair's first token id mod 3."""
+
+    def __init__(self, path, options, providers=None):
+        self.path = path
+        self.feeds = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(self, output_names, feeds):
+        self.feeds.append(feeds)
+        logits = np.zeros((len(feeds["input_ids"]), 3), dtype=np.float32)
+        logits[np.arange(len(logits)), feeds["input_ids"][:, 0] % 3] = 4.0
+        return [logits]
+
+
+def _model(nli_modules, tokenizer, tmp_path, monkeypatch, batch_size):
+    module = nli_modules[1]
+    ort = SimpleNamespace(
+        SessionOptions=lambda: SimpleNamespace(),
+        GraphOptimizationLevel=SimpleNamespace(ORT_ENABLE_ALL="all"),
+        InferenceSession=FakeSession,
+    )
+    monkeypatch.setattr(module, "ort", ort)
+    monkeypatch.setattr(module, "AutoTokenizer", SimpleNamespace(from_pretrained=lambda name: tokenizer))
+    onnx_path = tmp_path / "nli.onnx"
+    onnx_path.write_bytes(b"")  # present, so no export
+    return module.ONNXNLIModel("emb", "nli", ["contradiction", "neutral", "entailment"],
+                               batch_size=batch_size, onnx_path=str(onnx_path), quantize=False)
+
+
+def test_session_gets_int64_numpy_batches_in_length_order(nli_modules, stub_tokenizer, tmp_path, monkeypatch):
+    model = _model(nli_modules, stub_tokenizer, tmp_path, monkeypatch, batch_size=3)
+    model.predict([("c", "p")] * 7)
+
+    assert [len(f["input_ids"]) for f in model.session.feeds] == [3, 3, 1]
+    assert all(f[name].dtype == np.int64 for f in model.session.feeds for name in ("input_ids", "attention_mask"))
+    assert all(tensors == "np" for _, tensors in stub_tokenizer.pad_calls)
+
+
+def test_predict_keeps_input_order_and_maps_labels(nli_modules, stub_tokenizer, tmp_path, monkeypatch):
+    model = _model(nli_modules, stub_tokenizer, tmp_path, monkeypatch, batch_size=3)
+    results = model.predict([(f"c{i}", f"p{i}") for i in range(7)])
+
+    # Pair i peaks at label i % 3: contradiction, neutral, entailment
+    peaks = [int(np.argmax(r)) for r in results]
+    expected = [{0: 1, 1: 2, 2: 0}[i % 3] for i in range(7)]  # (e, c, n) positions
+    assert peaks == expected
+    for row in results:
+        assert abs(sum(row) - 1.0) < 1e-6
+
+
+def test_cache_key_differs_from_the_torch_backend(nli_modules, stub_tokenizer, tmp_path, monkeypatch):
+    model = _model(nli_modules, stub_tokenizer, tmp_path, monkeypatch, batch_size=3)
+    assert model.cache_key == "ONNXNLIModel:nli:fp32"
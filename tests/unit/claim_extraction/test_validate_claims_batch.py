@@ -0,0 +1,47 @@
+# tests/unit/claim_extraction/test_validate_claims_batch.py
+import numpy as np
+
+
+def test_batch_matches_per_claim(trained_validator):
+    validator, nli, data = trained_validator
+    items = [(ex.claim, "", ex.passages) for ex in data]
+
+    single = [validator.validate_claim(claim, t, passages) for claim, t, passages in items]
+    nli.calls = 0
+    batch = validator.validate_claims_batch(items)
+
+    assert nli.calls == 1
+    assert [(r.claim, r.verdict, r.score) for r in batch] == [(r.claim, r.verdict, r.score) for r in single]
+
+
+def test_batch_handles_claims_without_passages(trained_validator):
+    validator, _, data = trained_validator
+    results = validator.validate_claims_batch([("no evidence", "", []), (data[0].claim, "", data[0].passages)])
+    assert results[0].verdict == "Not enough evidence"
+    assert results[0].score == 0
+    assert results[1].claim == data[0].claim
+
+
+def test_batch_scores_all_claims_in_one_predict_proba_call(trained_validator, monkeypatch):
+    validator, _, data = trained_validator
+    calls = []
+    predict_proba = validator.clf.predict_proba
+    monkeypatch.setattr(validator.clf, "predict_proba", lambda X: calls.append(len(X)) or predict_proba(X))
+
+    results = validator.validate_claims_batch([(ex.claim, "", ex.passages) for ex in data])
+
+    scored = [r for r in results if r.all_evidence]
+    assert len(scored) > 1
+    assert calls == [len(scored)]
+
+
+def test_verdict_lookup_matches_inverse_transform(trained_validator):
+    validator = trained_validator[0]
+    X = np.random.default_rng(0).uniform(0, 3, size=(50, validator.clf.n_features_in_))
+
+    probabilities = validator.clf.predict_proba(X)
+    expected = [
+        (validator.encoder.inverse_transform([p.argmax()])[0], int(p.max() * 100))
+        for p in probabilities
+    ]
+    assert validator._predict_verdicts(X) == expected
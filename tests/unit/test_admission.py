@@ -0,0 +1,59 @@
+# tests/unit/test_admission.py
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionGate, QueueFullError, QueueTimeoutError
+
+
+def _hold_slot(gate, started, release):
+    with gate.slot():
+        started.set()
+        release.wait(5)
+
+
+def test_rejects_when_queue_full():
+    gate = AdmissionGate(max_concurrent=1, max_queue=0, queue_timeout=1)
+    started, release = threading.Event(), threading.Event()
+    t = threading.Thread(target=_hold_slot, args=(gate, started, release))
+    t.start()
+    started.wait(5)
+
+    with pytest.raises(QueueFullError):
+        gate.acquire()
+
+    release.set()
+    t.join()
+    assert gate.stats()["rejected"] == 1
+    assert gate.stats()["active"] == 0
+
+
+def test_queued_request_times_out():
+    gate = AdmissionGate(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+    started, release = threading.Event(), threading.Event()
+    t = threading.Thread(target=_hold_slot, args=(gate, started, release))
+    t.start()
+    started.wait(5)
+
+    with pytest.raises(QueueTimeoutError):
+        gate.acquire()
+
+    release.set()
+    t.join()
+    assert gate.stats()["queued"] == 0
+
+
+def test_queued_request_runs_after_release():
+    gate = AdmissionGate(max_concurrent=1, max_queue=1, queue_timeout=5)
+    started, release = threading.Event(), threading.Event()
+    t = threading.Thread(target=_hold_slot, args=(gate, started, release))
+    t.start()
+    started.wait(5)
+
+    threading.Timer(0.05, release.set).start()
+    begin = time.monotonic()
+    with gate.slot():
+        assert gate.stats()["active"] == 1
+    t.join()
+    assert time.monotonic() - begin >= 0.04
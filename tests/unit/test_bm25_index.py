@@ -0,0 +1,73 @@
+# tests/unit/test_bm25_index.py
+import os
+
+from modules.misinformation_module.src.bm25_index import (
+    BM25Index,
+    BM25IndexReader,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+
+
+def build():
+    index = BM25Index()
+    index.add_many([
+        (1, "LeBron James scored 40 points against the Celtics"),
+        (2, "Stephen Curry hit 10 three-pointers in the win"),
+        (3, "The Lakers beat the Celtics in overtime"),
+        ("a5b1", "Nikola Jokic recorded a triple-double with 31 points"),
+    ])
+    return index
+
+
+def test_tokenize_keeps_numbers_and_drops_stopwords():
+    assert tokenize("Curry shot 3.5 threes in the 4th") == ["curry", "shot", "3.5", "threes", "4th"]
+
+
+def test_exact_terms_rank_first():
+    index = build()
+    ids = [pid for pid, _ in index.search("Jokic 31 points", top_k=3)]
+    assert ids[0] == "a5b1"
+    assert 1 in ids  # shares "points"
+    assert index.search("zzz unknown", top_k=3) == []
+
+
+def test_readd_replaces_and_remove_forgets():
+    index = build()
+    index.add(2, "Stephen Curry scored 50 points")
+    assert [pid for pid, _ in index.search("three-pointers", top_k=5)] == []
+    assert 2 in [pid for pid, _ in index.search("50", top_k=5)]
+
+    index.remove(3)
+    assert len(index) == 3
+    assert 3 not in [pid for pid, _ in index.search("overtime Celtics", top_k=5)]
+    index.add(7, "Celtics overtime thriller")
+    assert len(index.ids) == 4  # freed slot reused
+
+
+def test_unchanged_text_is_a_noop():
+    index = build()
+    index.dirty = False
+    index.add(1, "LeBron James scored 40 points against the Celtics")
+    assert not index.dirty
+
+
+def test_rrf_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]], k=60, limit=2)
+    assert [key for key, _ in fused] == ["c", "a"]
+
+
+def test_reader_reloads_after_save(tmp_path):
+    path = str(tmp_path / "bm25.joblib")
+    reader = BM25IndexReader("nba", path=path)
+    assert reader.current() is None
+
+    index = build()
+    index.save("nba", path=path)
+    assert len(reader.current()) == 4
+
+    index.add(9, "Wembanyama blocked 10 shots")
+    index.save("nba", path=path)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert 9 in [pid for pid, _ in reader.current().search("Wembanyama", top_k=1)]
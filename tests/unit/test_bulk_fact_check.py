@@ -0,0 +1,126 @@
+# tests/unit/test_bulk_fact_check.py
+import json
+
+import pytest
+
+from bulk_fact_check import iter_claims, run
+from modules.claim_extraction.Fact_Validator_Data_models import FactCheckFeatures, FactCheckResult
+
+
+class FakePipeline:
+    """Stands in for FactCheckingPipeline; fails on the `fail_on`-th check_claims call."""
+
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+
+    def check_claims(self, claims, top_k=20, timings=None):
+        self.batches.append([text for text, _ in claims])
+        if self.fail_on is not None and len(self.batches) == self.fail_on:
+            raise RuntimeError("simulated crash")
+        return [FactCheckResult(text, "Supported", 90, [], FactCheckFeatures(0.9, 0.9, 0, 1, 0.8, 1.0)) for text, _ in claims]
+
+    def extract_claims(self, user_input):
+        # "A and B" holds two claims; "hello" none
+        if user_input == "hello":
+            return [(user_input, "unknown")], True
+        return [(part, "stat") for part in user_input.split(" and ")], False
+
+    def generate_explanation(self, result, reasoning_mode=None):
+        return f"because {result.claim}"
+
+    @staticmethod
+    def format_result(result):
+        return {"claim": result.claim, "verdict": result.verdict, "score": result.score}
+
+
+def write_jsonl(path, n):
+    path.write_text("".join(json.dumps({"id": f"c{i}", "claim": f"claim {i}"}) + "\n" for i in range(n)))
+
+
+def test_iter_claims_reads_csv(tmp_path):
+    path = tmp_path / "claims.csv"
+    path.write_text("claim,source\nLeBron scored 40,x\n,y\nCurry hit 10 threes,z\n")
+    rows = list(iter_claims(str(path)))
+    assert rows == [
+        {"id": 0, "claim": "LeBron scored 40"},
+        {"id": 1, "claim": None},
+        {"id": 2, "claim": "Curry hit 10 threes"},
+    ]
+
+
+def test_iter_claims_treats_non_object_lines_as_empty(tmp_path):
+    path = tmp_path / "claims.jsonl"
+    path.write_text('{"id": "a", "claim": "x"}\n"just a string"\n[1, 2]\n\n{"id": "e", "claim": "y"}\n')
+    rows = list(iter_claims(str(path)))
+    assert rows == [
+        {"id": "a", "claim": "x"}, {"id": 1, "claim": None}, {"id": 2, "claim": None},
+        {"id": 3, "claim": None}, {"id": "e", "claim": "y"},
+    ]
+
+
+def test_run_batches_and_explains(tmp_path):
+    src, out = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_jsonl(src, 5)
+    pipe = FakePipeline()
+
+    stats = run(pipe, str(src), str(out), batch_size=2, llm_concurrency=2, explain=True)
+
+    lines = [json.loads(l) for l in out.read_text().splitlines()]
+    assert [l["id"] for l in lines] == ["c0", "c1", "c2", "c3", "c4"]
+    assert lines[3]["explanation"] == "because claim 3"
+    assert [len(b) for b in pipe.batches] == [2, 2, 1]
+    assert stats["claims"] == 5
+
+
+def test_resume_after_crash_writes_each_row_once(tmp_path):
+    src, out = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_jsonl(src, 7)
+
+    with pytest.raises(RuntimeError):
+        run(FakePipeline(fail_on=3), str(src), str(out), batch_size=2)
+    # Simulate a torn write after the last checkpoint
+    with open(out, "a") as f:
+        f.write('{"id": "partial')
+
+    resumed = FakePipeline()
+    run(resumed, str(src), str(out), batch_size=2)
+
+    ids = [json.loads(l)["id"] for l in out.read_text().splitlines()]
+    assert ids == [f"c{i}" for i in range(7)]
+    assert resumed.batches[0] == ["claim 2", "claim 3"]
+
+
+def test_rows_without_claims_get_a_skipped_record(tmp_path):
+    src, out = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    rows = [{"id": "a", "claim": "x and y"}, {"id": "b", "claim": ""}, {"id": "c", "claim": "hello"}, {"id": "d", "claim": "z"}]
+    src.write_text("".join(json.dumps(r) + "\n" for r in rows))
+
+    stats = run(FakePipeline(), str(src), str(out), batch_size=3, extract=True)
+
+    lines = [json.loads(l) for l in out.read_text().splitlines()]
+    assert [(l["id"], l["claim_index"], l.get("skipped")) for l in lines] == [
+        ("a", 0, None), ("a", 1, None), ("b", None, "empty claim"), ("c", None, "no claim"), ("d", 0, None),
+    ]
+    assert stats["claims"] == 3 and stats["skipped"] == 2
+
+
+def test_checkpoint_is_removed_after_a_clean_run(tmp_path):
+    src, out = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_jsonl(src, 3)
+    run(FakePipeline(), str(src), str(out), batch_size=2)
+    assert not (tmp_path / "out.jsonl.ckpt").exists()
+
+
+def test_checkpoint_for_other_input_or_options_is_refused(tmp_path):
+    src, out = tmp_path / "in.jsonl", tmp_path / "out.jsonl"
+    write_jsonl(src, 7)
+    with pytest.raises(RuntimeError):
+        run(FakePipeline(fail_on=3), str(src), str(out), batch_size=2)
+
+    with pytest.raises(ValueError, match="different input file or options"):
+        run(FakePipeline(), str(src), str(out), batch_size=2, extract=True)
+
+    write_jsonl(src, 8)
+    with pytest.raises(ValueError, match="different input file or options"):
+        run(FakePipeline(), str(src), str(out), batch_size=2)
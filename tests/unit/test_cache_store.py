@@ -0,0 +1,86 @@
+# tests/unit/test_cache_store.py
+import time
+
+import pytest
+
+from modules.cache.cache_store import SQLiteCache, make_cache
+from modules.cache.ingest_version import IngestVersionReader, bump_ingest_version
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache_factory(request, tmp_path):
+    def build(max_entries=3, ttl=None):
+        path = str(tmp_path / "cache.sqlite") if request.param == "sqlite" else None
+        return make_cache(max_entries=max_entries, ttl=ttl, path=path)
+    return build
+
+
+def test_get_set_and_stats(cache_factory):
+    cache = cache_factory()
+    assert cache.get("a") is None
+    cache.set("a", {"verdict": "Supported", "score": 90})
+    assert cache.get("a") == {"verdict": "Supported", "score": 90}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_lru_eviction(cache_factory):
+    cache = cache_factory(max_entries=2)
+    cache.set("a", 1)
+    time.sleep(0.01)
+    cache.set("b", 2)
+    time.sleep(0.01)
+    cache.get("a")          # "b" is now least recently used
+    time.sleep(0.01)
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_ttl_expiry(cache_factory):
+    cache = cache_factory(ttl=0.05)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_survives_reopen(tmp_path):
+    path = tmp_path / "results.sqlite"
+    cache = SQLiteCache(str(path), max_entries=10)
+    cache.set("claim", {"verdict": "Refuted"})
+    cache.close()
+
+    reopened = SQLiteCache(str(path), max_entries=10)
+    assert reopened.get("claim") == {"verdict": "Refuted"}
+
+
+def test_reopen_gives_a_new_connection_with_the_same_entries(cache_factory):
+    cache = cache_factory()
+    cache.set("a", [1, 2])
+    old_lock = cache._lock
+    cache.reopen()
+    assert cache._lock is not old_lock
+    assert cache.get("a") == [1, 2]
+    cache.set("b", 3)
+    assert len(cache) == 2
+
+
+def test_ingest_version_changes_after_bump(tmp_path):
+    path = str(tmp_path / "ingest_version.json")
+    reader = IngestVersionReader(path)
+    assert reader.current() == "0"
+
+    first = bump_ingest_version("nba_news_claims", 10, path=path)
+    assert reader.current() == first
+
+    time.sleep(0.01)
+    second = bump_ingest_version("nba_news_claims", 5, path=path)
+    assert second != first
+    assert reader.current() == second
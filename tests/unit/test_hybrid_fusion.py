@@ -0,0 +1,77 @@
+# tests/unit/test_hybrid_fusion.py
+import importlib
+import importlib.util
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from qdrant_client import models
+
+from modules.misinformation_module.src.bm25_index import BM25Index
+
+# pipeline imports the model and LLM client libraries at module level;
+# _fuse_hybrid needs none of them, so missing ones are placeholders here.
+_LIBRARIES = ("torch", "transformers", "transformers.utils", "sentence_transformers", "ollama", "openai")
+
+
+@pytest.fixture(scope="module")
+def fuse_hybrid():
+    saved = {name: sys.modules.get(name) for name in _LIBRARIES + ("pipeline",)}
+    missing = [n for n in _LIBRARIES if n not in sys.modules and importlib.util.find_spec(n.split(".")[0]) is None]
+    for name in missing:
+        sys.modules[name] = MagicMock(name=name)
+    try:
+        yield importlib.import_module("pipeline").FactCheckingPipeline._fuse_hybrid
+    finally:
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+class FakeVectorDB:
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.retrieved = []
+
+    def retrieve(self, ids, with_vectors=False):
+        self.retrieved.append(sorted(str(i) for i in ids))
+        return [SimpleNamespace(id=i, vector=self.vectors[str(i)], payload={"claim": str(i)}) for i in ids]
+
+
+def _hit(point_id, score):
+    return models.ScoredPoint(id=point_id, version=0, score=score, payload={"claim": point_id})
+
+
+def _pipeline(vectors):
+    return SimpleNamespace(hybrid_candidates=10, rrf_k=60, vector_db=FakeVectorDB(vectors))
+
+
+def test_shared_dense_hit_keeps_each_querys_own_score(fuse_hybrid):
+    index = BM25Index()
+    pipe = _pipeline({})
+    query_vecs = np.eye(2, dtype=np.float32)
+
+    results = fuse_hybrid(pipe, ["lakers", "celtics"], query_vecs,
+                          [[_hit("p", 0.9)], [_hit("p", 0.1)]], index, top_k=5)
+
+    assert [h.score for h in results[0]] == [0.9]
+    assert [h.score for h in results[1]] == [0.1]
+
+
+def test_bm25_only_passage_is_scored_against_its_own_query(fuse_hybrid):
+    index = BM25Index()
+    index.add_many([("p", "celtics overtime win"), ("q", "celtics bench")])
+    pipe = _pipeline({"p": [0.6, 0.8], "q": [0.0, 1.0]})
+    query_vecs = np.eye(2, dtype=np.float32)
+
+    # "p" is a dense hit for the first query only; the second finds it through BM25
+    results = fuse_hybrid(pipe, ["lakers", "celtics overtime"], query_vecs,
+                          [[_hit("p", 0.99)], []], index, top_k=5)
+
+    assert {h.id: round(h.score, 4) for h in results[0]} == {"p": 0.99}
+    assert {h.id: round(h.score, 4) for h in results[1]} == {"p": 0.8, "q": 1.0}
+    assert pipe.vector_db.retrieved == [["p", "q"]]  # one retrieve for the batch
@@ -0,0 +1,60 @@
+# tests/unit/test_log_setup.py
+import contextvars
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from log_setup import NonBlockingQueueHandler, RequestIdFilter, clean_request_id, get_request_id, request_context
+
+
+class ExplodingArg:
+    """Fails the test if the message is formatted on the caller's side."""
+
+    def __str__(self):
+        raise AssertionError("formatted in the calling thread")
+
+
+def _logger(handler):
+    logger = logging.getLogger("test_log_setup")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def test_queue_handler_defers_formatting_and_drops_when_full():
+    q = queue.Queue(maxsize=2)
+    handler = NonBlockingQueueHandler(q)
+    logger = _logger(handler)
+
+    for _ in range(5):
+        logger.info("value: %s", ExplodingArg())  # never blocks, never formats
+
+    assert q.qsize() == 2
+    assert handler.dropped == 3
+    record = q.get_nowait()
+    assert record.msg == "value: %s" and isinstance(record.args[0], ExplodingArg)
+
+
+def test_records_carry_request_id_across_executor_threads():
+    q = queue.Queue()
+    handler = NonBlockingQueueHandler(q)
+    handler.addFilter(RequestIdFilter())
+    logger = _logger(handler)
+
+    logger.info("outside")
+    with request_context("req-42"):
+        logger.info("inside")
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(contextvars.copy_context().run, logger.info, "worker").result()
+    assert get_request_id() == "-"
+
+    ids = [q.get_nowait().request_id for _ in range(3)]
+    assert ids == ["-", "req-42", "req-42"]
+
+
+def test_clean_request_id_rejects_unsafe_header_values():
+    assert clean_request_id("abc-123_x.y") == "abc-123_x.y"
+    for bad in (None, "", "a b", "x" * 65, "id\nforged log line"):
+        generated = clean_request_id(bad)
+        assert generated != bad and len(generated) == 12
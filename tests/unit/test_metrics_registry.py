@@ -0,0 +1,69 @@
+# tests/unit/test_metrics_registry.py
+import pytest
+
+from modules.metrics.registry import MetricsRegistry, current_stage
+
+
+def test_summary_quantiles_and_rendering():
+    registry = MetricsRegistry()
+    latency = registry.summary("stage_seconds", "Stage latency", ("stage",))
+    for ms in range(1, 101):
+        latency.observe(ms / 1000, stage="nli")
+
+    q = latency.quantiles(stage="nli")
+    assert q[0.5] == pytest.approx(0.05)
+    assert q[0.95] == pytest.approx(0.095)
+    assert q[0.99] == pytest.approx(0.099)
+
+    text = registry.render()
+    assert "# TYPE stage_seconds summary" in text
+    assert 'stage_seconds{stage="nli",quantile="0.99"} 0.099' in text
+    assert 'stage_seconds_count{stage="nli"} 100' in text
+
+
+def test_summary_window_is_bounded():
+    registry = MetricsRegistry()
+    latency = registry.summary("s", "s", window=10)
+    for v in range(100):
+        latency.observe(v)
+    assert latency.quantiles()[0.5] == 94  # only the last 10 samples count
+    assert "s_count 100" in registry.render()
+
+
+def test_counter_labels_are_escaped():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls", ("model",))
+    calls.inc(model='gpt "4o"')
+    calls.inc(2, model='gpt "4o"')
+    assert 'calls_total{model="gpt \\"4o\\""} 3' in registry.render()
+
+
+def test_callback_gauge_and_broken_callback():
+    registry = MetricsRegistry()
+    registry.gauge("queued", "Queued", lambda: 4)
+    registry.gauge("hits_total", "Hits", lambda: {"result": 7}, ("cache",), kind="counter")
+    registry.gauge("broken", "Broken", lambda: 1 / 0)
+    text = registry.render()
+    assert "queued 4" in text
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{cache="result"} 7' in text
+    assert "broken" not in text
+
+
+def test_stage_timer_attributes_llm_calls():
+    from modules.metrics.registry import LLM_CALLS, LLM_TOKENS, STAGE_SECONDS, stage_timer, track_llm_call
+
+    with stage_timer("explanation"):
+        assert current_stage() == "explanation"
+        with track_llm_call("openai", "test-model") as usage:
+            usage["prompt_tokens"] = 12
+            usage["completion_tokens"] = 3
+        with pytest.raises(RuntimeError):
+            with track_llm_call("openai", "test-model"):
+                raise RuntimeError("timeout")
+    assert current_stage() == "none"
+
+    assert LLM_CALLS.value(provider="openai", model="test-model", stage="explanation", status="ok") == 1
+    assert LLM_CALLS.value(provider="openai", model="test-model", stage="explanation", status="error") == 1
+    assert LLM_TOKENS.value(provider="openai", model="test-model", type="prompt") == 12
+    assert STAGE_SECONDS.quantiles(stage="explanation")
@@ -0,0 +1,53 @@
+# tests/unit/test_reranker.py
+import pytest
+
+from modules.claim_extraction.Fact_Validator_Data_models import SourcePassage
+from modules.misinformation_module.src.reranker import (
+    CrossEncoderReranker,
+    EmbeddingReranker,
+    create_reranker,
+)
+
+
+def passages(*scores):
+    return [SourcePassage(content=f"p{i}", relevance_score=s) for i, s in enumerate(scores)]
+
+
+class KeywordCrossEncoder:
+    """Stand-in for sentence_transformers.CrossEncoder: scores pairs by shared words."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, pairs, batch_size=32):
+        self.calls += 1
+        return [len(set(q.split()) & set(p.split())) for q, p in pairs]
+
+
+def test_embedding_reranker_keeps_top_n_by_relevance():
+    ranked = EmbeddingReranker(top_n=2).rerank("q", passages(0.2, 0.9, 0.5))
+    assert [p.content for p in ranked] == ["p1", "p2"]
+    assert ranked[0].relevance_score == 0.9  # scores are not rewritten
+
+
+def test_cross_encoder_scores_all_pairs_in_one_call():
+    reranker = CrossEncoderReranker(top_n=1)
+    reranker._model = model = KeywordCrossEncoder()
+    items = [
+        ("lebron scored 40", [SourcePassage(content="curry scored 10"), SourcePassage(content="lebron scored 40 points")]),
+        ("jokic triple double", [SourcePassage(content="jokic had a triple double")]),
+        ("no passages", []),
+    ]
+    out = reranker.rerank_batch(items)
+    assert model.calls == 1
+    assert [p.content for p in out[0]] == ["lebron scored 40 points"]
+    assert [p.content for p in out[1]] == ["jokic had a triple double"]
+    assert out[2] == []
+
+
+def test_create_reranker():
+    # "none" passes every passage through, in retrieval order
+    assert [p.content for p in create_reranker("none", top_n=1).rerank("q", passages(0.1, 0.2))] == ["p0", "p1"]
+    assert isinstance(create_reranker("embedding"), EmbeddingReranker)
+    with pytest.raises(ValueError):
+        create_reranker("bm42")
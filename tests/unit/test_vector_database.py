@@ -0,0 +1,46 @@
+# tests/unit/test_vector_database.py
+import httpx
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+from modules.misinformation_module.src.qdrant_db import QdrantDB
+
+
+class FlakyClient:
+    """In-memory QdrantClient whose query_points raises the queued errors first."""
+
+    def __init__(self, errors):
+        self._client = QdrantClient(location=":memory:")
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def query_points(self, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self._client.query_points(**kwargs)
+
+
+def _db(errors):
+    client = FlakyClient(errors)
+    return QdrantDB("claims", vector_size=4, client=client, retries=2, retry_backoff=0.0), client
+
+
+def test_transient_errors_are_retried():
+    db, client = _db([
+        ResponseHandlingException(httpx.ConnectError("refused")),
+        UnexpectedResponse(503, "Service Unavailable", b"", httpx.Headers()),
+    ])
+    assert db.search([1.0, 0.0, 0.0, 0.0], top_k=3) == []
+    assert client.calls == 3
+
+
+def test_bad_requests_fail_without_retrying():
+    db, client = _db([UnexpectedResponse(400, "Bad Request", b"wrong vector size", httpx.Headers())])
+    with pytest.raises(UnexpectedResponse):
+        db.search([1.0, 0.0, 0.0, 0.0], top_k=3)
+    assert client.calls == 1